@@ -0,0 +1,57 @@
+"""Núcleo del simulador de procesos, utilizable sin interfaz gráfica."""
+from .checkpoint import CheckpointTimeline, load_checkpoint, save_checkpoint
+from .cores import PerCoreDispatcher, SharedQueueDispatcher
+from .devices import DEVICE_PRESETS, Device, DeviceSet, make_devices
+from .engine import EngineSnapshot, Process, ProcessView, SimulationEngine, default_processes
+from .export import MetricsExporter
+from .history import HistoryStore
+from .memory import MEMORY_MANAGERS, BuddyMemory, ContiguousMemory, MemoryManager, PagedMemory, make_memory
+from .metrics import summarize
+from .process_table import ProcessTable
+from .profiling import Profiler
+from .runner import SimulationRunner
+from .scheduling import SCHEDULERS, SchedulingPolicy, make_scheduler
+from .states import CPU_USAGE_RANGES, PRIORITIES, PROCESS_STATES, STATE_COLORS, STATE_NAMES
+from .workload import BurstyWorkload, PoissonWorkload, SyntheticWorkload, TraceWorkload, Workload
+
+__all__ = [
+    "CPU_USAGE_RANGES",
+    "DEVICE_PRESETS",
+    "MEMORY_MANAGERS",
+    "PRIORITIES",
+    "PROCESS_STATES",
+    "STATE_COLORS",
+    "STATE_NAMES",
+    "SCHEDULERS",
+    "BuddyMemory",
+    "BurstyWorkload",
+    "CheckpointTimeline",
+    "ContiguousMemory",
+    "Device",
+    "DeviceSet",
+    "EngineSnapshot",
+    "HistoryStore",
+    "MemoryManager",
+    "MetricsExporter",
+    "PagedMemory",
+    "PerCoreDispatcher",
+    "PoissonWorkload",
+    "Process",
+    "ProcessTable",
+    "ProcessView",
+    "Profiler",
+    "SchedulingPolicy",
+    "SharedQueueDispatcher",
+    "SimulationEngine",
+    "SimulationRunner",
+    "SyntheticWorkload",
+    "TraceWorkload",
+    "Workload",
+    "default_processes",
+    "load_checkpoint",
+    "make_devices",
+    "make_memory",
+    "make_scheduler",
+    "save_checkpoint",
+    "summarize",
+]
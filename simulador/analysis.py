@@ -0,0 +1,173 @@
+"""Análisis fuera de línea de las métricas exportadas con ``MetricsExporter``.
+
+Los bloques se leen de a uno, en el orden del manifiesto, así que la memoria
+no depende del tamaño de la exportación. Retorno, espera y respuesta son
+ciclos enteros: cada ``Distribution`` los acumula en un histograma exacto
+(un contador por valor), de modo que los percentiles coinciden con los de
+``numpy.percentile`` sobre todos los valores sin tenerlos en memoria.
+
+* retorno y espera: procesos terminados; respuesta: procesos despachados;
+* uso de CPU: ciclos ocupados sobre ciclos disponibles de los hilos;
+* ``mean_<estado>``: procesos promedio en cada estado, ponderado por ciclos.
+
+::
+
+    python -m simulador.analysis salida
+    python -m simulador.analysis salida --percentiles 50 99 --run 0 --format csv
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from .export import MANIFEST, STATE_KEYS
+from .sweep import write_csv
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+DISTRIBUTIONS = ("turnaround", "waiting", "response")
+
+
+class Distribution:
+    """Histograma exacto de valores enteros no negativos, acumulado por bloques"""
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return
+        counts = np.bincount(values)
+        if len(counts) > len(self.counts):
+            counts[:len(self.counts)] += self.counts
+            self.counts = counts
+        else:
+            self.counts[:len(counts)] += counts
+        self.count += len(values)
+        self.total += int(values.sum())
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float("nan")
+
+    @property
+    def max(self):
+        return int(np.flatnonzero(self.counts)[-1]) if self.count else float("nan")
+
+    def percentile(self, q):
+        """Como ``numpy.percentile`` (interpolación lineal) sobre los valores agregados"""
+        if not self.count:
+            return float("nan")
+        position = q / 100 * (self.count - 1)
+        low = int(np.floor(position))
+        cumulative = np.cumsum(self.counts)
+        below, above = np.searchsorted(cumulative, [low, min(low + 1, self.count - 1)], side="right")
+        return float(below + (above - below) * (position - low))
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as file:
+        return json.load(file)
+
+
+def iter_chunks(directory, kind, run=None, manifest=None):
+    """Bloques de ``kind`` (``"cycles"`` o ``"processes"``) como diccionarios de columnas"""
+    manifest = manifest or read_manifest(directory)
+    for chunk in manifest["chunks"][kind]:
+        with np.load(os.path.join(directory, chunk["file"])) as data:
+            columns = {name: data[name] for name in data.files}
+        if run is not None:
+            keep = columns["run"] == run
+            columns = {name: values[keep] for name, values in columns.items()}
+        yield columns
+
+
+def _process_stats(directory, run, manifest):
+    distributions = {name: Distribution() for name in DISTRIBUTIONS}
+    processes = finished = 0
+    for columns in iter_chunks(directory, "processes", run, manifest):
+        done = columns["finish"] >= 0
+        started = columns["first_run"] >= 0
+        processes += len(done)
+        finished += int(done.sum())
+        distributions["turnaround"].add(columns["turnaround"][done])
+        distributions["waiting"].add(columns["waiting"][done])
+        distributions["response"].add(columns["response"][started])
+    return processes, finished, distributions
+
+
+def _cycle_stats(directory, run, manifest):
+    """Ciclos, uso de CPU y procesos promedio por estado, recorriendo las filas en orden"""
+    names = [f"count_{key}" for key in STATE_KEYS]
+    cycles = busy = capacity = 0
+    weighted = np.zeros(len(STATE_KEYS))
+    previous = None  # (corrida, busy, conteos) de la última fila
+    for columns in iter_chunks(directory, "cycles", run, manifest):
+        if not len(columns["cycle"]):
+            continue
+        counts = np.stack([columns[name] for name in names], axis=1)
+        runs, spans, total_busy = columns["run"], columns["span"], columns["busy"]
+        # Diferencias con la fila anterior de la misma corrida (la primera de
+        # cada corrida no tiene anterior y no cuenta)
+        if previous is None:
+            previous_run, previous_busy, previous_counts = -1, 0, counts[0]
+        else:
+            previous_run, previous_busy, previous_counts = previous
+        last_run = np.concatenate([[previous_run], runs[:-1]])
+        last_busy = np.concatenate([[previous_busy], total_busy[:-1]])
+        last_counts = np.concatenate([previous_counts[None], counts[:-1]])
+        same = runs == last_run
+        cycles += int(spans[same].sum())
+        busy += int((total_busy - last_busy)[same].sum())
+        capacity += int((spans * columns["slots"])[same].sum())
+        # Los conteos de una fila rigen hasta el avance siguiente; el ciclo del
+        # avance ya tiene los nuevos
+        weighted += (last_counts[same] * (spans[same] - 1)[:, None]).sum(axis=0) + counts[same].sum(axis=0)
+        previous = (runs[-1], total_busy[-1], counts[-1])
+    return cycles, busy / capacity if capacity else float("nan"), weighted / max(1, cycles)
+
+
+def analyze(directory, percentiles=DEFAULT_PERCENTILES, run=None):
+    """Métricas agregadas de una exportación (de todas las corridas, o solo de ``run``)"""
+    manifest = read_manifest(directory)
+    processes, finished, distributions = _process_stats(directory, run, manifest)
+    cycles, utilization, mean_counts = _cycle_stats(directory, run, manifest)
+    result = {
+        "cycles": cycles,
+        "processes": processes,
+        "finished": finished,
+        "throughput": finished / cycles if cycles else float("nan"),
+        "cpu_utilization": utilization,
+    }
+    for name, distribution in distributions.items():
+        result[f"{name}_mean"] = distribution.mean
+        for q in percentiles:
+            result[f"{name}_p{q:g}"] = distribution.percentile(q)
+        result[f"{name}_max"] = distribution.max
+    for key, value in zip(STATE_KEYS, mean_counts.tolist()):
+        result[f"mean_{key}"] = value
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis de métricas exportadas del simulador")
+    parser.add_argument("directory")
+    parser.add_argument("--percentiles", type=float, nargs="+", default=list(DEFAULT_PERCENTILES))
+    parser.add_argument("--run", type=int, default=None, help="solo esta corrida (por defecto, todas)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    args = parser.parse_args(argv)
+
+    result = analyze(args.directory, args.percentiles, args.run)
+    if args.format == "json":
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        write_csv([result], sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
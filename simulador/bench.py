@@ -0,0 +1,237 @@
+"""Banco de pruebas de rendimiento del motor y de los gráficos, sin Tk.
+
+* ``engine``: ciclos por segundo con ``step`` (como la interfaz) y con el
+  modo por eventos (``run``), para cada tamaño de carga.
+* ``memory``: bytes por proceso de la tabla, el historial y el resto del
+  motor (medido con ``tracemalloc`` en una corrida aparte).
+* ``charts``: latencia por ciclo de ``update`` de cada gráfico (los que usan
+  ``update_state_distribution_chart``, ``update_timeline_chart`` y
+  ``update_resource_usage_chart`` de la interfaz) sobre un lienzo Agg, más
+  la de tomar la instantánea que reciben.
+
+Cada medición se repite para cada política de ``--scheduler``; ``none`` (u
+``original``) es el modelo original sin política, que avanza en paso
+sincronizado y por defecto se mide junto a FCFS.
+
+Los resultados son filas planas (un diccionario por medición) que se
+escriben como JSON o CSV junto con las versiones usadas, para comparar
+corridas a lo largo del tiempo::
+
+    python -m simulador.bench
+    python -m simulador.bench --sizes 10 1000 --cycles 100 --format csv --output bench.csv
+    python -m simulador.bench --scheduler none RR --only engine
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .engine import SimulationEngine
+from .process_table import ProcessTable
+from .scheduling import make_scheduler, scheduler_name
+from .sweep import write_csv
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+BENCHMARKS = ("engine", "memory", "charts")
+DEFAULT_SCHEDULERS = (None, "FCFS")  # ``None`` es el modelo original
+
+
+def make_engine(processes, scheduler="FCFS", seed=0, history_retention=1024, history_summary=False):
+    """Motor con ``processes`` procesos sintéticos, todos presentes desde el ciclo 0"""
+    table = ProcessTable.random(processes, rng=np.random.default_rng(seed))
+    return SimulationEngine(table, seed=seed, scheduler=make_scheduler(scheduler),
+                            history_retention=history_retention, history_summary=history_summary)
+
+
+def bench_engine(processes, cycles=200, scheduler="FCFS", repeat=3, **options):
+    """Ciclos por segundo de ``step`` y de ``run``; se queda con la mejor de ``repeat`` corridas"""
+    results = []
+    for mode in ("step", "event"):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            engine = make_engine(processes, scheduler, **options)
+            setup = time.perf_counter() - start
+            start = time.perf_counter()
+            if mode == "step":
+                for _ in range(cycles):
+                    engine.step()
+            else:
+                engine.run(cycles)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best[1]:
+                best = (setup, elapsed)
+        setup, elapsed = best
+        results.append({
+            "benchmark": "engine",
+            "processes": processes,
+            "scheduler": scheduler,
+            "mode": mode,
+            "cycles": cycles,
+            "setup_seconds": setup,
+            "seconds": elapsed,
+            "cycles_per_second": cycles / elapsed if elapsed else float("inf"),
+        })
+    return results
+
+
+def bench_memory(processes, cycles=200, scheduler="FCFS", **options):
+    """Memoria del motor tras ``cycles`` ciclos, total y por proceso"""
+    tracemalloc.start()
+    try:
+        engine = make_engine(processes, scheduler, **options)
+        engine.run(cycles)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return [{
+        "benchmark": "memory",
+        "processes": processes,
+        "scheduler": scheduler,
+        "cycles": cycles,
+        "bytes": current,
+        "peak_bytes": peak,
+        "bytes_per_process": current / processes,
+        "peak_bytes_per_process": peak / processes,
+        "table_bytes": engine.table.nbytes,
+        "history_bytes": engine.history.nbytes,
+    }]
+
+
+def _latencies(name, processes, samples, **extra):
+    samples = np.asarray(samples) * 1000
+    return {
+        "benchmark": "charts",
+        "chart": name,
+        "processes": processes,
+        "updates": len(samples),
+        "median_ms": float(np.median(samples)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "max_ms": float(samples.max()),
+        **extra,
+    }
+
+
+def bench_charts(processes, updates=50, scheduler="FCFS", rows=8, **options):
+    """Latencia de cada ``update`` con la instantánea de cada ciclo, como en la interfaz.
+
+    El primer ``update`` (que crea los artistas y dibuja todo) se informa
+    aparte como ``first_ms``; ``rows`` es el tamaño de la ventana de filas
+    del gráfico de recursos (las visibles en la lista de procesos).
+    """
+    # Solo este banco necesita matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from .charts import ResourceUsageChart, StateDistributionChart, TimelineChart
+
+    # Con el resumen de la línea de tiempo, como en la interfaz
+    engine = make_engine(processes, scheduler, history_summary=True, **options)
+    window = range(min(rows, processes))
+    charts = {}
+    for name, chart_class in (("states", StateDistributionChart), ("timeline", TimelineChart),
+                              ("resources", ResourceUsageChart)):
+        figure = Figure(figsize=(5, 4))
+        FigureCanvasAgg(figure)
+        charts[name] = chart_class(figure)
+
+    def update(name, snapshot):
+        if name == "resources":
+            charts[name].update(snapshot, window)
+        else:
+            charts[name].update(snapshot)
+
+    first = {}
+    snapshot = engine.snapshot()
+    for name in charts:
+        start = time.perf_counter()
+        update(name, snapshot)
+        first[name] = (time.perf_counter() - start) * 1000
+
+    samples = {name: [] for name in charts}
+    snapshots = []
+    for _ in range(updates):
+        engine.step()
+        start = time.perf_counter()
+        snapshot = engine.snapshot()
+        snapshots.append(time.perf_counter() - start)
+        for name in charts:
+            start = time.perf_counter()
+            update(name, snapshot)
+            samples[name].append(time.perf_counter() - start)
+
+    results = [_latencies("snapshot", processes, snapshots, scheduler=scheduler)]
+    results.extend(_latencies(name, processes, samples[name], scheduler=scheduler, first_ms=first[name])
+                   for name in charts)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, cycles=200, updates=50, benchmarks=BENCHMARKS,
+                   schedulers=DEFAULT_SCHEDULERS, chart_sizes=None, **options):
+    """Todas las mediciones pedidas, en orden; ``chart_sizes`` limita los tamaños de ``charts``"""
+    results = []
+    for processes in sizes:
+        for scheduler in schedulers:
+            if "engine" in benchmarks:
+                results.extend(bench_engine(processes, cycles, scheduler, **options))
+            if "memory" in benchmarks:
+                results.extend(bench_memory(processes, cycles, scheduler, **options))
+            if "charts" in benchmarks and (chart_sizes is None or processes in chart_sizes):
+                results.extend(bench_charts(processes, updates, scheduler, **options))
+    return results
+
+
+def environment():
+    """Versiones y máquina, para comparar resultados entre corridas"""
+    try:
+        import matplotlib
+    except ImportError:  # solo el banco de gráficos lo necesita
+        matplotlib = None
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": getattr(matplotlib, "__version__", None),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento del simulador")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--chart-sizes", type=int, nargs="+", default=None,
+                        help="tamaños para los gráficos (por defecto, todos los de --sizes)")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=50, help="actualizaciones medidas por gráfico")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--scheduler", type=scheduler_name, nargs="+", default=list(DEFAULT_SCHEDULERS),
+                        help="políticas a medir; none u original es el modelo original (por defecto, none y FCFS)")
+    parser.add_argument("--retention", type=int, default=1024, help="history_retention del motor")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", default=None, help="archivo de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.cycles, args.updates, args.only, args.scheduler,
+                             args.chart_sizes, history_retention=args.retention)
+    file = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+            file.write("\n")
+        else:
+            # Cada fila lleva el entorno, para poder juntar varios CSV
+            env = environment()
+            write_csv([{**env, **row} for row in results], file)
+    finally:
+        if args.output:
+            file.close()
+
+
+if __name__ == "__main__":
+    main()
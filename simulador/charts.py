@@ -0,0 +1,415 @@
+"""Gráficos del simulador con artistas persistentes y blitting.
+
+Cada gráfico crea sus artistas una sola vez y en cada ciclo solo cambia sus
+datos. Los artistas dinámicos se dibujan sobre un fondo guardado (blitting),
+así que el costo por ciclo no depende de la longitud del historial; el
+redibujado completo solo ocurre cuando cambian los ejes (el eje x crece
+duplicándose, o se acerca o desplaza la línea de tiempo) o el tamaño de la
+ventana.
+
+Solo depende de matplotlib, no de Tk: funciona igual con un lienzo Agg.
+"""
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.patches import Rectangle
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from .history import NO_STATE
+from .states import STATE_COLORS, STATE_NAMES
+
+# Color RGBA de cada código de estado
+STATE_RGBA = to_rgba_array([STATE_COLORS[state] for state in STATE_NAMES])
+
+# Colores del resumen de la línea de tiempo, indexados por código (uint8);
+# ``NO_STATE`` y los códigos sin estado son transparentes
+SUMMARY_RGBA = np.zeros((256, 4))
+SUMMARY_RGBA[:len(STATE_NAMES)] = STATE_RGBA
+SUMMARY_RGBA[NO_STATE] = 0
+
+
+def _next_power_of_two(value):
+    return 1 << max(0, int(value - 1).bit_length())
+
+
+def segment_verts(rows, starts, lengths, height=0.8):
+    """Rectángulos (k, 4, 2) para segmentos de estado: x = ciclos, y = fila del proceso"""
+    x0 = np.asarray(starts, dtype=float)
+    x1 = x0 + lengths
+    y0 = np.asarray(rows, dtype=float) - height / 2
+    y1 = y0 + height
+    return np.stack([
+        np.stack([x0, y0], axis=-1),
+        np.stack([x0, y1], axis=-1),
+        np.stack([x1, y1], axis=-1),
+        np.stack([x1, y0], axis=-1),
+    ], axis=1)
+
+
+class Blitter:
+    """Dibuja artistas animados sobre el fondo guardado del lienzo"""
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        self.set_artists(artists)
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_artists(self, artists):
+        self.artists = list(artists)
+        for artist in self.artists:
+            artist.set_animated(True)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def redraw(self):
+        """Redibujado completo (ejes, fondo y artistas)"""
+        self.canvas.draw()
+
+    def update(self, baked=()):
+        """Repinta los artistas animados.
+
+        ``baked`` son artistas nuevos y fijos: se dibujan una vez y pasan a
+        formar parte del fondo guardado.
+        """
+        if self.background is None or not self.canvas.supports_blit:
+            self.redraw()
+            return
+        figure = self.canvas.figure
+        self.canvas.restore_region(self.background)
+        if baked:
+            for artist in baked:
+                figure.draw_artist(artist)
+            self.background = self.canvas.copy_from_bbox(figure.bbox)
+        self._draw_artists()
+        self.canvas.blit(figure.bbox)
+
+
+class StateDistributionChart:
+    """Barras horizontales con el número de procesos en cada estado"""
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.ax = figure.add_subplot()
+        figure.subplots_adjust(left=0.2)
+
+        colors = [STATE_COLORS[state] for state in STATE_NAMES]
+        self.bars = self.ax.barh(STATE_NAMES, np.zeros(len(STATE_NAMES)), color=colors)
+        self.labels = [
+            self.ax.text(0, bar.get_y() + bar.get_height() / 2, "", ha='left', va='center')
+            for bar in self.bars
+        ]
+        self.ax.set_title('Distribución de Procesos por Estado')
+        self.ax.set_xlabel('Número de Procesos')
+
+        self._total = None
+        self.blitter = Blitter(figure.canvas, list(self.bars) + self.labels)
+
+    def update(self, engine):
+        counts = engine.state_count_array
+        total = int(counts.sum())
+
+        for bar, label, value in zip(self.bars, self.labels, counts.tolist()):
+            bar.set_width(value)
+            label.set_x(value + 0.01 * max(1, total))
+            label.set_text(f'{value}')
+            label.set_visible(value > 0)
+
+        # El eje solo cambia si cambia el número total de procesos
+        if total != self._total:
+            self._total = total
+            self.ax.set_xlim(0, max(1, total) * 1.15)
+            self.blitter.redraw()
+        else:
+            self.blitter.update()
+
+
+class TimelineChart:
+    """Diagrama de Gantt de los estados de cada proceso, con nivel de detalle.
+
+    Solo se consulta y dibuja la ventana visible (ciclos × filas). Cuando un
+    píxel abarca al menos un tramo del resumen del historial, la ventana se
+    pinta como una imagen con el estado dominante de cada tramo; al acercarse
+    se dibujan los segmentos exactos. El tramo reciente que el resumen aún no
+    cubre siempre se dibuja con segmentos.
+
+    La rueda del ratón acerca o aleja el eje x alrededor del cursor (con
+    Mayús, el eje y); arrastrar desplaza la ventana y el doble clic vuelve a
+    seguir la simulación desde el ciclo 0.
+    """
+
+    # Filas visibles al seguir la simulación
+    VISIBLE_ROWS = 40
+    # Con esta cantidad de filas visibles o menos se rotula el estado actual
+    LABELED_ROWS = 20
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.ax = figure.add_subplot()
+        self.ax.set_title('Línea de Tiempo de Procesos')
+        self.ax.set_xlabel('Ciclo')
+        self.ax.set_ylabel('Proceso')
+        self.ax.grid(axis='x', linestyle='--', alpha=0.7)
+        self.ax.yaxis.set_major_locator(MaxNLocator(nbins=20, integer=True))
+        self.ax.yaxis.set_major_formatter(FuncFormatter(self._row_label))
+
+        # Leyenda
+        legend_elements = [Rectangle((0, 0), 1, 1, color=color, label=state)
+                           for state, color in STATE_COLORS.items()]
+        self.ax.legend(handles=legend_elements, loc='upper center',
+                       bbox_to_anchor=(0.5, -0.15), ncol=3)
+
+        self.image = self.ax.imshow(np.zeros((1, 1, 4)), aspect='auto', origin='lower',
+                                    interpolation='nearest', extent=(0, 1, -0.5, 0.5), zorder=1)
+        self.collection = PolyCollection([], zorder=2)
+        self.ax.add_collection(self.collection)
+        self.labels = [self.ax.text(0, 0, "", ha='center', va='center', fontsize=8, zorder=3)
+                       for _ in range(self.LABELED_ROWS)]
+
+        self.follow = True
+        self._engine = None
+        self._pids = np.zeros(0, dtype=np.int64)
+        self._reset_count = None
+        self._limits = None
+        self._drag = None
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(-0.5, 0.5)
+
+        canvas = figure.canvas
+        canvas.mpl_connect("scroll_event", self._on_scroll)
+        canvas.mpl_connect("button_press_event", self._on_press)
+        canvas.mpl_connect("motion_notify_event", self._on_motion)
+        canvas.mpl_connect("button_release_event", self._on_release)
+
+        figure.tight_layout()
+        self.blitter = Blitter(canvas, [self.image, self.collection] + self.labels)
+
+    def _row_label(self, value, position):
+        row = int(round(value))
+        return f"P{self._pids[row]}" if 0 <= row < len(self._pids) else ""
+
+    def _follow_limits(self, history):
+        """Eje x desde 0 hasta la siguiente potencia de dos; primeras filas"""
+        self.ax.set_xlim(0, _next_power_of_two(max(1, history.cycle + 1)))
+        self.ax.set_ylim(-0.5, max(1, min(history.width, self.VISIBLE_ROWS)) - 0.5)
+
+    def _visible_rows(self, history):
+        low, high = self.ax.get_ylim()
+        first = min(history.width, max(0, int(np.ceil(low - 0.5))))
+        return range(first, min(history.width, max(first, int(np.floor(high + 0.5)))))
+
+    def _draw_summary(self, history, start, stop, rows):
+        """Pinta las columnas del resumen de la ventana; devuelve el ciclo donde termina"""
+        first_cycle, bucket, states, shares = history.summary(start, stop, rows)
+        if not states.size:
+            self.image.set_visible(False)
+            return max(start, min(stop, history.summary_end))
+        # Alfa según la fracción del tramo en el estado dominante
+        rgba = SUMMARY_RGBA[states]
+        rgba[..., 3] *= 0.4 + 0.6 * shares / 255
+        self.image.set_data(rgba)
+        self.image.set_extent((first_cycle, first_cycle + states.shape[1] * bucket,
+                               rows.start - 0.5, rows.stop - 0.5))
+        self.image.set_visible(True)
+        return first_cycle + states.shape[1] * bucket
+
+    def _draw_segments(self, history, start, stop, rows):
+        segments = history.segments_between(start, stop, rows)
+        # Recortados a la ventana para no dibujar rectángulos enormes
+        starts = np.maximum(segments["start"], start)
+        ends = np.minimum(segments["end"], stop)
+        self.collection.set_verts(segment_verts(segments["row"], starts, ends - starts))
+        self.collection.set_facecolor(STATE_RGBA[segments["state"]])
+
+    def _draw_labels(self, history, rows):
+        """Inicial del estado actual de cada fila, si hay pocas filas visibles"""
+        current = history.open_segments()
+        labeled = rows if len(rows) <= self.LABELED_ROWS else range(0)
+        for index, label in enumerate(self.labels):
+            if index < len(labeled):
+                row = labeled[index]
+                label.set_position((history.cycle + 0.5, row))
+                label.set_text(STATE_NAMES[current["state"][row]][0])
+            label.set_visible(index < len(labeled))
+
+    def refresh(self):
+        """Vuelve a consultar la ventana visible con la última simulación recibida"""
+        if self._engine is None:
+            return
+        history = self._engine.history
+        if self.follow:
+            self._follow_limits(history)
+        start, stop = self.ax.get_xlim()
+        start, stop = max(0, int(np.floor(start))), max(1, int(np.ceil(stop)))
+        rows = self._visible_rows(history)
+
+        # Ciclos por píxel: si el resumen es tan fino como la pantalla, se usa;
+        # antes de ``segment_horizon`` es lo único que queda
+        pixels = max(1.0, self.ax.bbox.width)
+        if history.summary_bucket <= (stop - start) / pixels or start < history.segment_horizon:
+            tail = self._draw_summary(history, start, stop, rows)
+        else:
+            self.image.set_visible(False)
+            tail = start
+        self._draw_segments(history, tail, stop, rows)
+        self._draw_labels(history, rows)
+
+        limits = (self.ax.get_xlim(), self.ax.get_ylim(), self.ax.bbox.bounds)
+        if limits != self._limits:
+            self._limits = limits
+            self.blitter.redraw()
+        else:
+            self.blitter.update()
+
+    def update(self, engine):
+        if engine.reset_count != self._reset_count:
+            self._reset_count = engine.reset_count
+            self.follow = True
+        self._engine = engine
+        self._pids = engine.table.column("pid")
+        self.refresh()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or self._engine is None:
+            return
+        factor = 0.8 if event.button == "up" else 1.25
+        if event.key == "shift":
+            low, high = self.ax.get_ylim()
+            center = event.ydata
+            self.ax.set_ylim(center - (center - low) * factor, center + (high - center) * factor)
+        else:
+            low, high = self.ax.get_xlim()
+            center = event.xdata
+            self.ax.set_xlim(max(0, center - (center - low) * factor),
+                             center + (high - center) * factor)
+        self.follow = False
+        self.refresh()
+
+    def _on_press(self, event):
+        if event.inaxes is not self.ax or event.button != 1:
+            return
+        if event.dblclick:
+            self.follow = True
+            self.refresh()
+            return
+        self._drag = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _on_motion(self, event):
+        if self._drag is None or event.x is None:
+            return
+        x, y, (x0, x1), (y0, y1) = self._drag
+        bbox = self.ax.bbox
+        dx = (event.x - x) * (x1 - x0) / bbox.width
+        dy = (event.y - y) * (y1 - y0) / bbox.height
+        dx = min(dx, x0)  # sin ciclos negativos
+        self.ax.set_xlim(x0 - dx, x1 - dx)
+        self.ax.set_ylim(y0 - dy, y1 - dy)
+        self.follow = False
+        self.refresh()
+
+    def _on_release(self, event):
+        self._drag = None
+
+
+class ResourceUsageChart:
+    """Memoria por proceso (barras) y uso de CPU retenido en el historial (líneas).
+
+    ``update`` recibe opcionalmente ``rows``, el rango de filas a mostrar
+    (p. ej. las visibles en la lista de procesos); por defecto, todas.
+    """
+
+    def __init__(self, figure):
+        self.figure = figure
+
+        # Gráfico de memoria
+        self.memory_ax = figure.add_subplot(211)
+        self.memory_ax.set_title('Uso de Memoria por Proceso')
+        self.memory_ax.set_ylabel('MB')
+
+        # Gráfico de CPU
+        self.cpu_ax = figure.add_subplot(212)
+        self.cpu_ax.set_title('Uso de CPU a lo largo del tiempo')
+        self.cpu_ax.set_xlabel('Ciclo')
+        self.cpu_ax.set_ylabel('% CPU')
+        self.cpu_ax.grid(True, linestyle='--', alpha=0.7)
+        self.cpu_ax.set_ylim(0, 100)
+
+        self.bars = []
+        self.memory_labels = []
+        self.lines = []
+        self._rows = None
+        self._reset_count = None
+        self._xlim = (0, 1)
+        self.cpu_ax.set_xlim(*self._xlim)
+
+        figure.tight_layout()
+        self.blitter = Blitter(figure.canvas)
+
+    def _set_rows(self, engine, rows):
+        """Crea una barra y una línea por proceso mostrado"""
+        for artist in self.bars + self.memory_labels + self.lines:
+            artist.remove()
+
+        self._reset_count = engine.reset_count
+        self._rows = rows
+        process_ids = [f"P{pid}" for pid in engine.table.pid[rows.start:rows.stop].tolist()]
+        memory_usage = engine.table.memory_usage[rows.start:rows.stop]
+
+        # Posiciones numéricas: un eje de categorías recordaría todos los
+        # procesos mostrados alguna vez y las barras se irían corriendo
+        positions = np.arange(len(process_ids))
+        self.bars = list(self.memory_ax.bar(positions, memory_usage, color=STATE_RGBA[0]))
+        self.memory_ax.set_xticks(positions, process_ids)
+        self.memory_ax.set_xlim(-0.5, len(process_ids) - 0.5)
+        self.memory_labels = [
+            self.memory_ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + 5,
+                                f'{int(bar.get_height())}MB', ha='center', va='bottom')
+            for bar in self.bars
+        ]
+        self.memory_ax.set_ylim(0, max(1, int(memory_usage.max(initial=0))) * 1.2)
+
+        self.lines = [self.cpu_ax.plot([], [], marker='o', label=process_id)[0]
+                      for process_id in process_ids]
+        self.cpu_ax.legend()
+        self._xlim = (0, 1)
+        self.cpu_ax.set_xlim(*self._xlim)
+        self.blitter.set_artists(self.bars + self.lines)
+
+    def update(self, engine, rows=None):
+        full = False
+        if rows is None:
+            rows = range(len(engine.table))
+        if engine.reset_count != self._reset_count or self._rows != rows:
+            self._set_rows(engine, rows)
+            full = True
+
+        # Color de cada barra según el estado actual del proceso
+        colors = STATE_RGBA[engine.table.state[rows.start:rows.stop]]
+        for bar, color in zip(self.bars, colors):
+            bar.set_color(color)
+
+        # Solo las muestras retenidas en el búfer circular del historial
+        cycles, samples = engine.history.cpu_window(rows)
+        for index, line in enumerate(self.lines):
+            line.set_data(cycles, samples[:, index])
+
+        # El eje x se amplía al doble del tramo visible cuando los datos se salen
+        if len(cycles):
+            low, high = int(cycles[0]), int(cycles[-1])
+            if low < self._xlim[0] or high > self._xlim[1]:
+                self._xlim = (low, low + 2 * max(1, high - low))
+                self.cpu_ax.set_xlim(*self._xlim)
+                full = True
+
+        if full:
+            self.blitter.redraw()
+        else:
+            self.blitter.update()
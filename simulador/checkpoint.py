@@ -0,0 +1,370 @@
+"""Puntos de control: guardar, reanudar y recorrer una simulación.
+
+Un punto de control es el estado completo del motor (tabla de procesos,
+historial, generadores aleatorios, colas del planificador, memoria,
+dispositivos y ciclo actual), guardado por partes con nombre:
+
+* las columnas de la tabla y del historial y los demás arreglos NumPy, tal
+  cual y sin la capacidad sobrante;
+* los escalares del motor y del historial, en un encabezado JSON que además
+  describe cada arreglo (nombre, dtype y forma);
+* la política, el gestor de memoria, los dispositivos y la carga, en un
+  pickle que solo puede crear las clases de esos módulos y unos pocos tipos
+  de NumPy y de la biblioteca estándar (``SAFE_GLOBALS``): abrir un archivo
+  ajeno no ejecuta funciones arbitrarias.
+
+Formato del archivo::
+
+    MAGIC | VERSION (u8) | largo del encabezado (u32) | encabezado |
+    largo de los objetos (u64) | objetos | arreglos
+
+Un archivo de otra versión se rechaza con ``ValueError``.
+
+De una carga con llegadas se guardan la carga y los bloques ya leídos; al
+reanudar se vuelve a iterar salteando esos bloques, así que la carga tiene
+que ser reproducible (``Workload.reproducible``): con una que no lo es,
+guardar falla con ``ValueError`` en lugar de reanudar con otros procesos.
+
+``CheckpointTimeline`` guarda puntos de control en memoria a medida que
+avanza la simulación; ``seek`` vuelve a cualquier ciclo desde el anterior
+más cercano en lugar de resimular desde el ciclo 0.
+"""
+import bisect
+import io
+import itertools
+import json
+import os
+import pickle
+import struct
+from collections import deque
+
+import numpy as np
+
+from .engine import SimulationEngine
+from .history import HistoryStore
+from .process_table import COLUMNS, ProcessTable
+from .profiling import Profiler
+
+MAGIC = b"SIMCKPT"
+VERSION = 2
+
+# Opciones del motor que van en el encabezado
+SETTINGS = ("seed", "history_retention", "history_downsample", "history_segments", "history_summary",
+            "cores", "threads_per_core", "io_time", "event_driven")
+
+# Estado escalar del motor que va en el encabezado
+SCALARS = ("cycle_count", "cpu_key", "_running", "_slice_used", "_slice_quantum", "_fault_in", "_run_start",
+           "_pushed", "_admitted", "memory_waits", "memory_rejected", "_arrival_blocks")
+
+# Objetos del motor que van en el pickle restringido
+OBJECTS = ("scheduler", "dispatcher", "memory", "devices", "device_set", "workload", "_arrival_source")
+
+# Módulos cuyas clases puede crear el pickle de objetos
+SAFE_MODULES = ("simulador.scheduling", "simulador.cores", "simulador.memory", "simulador.devices",
+                "simulador.workload")
+
+# Otros nombres globales que puede usar el pickle de objetos
+SAFE_GLOBALS = {
+    ("collections", "deque"),
+    ("numpy", "dtype"),
+    ("numpy.core.numeric", "_frombuffer"),
+    ("numpy._core.numeric", "_frombuffer"),
+    ("numpy.core.multiarray", "scalar"),
+    ("numpy._core.multiarray", "scalar"),
+    ("numpy.random._pickle", "__generator_ctor"),
+    ("numpy.random._pickle", "__bit_generator_ctor"),
+    ("numpy.random._pcg64", "PCG64"),
+    ("numpy.random.bit_generator", "SeedSequence"),
+    ("numpy.random.bit_generator", "__pyx_unpickle_SeedSequence"),
+}
+
+
+def resumable(engine):
+    """True si un punto de control de ``engine`` se puede reanudar igual que la corrida original"""
+    return engine._arrivals is None or engine._arrival_source.reproducible
+
+
+class Checkpoint:
+    """Punto de control en memoria: encabezado, objetos serializados y arreglos por nombre.
+
+    Los arreglos del historial que solo crecen se comparten con el motor
+    (ver ``HistoryStore.checkpoint_state``), así que capturar no cuesta
+    proporcional a todo el historial.
+    """
+
+    def __init__(self, header, objects, arrays):
+        self.header = header
+        self.objects = objects
+        self.arrays = arrays
+
+
+class _ObjectPickler(pickle.Pickler):
+    """Serializa los objetos del motor sin la tabla de procesos, que va por columnas"""
+
+    def __init__(self, file, table):
+        super().__init__(file, protocol=5)
+        self.table = table
+
+    def persistent_id(self, obj):
+        return "table" if obj is self.table else None
+
+
+class _ObjectUnpickler(pickle.Unpickler):
+    """Carga los objetos del motor; solo crea clases de ``SAFE_MODULES`` y ``SAFE_GLOBALS``"""
+
+    def __init__(self, file, table):
+        super().__init__(file)
+        self.table = table
+
+    def persistent_load(self, pid):
+        if pid != "table":
+            raise pickle.UnpicklingError(f"Referencia desconocida en el punto de control: {pid}")
+        return self.table
+
+    def find_class(self, module, name):
+        if (module, name) in SAFE_GLOBALS:
+            return super().find_class(module, name)
+        if module in SAFE_MODULES:
+            found = super().find_class(module, name)
+            if isinstance(found, type):
+                return found
+        raise pickle.UnpicklingError(f"El punto de control usa {module}.{name}, que no se puede cargar")
+
+
+def _json_value(value):
+    """Convierte enteros de NumPy y colas para el encabezado JSON"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, deque):
+        return list(value)
+    raise TypeError(f"No se puede guardar {type(value).__name__} en un punto de control")
+
+
+def capture(engine):
+    """Punto de control de ``engine`` en memoria.
+
+    Como ``save_checkpoint``, falla con ``ValueError`` si la carga no es reproducible.
+    """
+    if not resumable(engine):
+        raise ValueError(f"La carga {type(engine._arrival_source).__name__} no es reproducible: "
+                         "no se puede reanudar desde un punto de control")
+    table = engine.table
+    arrays = {f"table.{name}": table.column(name).copy() for name in COLUMNS}
+    arrays["table.time_in_states"] = table.time_in_states[:len(table)].copy()
+    history, history_arrays = engine.history.checkpoint_state()
+    arrays.update((f"history.{name}", values) for name, values in history_arrays.items())
+    arrays["slot_busy"] = engine.slot_busy.copy()
+    arrays["live"] = engine._live.copy()
+    if engine._pending is not None:
+        arrays.update((f"pending.{name}", values) for name, values in engine._pending.items())
+    state = {name: getattr(engine, name) for name in SCALARS}
+    state["rng"] = engine.rng.bit_generator.state
+    state["io_heap"] = engine._io_heap
+    state["memory_queue"] = engine._memory_queue
+    state["pending"] = engine._pending is not None
+    state["arrivals"] = engine._arrivals is not None
+    header = {
+        "settings": {name: getattr(engine, name) for name in SETTINGS},
+        "engine": state,
+        "history": history,
+    }
+    # Pasar por JSON deja los valores como quedarán al cargar el archivo
+    header = json.loads(json.dumps(header, default=_json_value))
+    file = io.BytesIO()
+    _ObjectPickler(file, table).dump({name: getattr(engine, name) for name in OBJECTS})
+    return Checkpoint(header, file.getvalue(), arrays)
+
+
+def restore(checkpoint, engine=None):
+    """Carga ``checkpoint`` en ``engine`` (o en un motor nuevo) y lo devuelve.
+
+    ``engine`` conserva sus suscriptores y su ``profiler``; para sus vistas
+    es un reinicio.
+    """
+    header, arrays = checkpoint.header, checkpoint.arrays
+    try:
+        table = ProcessTable(capacity=len(arrays["table.pid"]))
+        table.append_columns(**{name: arrays[f"table.{name}"] for name in COLUMNS})
+        table.time_in_states[:len(table)] = arrays["table.time_in_states"]
+        history = HistoryStore.from_checkpoint(header["history"], {
+            name[len("history."):]: values for name, values in arrays.items() if name.startswith("history.")})
+        state = header["engine"]
+        restored = SimulationEngine.__new__(SimulationEngine)
+        restored.__dict__.update(header["settings"])
+        restored.__dict__.update((name, state[name]) for name in SCALARS)
+    except KeyError as error:
+        raise ValueError(f"Al punto de control le falta {error.args[0]}") from None
+    restored.__dict__.update(_ObjectUnpickler(io.BytesIO(checkpoint.objects), table).load())
+    restored.profiler = Profiler()
+    restored.reset_count = 0
+    restored._subscribers = []
+    restored._views = None
+    restored.table = table
+    restored.history = history
+    restored.rng = np.random.default_rng()
+    restored.rng.bit_generator.state = state["rng"]
+    restored.slot_busy = arrays["slot_busy"].copy()
+    restored._live = arrays["live"].copy()
+    restored._io_heap = [tuple(entry) for entry in state["io_heap"]]
+    restored._memory_queue = deque(state["memory_queue"])
+    restored._pending = None
+    if state["pending"]:
+        restored._pending = {name[len("pending."):]: values.copy() for name, values in arrays.items()
+                             if name.startswith("pending.")}
+    restored._arrivals = None
+    if state["arrivals"]:
+        restored._arrivals = itertools.islice(iter(restored._arrival_source), restored._arrival_blocks, None)
+    restored._update_state_counts()
+    if engine is None:
+        return restored
+    engine.adopt(restored)
+    return engine
+
+
+def write_checkpoint(engine, file):
+    """Escribe el estado de ``engine`` en ``file`` (abierto en binario)"""
+    checkpoint = capture(engine)
+    arrays = {name: np.ascontiguousarray(values) for name, values in checkpoint.arrays.items()}
+    header = {**checkpoint.header,
+              "arrays": [[name, values.dtype.str, list(values.shape)] for name, values in arrays.items()]}
+    data = json.dumps(header).encode("utf-8")
+    file.write(MAGIC)
+    file.write(struct.pack("<BI", VERSION, len(data)))
+    file.write(data)
+    file.write(struct.pack("<Q", len(checkpoint.objects)))
+    file.write(checkpoint.objects)
+    for values in arrays.values():
+        file.write(values.data)
+
+
+def _read_exactly(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Punto de control incompleto")
+    return data
+
+
+def read_checkpoint(file, engine=None):
+    """Carga un punto de control de ``file`` en ``engine`` (o en un motor nuevo) y lo devuelve.
+
+    ``engine`` conserva sus suscriptores y su ``profiler``.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("El archivo no es un punto de control del simulador")
+    version, length = struct.unpack("<BI", _read_exactly(file, 5))
+    if version != VERSION:
+        raise ValueError(f"Versión de punto de control no soportada: {version} (se espera {VERSION})")
+    header = json.loads(_read_exactly(file, length))
+    size, = struct.unpack("<Q", _read_exactly(file, 8))
+    objects = _read_exactly(file, size)
+    arrays = {}
+    for name, dtype, shape in header.pop("arrays"):
+        dtype = np.dtype(dtype)
+        if dtype.kind not in "biuf":
+            raise ValueError(f"Tipo de arreglo no soportado en el punto de control: {dtype}")
+        buffer = bytearray(dtype.itemsize * int(np.prod(shape)))  # escribible
+        if file.readinto(buffer) != len(buffer):
+            raise ValueError("Punto de control incompleto")
+        arrays[name] = np.frombuffer(buffer, dtype=dtype).reshape(shape)
+    return restore(Checkpoint(header, objects, arrays), engine)
+
+
+def save_checkpoint(engine, path):
+    """Escribe el punto de control en ``path``; si falla, no deja un archivo a medias"""
+    path = os.fspath(path)
+    try:
+        with open(path + ".tmp", "wb") as file:
+            write_checkpoint(engine, file)
+    except BaseException:
+        if os.path.exists(path + ".tmp"):
+            os.remove(path + ".tmp")
+        raise
+    os.replace(path + ".tmp", path)
+
+
+def load_checkpoint(path, engine=None):
+    with open(path, "rb") as file:
+        return read_checkpoint(file, engine)
+
+
+def dumps(engine):
+    """Punto de control de ``engine`` como ``bytes``"""
+    file = io.BytesIO()
+    write_checkpoint(engine, file)
+    return file.getvalue()
+
+
+def loads(data, engine=None):
+    return read_checkpoint(io.BytesIO(data), engine)
+
+
+def _footprint(checkpoints):
+    """Bytes de ``checkpoints``, contando una vez los arreglos que comparten"""
+    buffers = {}
+    for checkpoint in checkpoints:
+        buffers[id(checkpoint.objects)] = len(checkpoint.objects)
+        for values in checkpoint.arrays.values():
+            owner = values.base if isinstance(values.base, np.ndarray) else values
+            buffers[id(owner)] = owner.nbytes
+    return sum(buffers.values())
+
+
+class CheckpointTimeline:
+    """Puntos de control en memoria, separados por al menos ``interval`` ciclos.
+
+    Cuando ocupan más de ``max_bytes`` se descarta uno de cada dos (siempre
+    queda el primero) y el intervalo se duplica, así que la memoria queda
+    acotada sin importar la duración de la corrida. ``furthest`` es el ciclo
+    más lejano alcanzado, hasta donde se puede volver a avanzar con ``seek``.
+    """
+
+    def __init__(self, interval=100, max_bytes=256 * 2 ** 20):
+        self.initial_interval = interval
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.interval = self.initial_interval
+        self.cycles = []
+        self._checkpoints = []
+        self.nbytes = 0
+        self.furthest = 0
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def capture(self, engine, force=False):
+        """Guarda un punto de control si pasaron ``interval`` ciclos desde el último.
+
+        Como ``save_checkpoint``, falla con ``ValueError`` si la carga no es reproducible.
+        """
+        cycle = engine.cycle_count
+        self.furthest = max(self.furthest, cycle)
+        if not force and self.cycles and cycle < self.cycles[-1] + self.interval:
+            return False
+        index = bisect.bisect_left(self.cycles, cycle)
+        if index < len(self.cycles) and self.cycles[index] == cycle:
+            return False
+        self.cycles.insert(index, cycle)
+        self._checkpoints.insert(index, capture(engine))
+        self.nbytes = _footprint(self._checkpoints)
+        while self.nbytes > self.max_bytes and len(self.cycles) > 1:
+            self.cycles = self.cycles[::2]
+            self._checkpoints = self._checkpoints[::2]
+            self.nbytes = _footprint(self._checkpoints)
+            self.interval *= 2
+        return True
+
+    def seek(self, engine, cycle):
+        """Lleva ``engine`` a ``cycle`` desde el punto de control anterior más cercano.
+
+        Si el motor ya está entre ese punto y ``cycle``, solo avanza.
+        """
+        index = bisect.bisect_right(self.cycles, cycle) - 1
+        if index < 0:
+            raise ValueError(f"No hay puntos de control antes del ciclo {cycle}")
+        if not self.cycles[index] <= engine.cycle_count <= cycle:
+            restore(self._checkpoints[index], engine)
+        engine.run(cycle - engine.cycle_count)
+        self.furthest = max(self.furthest, cycle)
+        return engine
@@ -0,0 +1,126 @@
+"""Reparto de procesos listos entre núcleos.
+
+El motor planificado tiene ``cores × threads_per_core`` ranuras (hilos de
+hardware) y pide procesos a un despachador:
+
+* ``SharedQueueDispatcher``: una sola cola (una política) para todos los
+  núcleos; es lo que se usa al pasar una ``SchedulingPolicy`` al motor.
+* ``PerCoreDispatcher``: una cola por núcleo. El núcleo de ``Process.core``
+  es el núcleo de afinidad; un núcleo sin trabajo roba de la cola más larga
+  y el proceso robado migra (su columna ``core`` pasa al nuevo núcleo).
+"""
+from .scheduling import SchedulingPolicy, make_scheduler
+
+
+class SharedQueueDispatcher:
+    """Todos los núcleos despachan de una misma cola de listos"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.steals = 0
+
+    @property
+    def preemptive(self):
+        return self.policy.preemptive
+
+    def attach(self, table, cores):
+        self.table = table
+        self.policy.attach(table)
+
+    def __len__(self):
+        return len(self.policy)
+
+    def push(self, row):
+        self.policy.push(row)
+
+    def pop(self, core):
+        return self.policy.pop()
+
+    def quantum(self, row, core):
+        return self.policy.quantum(row)
+
+    def expired(self, row, core):
+        self.policy.expired(row)
+
+    def preempts(self, row, core):
+        return self.policy.preempts(row)
+
+    def on_cycle(self, cycle):
+        self.policy.on_cycle(cycle)
+
+    def next_event(self, cycle):
+        return self.policy.next_event(cycle)
+
+
+class PerCoreDispatcher:
+    """Una cola de listos por núcleo, con afinidad y robo de trabajo.
+
+    ``policy`` es el nombre de la política (ver ``scheduling.SCHEDULERS``)
+    que se instancia en cada núcleo. Con ``affinity=False`` cada proceso
+    listo va a la cola más corta; con ``steal=False`` un núcleo ocioso no
+    toma trabajo de otros.
+    """
+
+    def __init__(self, policy="FCFS", affinity=True, steal=True, **options):
+        self.policy_name = policy
+        self.policy_options = options
+        self.affinity = affinity
+        self.steal = steal
+        self.queues = []
+        self.steals = 0
+
+    @property
+    def preemptive(self):
+        return bool(self.queues) and self.queues[0].preemptive
+
+    def attach(self, table, cores):
+        self.table = table
+        self.queues = [make_scheduler(self.policy_name, **self.policy_options) for _ in range(cores)]
+        for queue in self.queues:
+            queue.attach(table)
+        self.steals = 0
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues)
+
+    def push(self, row):
+        if self.affinity:
+            core = int(self.table.core[row]) % len(self.queues)
+        else:
+            core = min(range(len(self.queues)), key=lambda index: len(self.queues[index]))
+        self.table.core[row] = core
+        self.queues[core].push(row)
+
+    def pop(self, core):
+        row = self.queues[core].pop()
+        if row is None and self.steal:
+            victim = max(self.queues, key=len)
+            row = victim.pop()
+            if row is not None:
+                self.steals += 1
+                self.table.core[row] = core
+        return row
+
+    def quantum(self, row, core):
+        return self.queues[core].quantum(row)
+
+    def expired(self, row, core):
+        self.queues[core].expired(row)
+
+    def preempts(self, row, core):
+        return self.queues[core].preempts(row)
+
+    def on_cycle(self, cycle):
+        for queue in self.queues:
+            queue.on_cycle(cycle)
+
+    def next_event(self, cycle):
+        events = [event for event in (queue.next_event(cycle) for queue in self.queues) if event is not None]
+        return min(events, default=None)
+
+
+def as_dispatcher(scheduler):
+    """Acepta una política (cola compartida) o un despachador ya construido"""
+    if isinstance(scheduler, SchedulingPolicy):
+        return SharedQueueDispatcher(scheduler)
+    return scheduler
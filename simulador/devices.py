@@ -0,0 +1,234 @@
+"""Dispositivos de E/S con cola propia para el modelo planificado.
+
+Sin dispositivos, un proceso que termina su ráfaga espera siempre
+``io_time`` ciclos. Con ``devices`` cada pedido de E/S va a un dispositivo
+(elegido al azar según su ``weight``), espera en su cola y se atiende de a
+uno, así que el tiempo en WAITING refleja la contención del dispositivo.
+
+* Tiempo de servicio: ``"constant"``, ``"exponential"`` o ``"uniform"`` con
+  media ``service_time``. Con ``tracks`` > 0 (un disco) cada pedido va a una
+  pista al azar y se suma ``seek_time`` por pista recorrida por el cabezal.
+* Planificación: ``"FIFO"`` o ``"SCAN"`` (ascensor: el cabezal atiende el
+  pedido más cercano en su sentido y se da vuelta cuando no quedan más).
+
+El motor llama a ``submit`` al pedir E/S y a ``finish`` cuando termina el
+servicio en curso; ambos devuelven ``(row, fin)`` del pedido que empieza a
+atenderse, si hay alguno. Los sorteos usan el generador de ``attach``, así
+que el resultado no depende de si el motor salta ciclos o no.
+"""
+import bisect
+from collections import deque
+
+import numpy as np
+
+from .scheduling import ORIGINAL_NAMES
+
+DISTRIBUTIONS = ("constant", "exponential", "uniform")
+
+
+class FIFORequests:
+    """Pedidos en orden de llegada"""
+
+    def __init__(self):
+        self._queue = deque()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, request):
+        self._queue.append(request)
+
+    def pop(self, device):
+        return self._queue.popleft()
+
+
+class ScanRequests:
+    """Pedidos ordenados por pista; el cabezal barre en un sentido y luego en el otro"""
+
+    def __init__(self):
+        self._queue = []  # (pista, orden de llegada, pedido)
+        self._order = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, request):
+        bisect.insort(self._queue, (request[2], self._order, request))
+        self._order += 1
+
+    def pop(self, device):
+        key = (device.head, -1)
+        if device.direction > 0:
+            index = bisect.bisect_left(self._queue, key)
+            if index == len(self._queue):
+                device.direction = -1
+                index -= 1
+        else:
+            index = bisect.bisect_left(self._queue, (device.head + 1, -1)) - 1
+            if index < 0:
+                device.direction = 1
+                index = 0
+        return self._queue.pop(index)[2]
+
+
+SCHEDULING = {"FIFO": FIFORequests, "SCAN": ScanRequests}
+
+
+class Device:
+    """Un dispositivo que atiende pedidos de E/S de a uno"""
+
+    def __init__(self, name, service_time=5, distribution="exponential", scheduling="FIFO",
+                 tracks=0, seek_time=0.05, weight=1.0):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribución desconocida: {distribution}")
+        if scheduling not in SCHEDULING:
+            raise ValueError(f"Planificación de E/S desconocida: {scheduling}")
+        self.name = name
+        self.service_time = service_time
+        self.distribution = distribution
+        self.scheduling = scheduling
+        self.tracks = tracks
+        self.seek_time = seek_time
+        self.weight = weight
+
+    def attach(self, rng):
+        """Vacía la cola y reinicia las estadísticas; ``rng`` sortea pistas y servicios"""
+        self.rng = rng
+        self.queue = SCHEDULING[self.scheduling]()
+        self.head = 0
+        self.direction = 1
+        self.current = None     # fila en servicio
+        self.busy_until = 0
+        self.requests = 0       # pedidos atendidos o en servicio
+        self.busy = 0           # ciclos de servicio asignados
+        self.waited = 0         # ciclos de espera en cola de los atendidos
+        self.max_queue = 0
+
+    def _service(self, track):
+        mean = self.service_time
+        if self.distribution == "constant":
+            service = mean
+        elif self.distribution == "exponential":
+            service = self.rng.exponential(mean)
+        else:
+            service = self.rng.uniform(0, 2 * mean)
+        if self.tracks:
+            service += self.seek_time * abs(track - self.head)
+            self.head = track
+        return max(1, int(round(service)))
+
+    def _start(self, request, cycle):
+        row, arrival, track = request
+        service = self._service(track)
+        self.current = row
+        self.busy_until = cycle + service
+        self.requests += 1
+        self.busy += service
+        self.waited += cycle - arrival
+        return row, self.busy_until
+
+    def submit(self, row, cycle):
+        """Encola un pedido de ``row``; si el dispositivo está libre empieza a atenderlo"""
+        track = int(self.rng.integers(self.tracks)) if self.tracks else 0
+        request = (row, cycle, track)
+        if self.current is None:
+            return self._start(request, cycle)
+        self.queue.push(request)
+        self.max_queue = max(self.max_queue, len(self.queue))
+        return None
+
+    def finish(self, cycle):
+        """Termina el pedido en servicio y empieza el siguiente de la cola, si hay"""
+        self.current = None
+        if not len(self.queue):
+            return None
+        return self._start(self.queue.pop(self), cycle)
+
+    def stats(self, cycle):
+        # El servicio en curso cuenta solo hasta ``cycle``
+        busy = self.busy - max(0, self.busy_until - cycle) if self.current is not None else self.busy
+        return {
+            "requests": self.requests,
+            "queue": len(self.queue),
+            "max_queue": self.max_queue,
+            "utilization": busy / max(1, cycle),
+            "mean_wait": self.waited / self.requests if self.requests else 0.0,
+            "mean_service": self.busy / self.requests if self.requests else 0.0,
+        }
+
+
+class DeviceSet:
+    """Dispositivos del motor; cada pedido de E/S elige uno al azar según ``weight``"""
+
+    def __init__(self, devices):
+        self.devices = list(devices)
+        if not self.devices:
+            raise ValueError("Se necesita al menos un dispositivo")
+        weights = np.array([device.weight for device in self.devices], dtype=float)
+        self.weights = weights / weights.sum()
+
+    def __iter__(self):
+        return iter(self.devices)
+
+    def attach(self, key):
+        self._rng = np.random.default_rng([key, 0])
+        for index, device in enumerate(self.devices):
+            device.attach(np.random.default_rng([key, index + 1]))
+        self._in_service = {}  # fila → dispositivo que la atiende
+
+    def _started(self, device, started):
+        if started is not None:
+            self._in_service[started[0]] = device
+        return started
+
+    def submit(self, row, cycle):
+        """Manda el pedido de ``row`` a un dispositivo; devuelve ``(row, fin)`` si empieza ya"""
+        if len(self.devices) == 1:
+            device = self.devices[0]
+        else:
+            device = self.devices[int(self._rng.choice(len(self.devices), p=self.weights))]
+        return self._started(device, device.submit(row, cycle))
+
+    def finish(self, row, cycle):
+        """Termina el servicio de ``row``; devuelve el pedido que empieza en su lugar, si hay.
+
+        Las filas que no están en servicio (p. ej. un fallo de página) se ignoran.
+        """
+        device = self._in_service.pop(row, None)
+        if device is None:
+            return None
+        return self._started(device, device.finish(cycle))
+
+    def stats(self, cycle):
+        return {device.name: device.stats(cycle) for device in self.devices}
+
+
+# Dispositivos predefinidos (los nombres de ``make_devices``)
+DEVICE_PRESETS = {
+    "DISK": lambda: Device("disk", service_time=4, distribution="exponential", tracks=200),
+    "DISK_SCAN": lambda: Device("disk", service_time=4, distribution="exponential", scheduling="SCAN",
+                                tracks=200),
+    "NETWORK": lambda: Device("network", service_time=8, distribution="exponential"),
+}
+
+
+def make_devices(names):
+    """``DeviceSet`` con los dispositivos predefinidos ``names``; ``None`` es la E/S fija"""
+    if names is None:
+        return None
+    if isinstance(names, str):
+        names = names.split(",")
+    try:
+        return DeviceSet(DEVICE_PRESETS[name]() for name in names)
+    except KeyError as error:
+        raise ValueError(f"Dispositivo desconocido: {error.args[0]}") from None
+
+
+def devices_name(text):
+    """Dispositivos separados por comas leídos de la línea de comandos; ``none`` u ``original`` dan ``None``"""
+    if text.lower() in ORIGINAL_NAMES:
+        return None
+    for name in text.split(","):
+        if name not in DEVICE_PRESETS:
+            raise ValueError(f"Dispositivo desconocido: {name}")
+    return text
@@ -0,0 +1,856 @@
+"""Motor de simulación de procesos sin dependencias gráficas.
+
+Contiene las reglas de transición NEW→READY→RUNNING→WAITING→TERMINATED que
+antes vivían en ``ProcessSimulator.simulate_process_cycle``. La interfaz Tk
+se suscribe al motor y solo se encarga de dibujar.
+
+Los procesos se guardan en una ``ProcessTable`` (columnas NumPy), de modo que
+un ciclo cuesta unas pocas operaciones vectoriales sin importar cuántos
+procesos haya.
+
+Con ``event_driven`` el motor salta directamente al próximo ciclo en que
+algún proceso cambia de estado (fin de ráfaga, de quantum o de E/S). Los
+ciclos intermedios se resuelven en bloque y dan exactamente el mismo
+resultado que simularlos uno a uno: el uso de CPU de cada muestra se deriva
+de (semilla, proceso, ciclo) y no del orden en que se generan, y el tiempo
+en cada estado se acumula al cerrar cada estancia.
+"""
+import copy
+import heapq
+from collections import deque
+
+import numpy as np
+
+from .cores import as_dispatcher
+from .devices import DeviceSet
+from .history import SEGMENT_RETENTION, HistoryStore
+from .process_table import ProcessTable
+from .profiling import CYCLES, Profiler
+from .states import (
+    CPU_HIGH,
+    CPU_LOW,
+    NEXT_STATE,
+    PRIORITIES,
+    PROCESS_STATES,
+    NEW,
+    READY,
+    RUNNING,
+    STATE_NAMES,
+    TERMINATED,
+    WAITING,
+)
+from .workload import Workload
+
+# Rango de uso de CPU de la muestra inicial (ciclo 0)
+INITIAL_CPU_RANGE = (10, 30)
+
+# Con hasta tantos procesos vivos el modelo original los recorre uno a uno:
+# con arreglos tan chicos domina el costo fijo de cada operación NumPy
+SMALL_LIVE = 16
+
+# Opciones del constructor que se pueden cambiar con ``configure``
+OPTIONS = ("seed", "history_retention", "history_downsample", "history_segments", "history_summary",
+           "scheduler", "cores", "threads_per_core", "io_time", "event_driven", "workload", "memory", "devices",
+           "profiler")
+
+_MASK64 = 2 ** 64 - 1
+_NEXT_STATE = NEXT_STATE.tolist()
+_CPU_LOW = CPU_LOW.tolist()
+_CPU_HIGH = CPU_HIGH.tolist()
+
+
+class Process:
+    """Descripción de un proceso a cargar en el motor.
+
+    Memoria, núcleo e hilo se sortean con ``rng`` (un ``numpy.random.Generator``);
+    sin él cada proceso usa un generador nuevo sin semilla.
+    """
+
+    def __init__(self, id, priority, execution_time, execution_cycle, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.id = id
+        self.priority = priority
+        self.execution_time = execution_time
+        self.execution_cycle = execution_cycle
+        self.initial_execution_time = execution_time  # Para seguimiento del progreso
+        self.current_state = PROCESS_STATES["NEW"]
+        self.memory_usage = int(rng.integers(100, 601))  # 100-600 MB
+        self.core = int(rng.integers(0, 4))  # 0-3 núcleos
+        self.thread = int(rng.integers(0, 8))  # 0-7 hilos
+
+
+def default_processes(rng=None):
+    """Carga de trabajo inicial del simulador: tres procesos de distinta prioridad"""
+    rng = rng if rng is not None else np.random.default_rng()
+    return [
+        Process(1, "Alta", 10, 5, rng),
+        Process(2, "Media", 15, 7, rng),
+        Process(3, "Baja", 20, 10, rng)
+    ]
+
+
+def _mix(values):
+    """splitmix64 sobre un arreglo ``uint64`` (aritmética módulo 2**64)"""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _mix_int(value):
+    """``_mix`` sobre un entero de Python"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def cpu_sample(key, row, cycle, low, high):
+    """Lo mismo que ``cpu_samples`` para una sola fila y un solo ciclo, sin arreglos"""
+    return low + _mix_int(_mix_int(cycle ^ key) ^ row) % (high - low + 1)
+
+
+def cpu_samples(key, rows, cycles, low, high):
+    """Uso de CPU de ``rows`` en cada uno de ``cycles``, forma (ciclos, filas).
+
+    Cada muestra depende solo de (``key``, fila, ciclo) y cae en
+    ``[low, high]`` (por fila), así que no importa en qué orden ni en qué
+    bloques se generen.
+    """
+    cycles = np.asarray(cycles, dtype=np.uint64).reshape(-1, 1)
+    rows = np.asarray(rows, dtype=np.uint64)
+    hashed = _mix(_mix(cycles ^ np.uint64(key)) ^ rows)
+    span = (np.asarray(high, dtype=np.int64) - low + 1).astype(np.uint64)
+    return (low + (hashed % span).astype(np.int64)).astype(np.uint8)
+
+
+def _time_in_states(table, history):
+    """Ciclos en cada estado por proceso: estancias cerradas más la actual"""
+    times = table.time_in_states[:len(table)].copy()
+    current = history.open_segments()
+    times[current["row"], current["state"]] += current["length"]
+    return times
+
+
+class ProcessView:
+    """Una fila de la tabla del motor vista con los atributos de ``Process``"""
+
+    __slots__ = ("_engine", "_row")
+
+    def __init__(self, engine, row):
+        self._engine = engine
+        self._row = row
+
+    def _get(self, column):
+        return int(getattr(self._engine.table, column)[self._row])
+
+    @property
+    def id(self):
+        return self._get("pid")
+
+    @property
+    def priority(self):
+        return PRIORITIES[self._get("priority")]
+
+    @property
+    def execution_time(self):
+        return self._get("execution_time")
+
+    @property
+    def initial_execution_time(self):
+        return self._get("initial_execution_time")
+
+    @property
+    def execution_cycle(self):
+        return self._get("execution_cycle")
+
+    @property
+    def memory_usage(self):
+        return self._get("memory_usage")
+
+    @property
+    def core(self):
+        return self._get("core")
+
+    @property
+    def thread(self):
+        return self._get("thread")
+
+    @property
+    def current_state(self):
+        return STATE_NAMES[self._get("state")]
+
+    @property
+    def time_in_states(self):
+        times = self._engine.table.time_in_states[self._row].copy()
+        state, _, length = self._engine.history.open_segment(self._row)
+        times[state] += length
+        return dict(zip(STATE_NAMES, times.tolist()))
+
+    @property
+    def state_history(self):
+        codes = self._engine.history.state_history(self._row)
+        return [STATE_NAMES[code] for code in codes.tolist()]
+
+    @property
+    def cpu_usage_history(self):
+        """Muestras de CPU retenidas en el búfer circular del historial"""
+        _, samples = self._engine.history.cpu_window([self._row])
+        return samples[:, 0].tolist()
+
+
+class EngineSnapshot:
+    """Estado congelado del motor en un ciclo, seguro de leer desde otro hilo.
+
+    Ofrece los mismos atributos de lectura que el motor (``cycle_count``,
+    ``state_counts``, ``table``, ``history``, ``processes``, ``reset_count``)
+    y sus métodos de estadísticas (``core_utilization``, ``memory_stats``,
+    ``device_stats``), con los valores del ciclo de la instantánea.
+    Del búfer de CPU del historial solo se copian las filas ``cpu_rows``
+    (por defecto, todas; ver ``HistoryStore.snapshot``).
+    """
+
+    def __init__(self, engine, cpu_rows=None):
+        self.reset_count = engine.reset_count
+        self.cycle_count = engine.cycle_count
+        self.state_counts = dict(engine.state_counts)
+        self.state_count_array = engine.state_count_array.copy()
+        self.finished = engine.finished
+        self._core_utilization = engine.core_utilization()
+        self._memory_stats = engine.memory_stats()
+        self._device_stats = engine.device_stats()
+        self.table = engine.table.copy()
+        self.history = engine.history.snapshot(cpu_rows)
+        self._views = None
+
+    @property
+    def processes(self):
+        if self._views is None:
+            self._views = [ProcessView(self, row) for row in range(len(self.table))]
+        return self._views
+
+    def time_in_states(self):
+        """Arreglo (procesos, estados) con los ciclos pasados en cada estado"""
+        return _time_in_states(self.table, self.history)
+
+    def core_utilization(self):
+        return self._core_utilization
+
+    def memory_stats(self):
+        return self._memory_stats
+
+    def device_stats(self):
+        return self._device_stats
+
+
+class SimulationEngine:
+    """Avanza la simulación ciclo a ciclo sin tocar ningún widget.
+
+    Las vistas se registran con ``subscribe`` y reciben el motor después de
+    cada ``step``, ``advance`` o ``reset``; el motor puede usarse igual desde un script
+    o una prueba. ``processes`` acepta una lista de ``Process``, una
+    ``ProcessTable`` o una ``Workload``, cuyos procesos se dan de alta (en
+    NEW) en su ciclo de llegada; ``workload`` es la carga que se usa al
+    reiniciar sin procesos. ``history_retention``, ``history_downsample``,
+    ``history_segments`` (su ``segment_retention``) y ``history_summary``
+    configuran el ``HistoryStore``; el resumen de la línea de tiempo solo
+    se mantiene con ``history_summary=True``.
+
+    Sin ``scheduler`` se usa el modelo original: todos los procesos avanzan
+    a la vez por NEW→READY→RUNNING→WAITING. Con una política de
+    ``scheduling`` (o un despachador de ``cores``) los procesos compiten por
+    ``cores × threads_per_core`` hilos de hardware: corren ráfagas de
+    ``execution_cycle`` ciclos y esperan ``io_time`` ciclos de E/S entre
+    ráfagas.
+
+    Con ``event_driven`` (por defecto) ``run`` y ``advance`` saltan los
+    ciclos en que ningún proceso cambia de estado; ``step`` siempre avanza
+    un solo ciclo.
+
+    ``memory`` es un gestor de ``simulador.memory``: en el modelo planificado
+    un proceso solo pasa a READY si obtiene su memoria, y si no espera en
+    WAITING. ``devices`` (una lista de ``Device`` o un ``DeviceSet``)
+    reemplaza la espera fija de ``io_time`` por dispositivos de E/S con cola.
+    El modelo original no usa ni el gestor ni los dispositivos.
+
+    ``profiler`` (un ``simulador.profiling.Profiler``) mide las fases de cada
+    avance: ``engine.fast_forward``, ``engine.transitions``, ``engine.commit``,
+    ``engine.notify`` y ``engine.snapshot``, y cuenta los ciclos simulados.
+    """
+
+    def __init__(self, processes=None, seed=None, history_retention=1024, history_downsample=1,
+                 scheduler=None, cores=1, threads_per_core=1, io_time=1, event_driven=True, workload=None,
+                 memory=None, devices=None, profiler=None, history_segments=SEGMENT_RETENTION,
+                 history_summary=False):
+        self.seed = seed
+        self.history_retention = history_retention
+        self.history_downsample = history_downsample
+        self.history_segments = history_segments
+        self.history_summary = history_summary
+        self.scheduler = scheduler
+        self.cores = cores
+        self.threads_per_core = threads_per_core
+        self.io_time = io_time
+        self.event_driven = event_driven
+        self.workload = workload
+        self.memory = memory
+        self.devices = devices
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.reset_count = 0  # las vistas lo usan para detectar un reinicio
+        self._subscribers = []
+        self.reset(processes)
+
+    def configure(self, processes=None, **options):
+        """Cambia opciones del constructor (``scheduler``, ``cores``..., ver ``OPTIONS``) y reinicia.
+
+        El motor reiniciado se arma aparte y solo reemplaza al estado actual
+        si arranca bien: si falla (p. ej. una traza inválida) este motor
+        queda como estaba.
+        """
+        for name in options:
+            if name not in OPTIONS:
+                raise TypeError(f"Opción desconocida del motor: {name}")
+        current = {name: getattr(self, name) for name in OPTIONS}
+        # La política, el gestor y los dispositivos que se conservan se copian
+        # (sin la tabla) para que el motor nuevo no altere los de este
+        memo = {id(self.table): None}
+        for name in ("scheduler", "memory", "devices"):
+            if name not in options:
+                current[name] = copy.deepcopy(current[name], memo)
+        self.adopt(SimulationEngine(processes, **{**current, **options}))
+
+    def adopt(self, engine):
+        """Toma el estado de ``engine`` como un reinicio, conservando suscriptores y ``profiler``"""
+        reset_count = self.reset_count + 1  # las vistas lo toman como un reinicio
+        self.__dict__.update((name, value) for name, value in vars(engine).items()
+                             if name not in ("_subscribers", "profiler"))
+        self.reset_count = reset_count
+        self._views = None
+        self._notify()
+
+    def reset(self, processes=None):
+        self.reset_count += 1
+        self.rng = np.random.default_rng(self.seed)
+        self.cpu_key = int(self.rng.integers(2 ** 63))  # clave de las muestras de CPU
+        if processes is None:
+            processes = self.workload if self.workload is not None else default_processes(self.rng)
+        # Carga con llegadas: bloque pendiente y resto de la carga sin leer
+        # (con la carga y los bloques leídos un punto de control la retoma)
+        self._arrivals = None
+        self._arrival_source = None
+        self._arrival_blocks = 0
+        self._pending = None
+        if isinstance(processes, Workload):
+            self._arrivals = iter(processes)
+            self._arrival_source = processes
+            processes = ProcessTable()
+        if not isinstance(processes, ProcessTable):
+            processes = ProcessTable.from_processes(processes)
+        self.table = processes
+        self.cycle_count = 0
+        self._views = None
+
+        # Estado del modelo planificado, por hilo de hardware (ranura): proceso
+        # que ejecuta (-1 = libre), ciclos usados de su porción y quantum del
+        # despacho; además, fin de E/S pendiente de cada proceso en espera
+        slots = self.cores * self.threads_per_core
+        self._running = [-1] * slots
+        self._slice_used = [0] * slots
+        self._slice_quantum = [None] * slots
+        self._fault_in = [None] * slots  # ciclos hasta el próximo fallo de página
+        self._run_start = [0] * slots    # referencia de memoria al despachar
+        self._io_heap = []
+        self._pushed = False  # hubo procesos nuevos en la cola en el último ciclo
+        self._admitted = np.flatnonzero(self.table.column("state") == NEW).tolist()
+        self.slot_busy = np.zeros(slots, dtype=np.int64)  # ciclos ocupados por ranura
+        self.dispatcher = as_dispatcher(self.scheduler)
+        if self.dispatcher is not None:
+            self.dispatcher.attach(self.table, self.cores)
+
+        # Procesos a la espera de memoria, en orden de llegada
+        self._memory_queue = deque()
+        self.memory_waits = 0
+        self.memory_rejected = 0
+        if self.memory is not None:
+            self.memory.attach(self.table, self.cpu_key)
+
+        # Dispositivos de E/S; sin ellos cada pedido tarda ``io_time``
+        self.device_set = None
+        if self.devices is not None:
+            devices = self.devices
+            self.device_set = devices if isinstance(devices, DeviceSet) else DeviceSet(devices)
+            self.device_set.attach(self.cpu_key)
+
+        # Procesos no terminados: los únicos que cuestan algo en cada ciclo
+        state = self.table.column("state")
+        self._live = np.flatnonzero(state != TERMINATED)
+
+        # Historial compacto: segmentos de estado y búfer circular de CPU
+        self.history = HistoryStore(self.history_retention, self.history_downsample, self.history_segments,
+                                    self.history_summary)
+        self.history.add_processes(0, state)
+        self._update_state_counts()
+        self._ingest(0)
+        rows = np.arange(len(self.table))
+        low, high = INITIAL_CPU_RANGE
+        self.history.push_cpu(0, cpu_samples(self.cpu_key, rows, [0], low, high)[0])
+        self._notify()
+
+    @property
+    def processes(self):
+        """Vistas por proceso con la interfaz de ``Process`` (se crean al pedirlas)"""
+        if self._views is None:
+            self._views = []
+        if len(self._views) < len(self.table):
+            self._views.extend(ProcessView(self, row) for row in range(len(self._views), len(self.table)))
+        return self._views
+
+    def _update_state_counts(self):
+        counts = np.bincount(self.table.column("state"), minlength=len(STATE_NAMES))
+        self.state_count_array = counts
+        self.state_counts = dict(zip(STATE_NAMES, counts.tolist()))
+
+    @property
+    def finished(self):
+        """True cuando todos los procesos han terminado y no llegarán más"""
+        return int(self.state_count_array[TERMINATED]) == len(self.table) and self._next_arrival() is None
+
+    def _next_arrival(self):
+        """Ciclo de llegada del próximo proceso de la carga, o ``None`` si no quedan"""
+        while self._pending is None and self._arrivals is not None:
+            chunk = next(self._arrivals, None)
+            if chunk is None:
+                self._arrivals = None
+                continue
+            self._arrival_blocks += 1
+            if len(chunk["arrival"]):
+                self._pending = chunk
+        return None if self._pending is None else int(self._pending["arrival"][0])
+
+    def _ingest(self, now):
+        """Da de alta (en NEW) los procesos de la carga que llegan hasta ``now``"""
+        while True:
+            arrival = self._next_arrival()
+            if arrival is None or arrival > now:
+                return
+            chunk = self._pending
+            count = int(np.searchsorted(chunk["arrival"], now, side="right"))
+            if count < len(chunk["arrival"]):
+                self._pending = {name: values[count:] for name, values in chunk.items()}
+            else:
+                self._pending = None
+            added = self.table.append_columns(**{name: values[:count] for name, values in chunk.items()})
+            rows = np.arange(added.start, added.stop)
+            states = self.table.state[rows]
+            self.history.add_processes(now, states)
+            self._live = np.concatenate([self._live, rows])
+            if self.dispatcher is not None:
+                self._admitted.extend(rows.tolist())
+            counts = self.state_count_array + np.bincount(states, minlength=len(STATE_NAMES))
+            self.state_count_array = counts
+            self.state_counts = dict(zip(STATE_NAMES, counts.tolist()))
+
+    def snapshot(self, cpu_rows=None):
+        with self.profiler.timer("engine.snapshot"):
+            return EngineSnapshot(self, cpu_rows)
+
+    def time_in_states(self):
+        """Arreglo (procesos, estados) con los ciclos pasados en cada estado"""
+        return _time_in_states(self.table, self.history)
+
+    def core_utilization(self):
+        """Fracción de ciclos ocupados de cada núcleo (promedio de sus hilos)"""
+        busy = self.slot_busy.reshape(self.cores, self.threads_per_core).sum(axis=1)
+        return busy / (self.threads_per_core * max(1, self.cycle_count))
+
+    def memory_stats(self):
+        """Ocupación, fragmentación y fallos del gestor de memoria (``None`` sin gestor)"""
+        if self.memory is None or self.dispatcher is None:
+            return None
+        return {
+            **self.memory.stats(),
+            "memory_waiting": len(self._memory_queue),
+            "memory_waits": self.memory_waits,
+            "memory_rejected": self.memory_rejected,
+        }
+
+    def device_stats(self):
+        """Estadísticas de cada dispositivo de E/S por nombre (``None`` sin dispositivos)"""
+        if self.device_set is None or self.dispatcher is None:
+            return None
+        return self.device_set.stats(self.cycle_count)
+
+    def subscribe(self, callback):
+        """Registra ``callback(engine)``, llamado al final de cada ``step``, ``advance`` o ``reset``.
+
+        Tras un reinicio (o cargar un punto de control) ``engine.reset_count`` cambia.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _notify(self):
+        if not self._subscribers:
+            return
+        with self.profiler.timer("engine.notify"):
+            for callback in self._subscribers:
+                callback(self)
+
+    def step(self):
+        """Simula un ciclo para todos los procesos y notifica a los suscriptores"""
+        self._advance_to(self.cycle_count + 1)
+        self._notify()
+
+    def next_event_cycle(self):
+        """Próximo ciclo en que algún proceso puede cambiar de estado o llegar (``None`` si ninguno)"""
+        now = self.cycle_count
+        event = self._next_model_event()
+        arrival = self._next_arrival()
+        if arrival is not None:
+            arrival = max(now + 1, arrival)
+            event = arrival if event is None else min(event, arrival)
+        return event
+
+    def _next_model_event(self):
+        now = self.cycle_count
+        if not len(self._live):
+            return None
+        if self.dispatcher is None:
+            return now + 1  # en el modelo original todo proceso vivo cambia cada ciclo
+        dispatcher = self.dispatcher
+        # Procesos por admitir, cola recién cambiada (posible expropiación) o
+        # un hilo libre con trabajo pendiente: el próximo ciclo ya es un evento
+        if self._admitted or (self._pushed and dispatcher.preemptive):
+            return now + 1
+        if len(dispatcher) and -1 in self._running:
+            return now + 1
+
+        events = []
+        if self._io_heap:
+            events.append(self._io_heap[0][0])
+        remaining = self.table.execution_time
+        burst_left = self.table.burst_left
+        for slot, row in enumerate(self._running):
+            if row < 0:
+                continue
+            ahead = min(int(remaining[row]), int(burst_left[row]))
+            quantum = self._slice_quantum[slot]
+            if quantum is not None:
+                ahead = min(ahead, quantum - self._slice_used[slot])
+            if self._fault_in[slot] is not None:
+                ahead = min(ahead, self._fault_in[slot] + 1)
+            events.append(now + ahead)
+        boost = dispatcher.next_event(now)
+        if boost is not None:
+            events.append(boost)
+        if not events:
+            return None
+        return max(now + 1, min(events))
+
+    def advance(self, limit=None):
+        """Salta al próximo evento y notifica a los suscriptores.
+
+        Avanza como mucho ``limit`` ciclos; si ya no habrá eventos avanza
+        ``limit`` ciclos (o uno). Devuelve los ciclos avanzados.
+        """
+        now = self.cycle_count
+        target = self.next_event_cycle()
+        if target is None:
+            target = now + (limit or 1)
+        elif limit is not None:
+            target = min(target, now + limit)
+        self._advance_to(target)
+        self._notify()
+        return target - now
+
+    def run(self, cycles):
+        """Ejecuta ``cycles`` ciclos seguidos"""
+        if not self.event_driven:
+            for _ in range(cycles):
+                self.step()
+            return
+        while cycles > 0:
+            cycles -= self.advance(cycles)
+
+    def _advance_to(self, target):
+        """Resuelve en bloque los ciclos sin eventos previos a ``target`` y simula ``target``"""
+        profiler = self.profiler
+        profiler.tick(CYCLES, target - self.cycle_count)
+        idle = target - self.cycle_count - 1
+        if idle > 0:
+            with profiler.timer("engine.fast_forward"):
+                self._fast_forward(idle)
+        self.cycle_count = target
+        with profiler.timer("engine.transitions"):
+            if self.dispatcher is None:
+                rows = self._step_lockstep()
+            else:
+                rows = self._step_scheduled()
+        with profiler.timer("engine.commit"):
+            self._commit(rows)
+
+    def _fast_forward(self, cycles):
+        """Avanza ``cycles`` ciclos en los que ningún proceso cambia de estado"""
+        table = self.table
+        for slot, row in enumerate(self._running):
+            if row < 0:
+                continue
+            table.execution_time[row] -= cycles
+            table.burst_left[row] -= cycles
+            self._slice_used[slot] += cycles
+            self.slot_busy[slot] += cycles
+            if self._fault_in[slot] is not None:
+                self._fault_in[slot] -= cycles
+        self._pushed = False
+        self.history.push_cpu_span(self.cycle_count + 1, cycles, self._cpu_sampler(), self._live)
+        self.cycle_count += cycles
+
+    def _cpu_sampler(self):
+        """Genera el uso de CPU de los procesos vivos con sus estados actuales"""
+        live = self._live
+        state = self.table.state[live]
+        low, high = CPU_LOW[state], CPU_HIGH[state]
+        return lambda cycles: cpu_samples(self.cpu_key, live, cycles, low, high)
+
+    def _commit(self, rows):
+        """Registra los cambios de estado de ``rows``, las llegadas y la muestra de CPU del ciclo"""
+        now = self.cycle_count
+        table = self.table
+        rows, old_states, lengths = self.history.transition(now, rows, table.state[rows])
+        if 0 < rows.size <= SMALL_LIVE:
+            # Lo mismo que abajo, fila por fila
+            counts = self.state_count_array.copy()
+            terminated = False
+            for row, old, length in zip(rows.tolist(), old_states.tolist(), lengths.tolist()):
+                new = int(table.state[row])
+                table.time_in_states[row, old] += length
+                counts[old] -= 1
+                counts[new] += 1
+                terminated = terminated or new == TERMINATED
+            self.state_count_array = counts
+            self.state_counts = dict(zip(STATE_NAMES, counts.tolist()))
+            if terminated:
+                self._live = self._live[table.state[self._live] != TERMINATED]
+        elif rows.size:
+            # La estancia que se cierra pasa al acumulado de la tabla
+            table.time_in_states[rows, old_states] += lengths
+            new_states = table.state[rows]
+            counts = self.state_count_array.copy()
+            counts += np.bincount(new_states, minlength=len(STATE_NAMES))
+            counts -= np.bincount(old_states, minlength=len(STATE_NAMES))
+            self.state_count_array = counts
+            self.state_counts = dict(zip(STATE_NAMES, counts.tolist()))
+            if (new_states == TERMINATED).any():
+                self._live = self._live[table.state[self._live] != TERMINATED]
+        self._ingest(now)
+        if not self.history.records_cpu:
+            self.history.push_cpu(now, None)
+        elif len(self._live) <= SMALL_LIVE:
+            state, key = self.table.state, self.cpu_key
+            samples = [cpu_sample(key, row, now, _CPU_LOW[state[row]], _CPU_HIGH[state[row]])
+                       for row in self._live.tolist()]
+            self.history.push_cpu(now, samples, self._live)
+        else:
+            self.history.push_cpu(now, self._cpu_sampler()([now])[0], self._live)
+
+    def _step_lockstep(self):
+        """Modelo original: todos los procesos vivos cambian de estado a la vez"""
+        if len(self._live) <= SMALL_LIVE:
+            return self._step_lockstep_small()
+        now = self.cycle_count
+        table = self.table
+        live = self._live
+        state = table.state[live]
+        remaining = table.execution_time[live]
+
+        # Lógica de transición de estados
+        finished = (state == RUNNING) & (remaining <= 0)
+        new_state = NEXT_STATE[state]
+        new_state[finished] = TERMINATED
+        table.state[live] = new_state
+        table.execution_time[live] = remaining - (state == WAITING)
+
+        running = live[new_state == RUNNING]
+        table.first_run[running[table.first_run[running] < 0]] = now
+        table.finish[live[finished]] = now
+
+        # Ocupación: cada proceso corre en su núcleo, hasta llenar sus hilos
+        per_core = np.bincount(table.core[running] % self.cores, minlength=self.cores)
+        busy = np.minimum(per_core, self.threads_per_core)
+        slots = self.slot_busy.reshape(self.cores, self.threads_per_core)
+        slots += np.arange(self.threads_per_core) < busy[:, None]
+        return live
+
+    def _step_lockstep_small(self):
+        """``_step_lockstep`` recorriendo los procesos vivos uno a uno (ver ``SMALL_LIVE``)"""
+        now = self.cycle_count
+        table = self.table
+        state, remaining = table.state, table.execution_time
+        per_core = [0] * self.cores
+        for row in self._live.tolist():
+            old = int(state[row])
+            if old == RUNNING and remaining[row] <= 0:
+                state[row] = TERMINATED
+                table.finish[row] = now
+                continue
+            new = _NEXT_STATE[old]
+            state[row] = new
+            if old == WAITING:
+                remaining[row] -= 1
+            if new == RUNNING:
+                if table.first_run[row] < 0:
+                    table.first_run[row] = now
+                per_core[int(table.core[row]) % self.cores] += 1
+        for core, running in enumerate(per_core):
+            first = core * self.threads_per_core
+            self.slot_busy[first:first + min(running, self.threads_per_core)] += 1
+        return self._live
+
+    def _step_scheduled(self):
+        """Modelo planificado: el despachador reparte los hilos de hardware entre los listos.
+
+        Devuelve las filas que cambiaron de estado en el ciclo.
+        """
+        now = self.cycle_count
+        table = self.table
+        state = table.state
+        remaining = table.execution_time
+        burst_left = table.burst_left
+        dispatcher = self.dispatcher
+        memory = self.memory
+        devices = self.device_set
+        threads = self.threads_per_core
+        changed = []
+        pushed = False
+        freed = False
+        dispatcher.on_cycle(now)
+
+        # Procesos en ejecución: consumen un ciclo y pueden terminar, pedir E/S,
+        # ser expulsados o (con paginación) sufrir un fallo de página
+        for slot, row in enumerate(self._running):
+            if row < 0:
+                continue
+            core = slot // threads
+            if self._fault_in[slot] == 0:
+                self._leave_cpu(slot, row)
+                memory.fault(row, self._executed(row))
+                state[row] = WAITING
+                heapq.heappush(self._io_heap, (now + memory.fault_time, row))
+                changed.append(row)
+                self._running[slot] = -1
+                continue
+            remaining[row] -= 1
+            burst_left[row] -= 1
+            self._slice_used[slot] += 1
+            if self._fault_in[slot] is not None:
+                self._fault_in[slot] -= 1
+            if remaining[row] <= 0:
+                state[row] = TERMINATED
+                table.finish[row] = now
+            elif burst_left[row] <= 0:
+                state[row] = WAITING
+                burst_left[row] = table.execution_cycle[row]
+                if devices is None:
+                    heapq.heappush(self._io_heap, (now + self.io_time, row))
+                else:
+                    self._start_io(devices.submit(row, now))
+            else:
+                quantum = self._slice_quantum[slot]
+                if quantum is not None and self._slice_used[slot] >= quantum:
+                    dispatcher.expired(row, core)
+                elif not (dispatcher.preemptive and dispatcher.preempts(row, core)):
+                    continue
+                state[row] = READY
+                dispatcher.push(row)
+                pushed = True
+            if memory is not None:
+                self._leave_cpu(slot, row)
+                if state[row] == TERMINATED:
+                    memory.free(row)
+                    freed = True
+            changed.append(row)
+            self._running[slot] = -1
+
+        # Despacho a los hilos libres de cada núcleo
+        for slot, row in enumerate(self._running):
+            if row < 0:
+                core = slot // threads
+                row = dispatcher.pop(core)
+                if row is None:
+                    continue
+                state[row] = RUNNING
+                table.core[row] = core
+                table.thread[row] = slot % threads
+                self._running[slot] = row
+                self._slice_used[slot] = 0
+                self._slice_quantum[slot] = dispatcher.quantum(row, core)
+                if memory is not None:
+                    self._run_start[slot] = self._executed(row)
+                    limit = min(int(remaining[row]), int(burst_left[row]))
+                    if self._slice_quantum[slot] is not None:
+                        limit = min(limit, self._slice_quantum[slot])
+                    self._fault_in[slot] = memory.hits_before_fault(row, self._run_start[slot], limit)
+                if table.first_run[row] < 0:
+                    table.first_run[row] = now
+                changed.append(row)
+            self.slot_busy[slot] += 1
+
+        # Fin de E/S y admisión de procesos nuevos (podrán despacharse el próximo ciclo)
+        io_heap = self._io_heap
+        while io_heap and io_heap[0][0] <= now:
+            _, row = heapq.heappop(io_heap)
+            if devices is not None:
+                self._start_io(devices.finish(row, now))
+            state[row] = READY
+            dispatcher.push(row)
+            changed.append(row)
+            pushed = True
+        # La memoria liberada admite a los que esperan, sin adelantar a ninguno
+        queue = self._memory_queue
+        while freed and queue and memory.allocate(queue[0]):
+            row = queue.popleft()
+            state[row] = READY
+            dispatcher.push(row)
+            changed.append(row)
+            pushed = True
+        for row in self._admitted:
+            if memory is None:
+                state[row] = READY
+            elif not memory.fits(row):
+                # No cabría ni con toda la memoria libre: se rechaza
+                state[row] = TERMINATED
+                table.finish[row] = now
+                self.memory_rejected += 1
+                changed.append(row)
+                continue
+            elif not queue and memory.allocate(row):
+                state[row] = READY
+            else:
+                state[row] = WAITING
+                queue.append(row)
+                self.memory_waits += 1
+                changed.append(row)
+                continue
+            dispatcher.push(row)
+            changed.append(row)
+            pushed = True
+        self._admitted = []
+        self._pushed = pushed
+        return np.unique(np.asarray(changed, dtype=np.int64))
+
+    def _start_io(self, started):
+        """Programa el fin del pedido de E/S ``(row, fin)`` que empezó a atenderse"""
+        if started is not None:
+            row, done = started
+            heapq.heappush(self._io_heap, (done, row))
+
+    def _executed(self, row):
+        """Ciclos de CPU ya ejecutados por ``row`` (índice de su próxima referencia a memoria)"""
+        return int(self.table.initial_execution_time[row] - self.table.execution_time[row])
+
+    def _leave_cpu(self, slot, row):
+        """Registra en el gestor de memoria las referencias del despacho que termina"""
+        start = self._run_start[slot]
+        self.memory.executed(row, start, self._executed(row) - start)
+        self._fault_in[slot] = None
@@ -0,0 +1,203 @@
+"""Exportación por bloques de las métricas de una simulación.
+
+``MetricsExporter`` se suscribe al motor y escribe en un directorio:
+
+* ``cycles-NNNNN.npz``: una fila por avance del motor con el ciclo, los
+  ciclos que cubre (``span``; con el modo por eventos un avance salta
+  varios, y la primera fila de cada corrida tiene 0), los procesos en cada
+  estado, los ciclos ocupados acumulados de los hilos de hardware
+  (``busy``) y cuántos hilos hay (``slots``).
+* ``processes-NNNNN.npz``: una fila por proceso terminado con su llegada,
+  primer despacho, fin, ciclos en cada estado, retorno, espera y respuesta
+  (definidos como en ``simulador.metrics``). Al cerrar se agregan los que
+  siguen vivos, con ``finish`` = -1.
+* ``manifest.json``: los bloques escritos, sus filas y la configuración de
+  cada corrida. Se reescribe con cada bloque, así que se puede analizar una
+  exportación en curso.
+
+Las filas se juntan en memoria y se escriben de a ``chunk_rows`` en un
+archivo nuevo, así que la memoria no crece con la duración de la corrida.
+Un reinicio del motor (o cargar o saltar a un punto de control) empieza una
+corrida nueva: la columna ``run`` las distingue. ``simulador.analysis``
+lee estos archivos de a un bloque::
+
+    exporter = MetricsExporter("salida")
+    exporter.attach(engine)
+    engine.run(100_000)
+    exporter.close()
+"""
+import json
+import os
+
+import numpy as np
+
+from .states import PROCESS_STATES, READY, TERMINATED
+
+# Sufijos de las columnas por estado (``count_ready``, ``time_ready``...)
+STATE_KEYS = [key.lower() for key in PROCESS_STATES]
+
+CYCLE_COLUMNS = {
+    "run": np.int32,
+    "cycle": np.int64,
+    "span": np.int64,
+    **{f"count_{key}": np.int64 for key in STATE_KEYS},
+    "busy": np.int64,
+    "slots": np.int32,
+}
+
+PROCESS_COLUMNS = {
+    "run": np.int32,
+    "pid": np.int64,
+    "priority": np.int8,
+    "arrival": np.int64,
+    "burst": np.int64,
+    "memory": np.int64,
+    "first_run": np.int64,
+    "finish": np.int64,
+    **{f"time_{key}": np.int64 for key in STATE_KEYS},
+    "turnaround": np.int64,
+    "waiting": np.int64,
+    "response": np.int64,
+}
+
+MANIFEST = "manifest.json"
+
+
+class MetricsExporter:
+    """Escribe las métricas de un motor en bloques ``.npz`` de ``chunk_rows`` filas"""
+
+    def __init__(self, directory, chunk_rows=65536, compress=False):
+        self.directory = os.fspath(directory)
+        self.chunk_rows = chunk_rows
+        self.compress = compress
+        os.makedirs(self.directory, exist_ok=True)
+        self.engine = None
+        self.run = -1
+        self.chunks = {"cycles": [], "processes": []}
+        self.runs = []
+        self._cycles = []     # filas pendientes (tuplas)
+        self._processes = []  # bloques pendientes (diccionarios de columnas)
+        self._process_rows = 0
+
+    def attach(self, engine):
+        """Empieza a registrar ``engine`` desde su ciclo actual"""
+        self.engine = engine
+        self._start_run(engine)
+        engine.subscribe(self)
+
+    def _start_run(self, engine):
+        self.run += 1
+        self._reset_count = engine.reset_count
+        self._last_cycle = engine.cycle_count
+        scheduler = engine.scheduler
+        self.runs.append({
+            "run": self.run,
+            "start": engine.cycle_count,
+            "scheduler": type(scheduler).__name__ if scheduler is not None else None,
+            "cores": engine.cores,
+            "threads_per_core": engine.threads_per_core,
+            "seed": engine.seed,
+        })
+        # Fila de partida (span 0): la referencia de las diferencias de ``busy``
+        self._add_cycle(engine, 0)
+
+    def _add_cycle(self, engine, span):
+        self._cycles.append((self.run, engine.cycle_count, span, *engine.state_count_array.tolist(),
+                             int(engine.slot_busy.sum()), len(engine.slot_busy)))
+
+    def __call__(self, engine):
+        if engine.reset_count != self._reset_count:
+            self._start_run(engine)
+            return
+        now = engine.cycle_count
+        if now == self._last_cycle:
+            return
+        self._add_cycle(engine, now - self._last_cycle)
+        # Procesos que terminaron desde el avance anterior
+        finish = engine.table.column("finish")
+        rows = np.flatnonzero((finish > self._last_cycle) & (finish <= now))
+        if rows.size:
+            self._add_processes(engine, rows, engine.table.time_in_states[rows])
+        self._last_cycle = now
+        if len(self._cycles) >= self.chunk_rows:
+            self._flush_cycles()
+        if self._process_rows >= self.chunk_rows:
+            self._flush_processes()
+
+    def _add_processes(self, engine, rows, times):
+        table = engine.table
+        arrival = table.arrival[rows]
+        first_run = table.first_run[rows]
+        finish = table.finish[rows]
+        columns = {
+            "run": np.full(rows.size, self.run),
+            "pid": table.pid[rows],
+            "priority": table.priority[rows],
+            "arrival": arrival,
+            "burst": table.initial_execution_time[rows],
+            "memory": table.memory_usage[rows],
+            "first_run": first_run,
+            "finish": finish,
+            **{f"time_{key}": times[:, state] for state, key in enumerate(STATE_KEYS)},
+            "turnaround": np.where(finish >= 0, times[:, :TERMINATED].sum(axis=1), -1),
+            "waiting": times[:, READY],
+            "response": np.where(first_run >= 0, first_run - arrival, -1),
+        }
+        self._processes.append(columns)
+        self._process_rows += rows.size
+
+    def _write(self, kind, columns, rows):
+        name = f"{kind}-{len(self.chunks[kind]):05d}.npz"
+        save = np.savez_compressed if self.compress else np.savez
+        save(os.path.join(self.directory, name), **columns)
+        self.chunks[kind].append({"file": name, "rows": rows})
+        self._write_manifest()
+
+    def _flush_cycles(self):
+        if not self._cycles:
+            return
+        values = list(zip(*self._cycles))
+        columns = {name: np.asarray(column, dtype=dtype)
+                   for (name, dtype), column in zip(CYCLE_COLUMNS.items(), values)}
+        self._write("cycles", columns, len(self._cycles))
+        self._cycles = []
+
+    def _flush_processes(self):
+        if not self._processes:
+            return
+        columns = {name: np.concatenate([block[name] for block in self._processes]).astype(dtype)
+                   for name, dtype in PROCESS_COLUMNS.items()}
+        self._write("processes", columns, self._process_rows)
+        self._processes = []
+        self._process_rows = 0
+
+    def _write_manifest(self):
+        manifest = {
+            "version": 1,
+            "columns": {"cycles": list(CYCLE_COLUMNS), "processes": list(PROCESS_COLUMNS)},
+            "chunks": self.chunks,
+            "runs": self.runs,
+        }
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(path + ".tmp", path)  # quien lee nunca ve un manifiesto a medias
+
+    def flush(self):
+        """Escribe las filas pendientes aunque no completen un bloque"""
+        self._flush_cycles()
+        self._flush_processes()
+
+    def close(self):
+        """Agrega los procesos que siguen vivos, escribe lo pendiente y deja de registrar"""
+        engine = self.engine
+        if engine is None:
+            return
+        engine.unsubscribe(self)
+        self.engine = None
+        if engine.reset_count == self._reset_count:
+            rows = np.flatnonzero(engine.table.column("finish") < 0)
+            if rows.size:
+                self._add_processes(engine, rows, engine.time_in_states()[rows])
+        self.flush()
+        self._write_manifest()
@@ -0,0 +1,717 @@
+"""Almacenamiento compacto y acotado del historial de la simulación.
+
+* Estados: segmentos codificados por longitud de racha (fila, estado, ciclo
+  inicial, duración). Un proceso solo añade un segmento cuando cambia de
+  estado, así que los procesos terminados dejan de consumir memoria. Los
+  segmentos cerrados se conservan ``segment_retention`` ciclos y, si además
+  ya los cubre el resumen (cuando lo hay), se descartan: ``segment_horizon``
+  es el ciclo hasta el que pueden faltar.
+* Uso de CPU: búfer circular preasignado de ``retention`` muestras ``uint8``
+  por proceso; con ``downsample`` > 1 cada muestra es el promedio de ese
+  número de ciclos. Con ``retention=0`` no se guarda el uso de CPU.
+* Resumen para la línea de tiempo (solo con ``summary=True``, p. ej. si
+  hay una línea de tiempo que lo dibuje): a lo sumo ``SUMMARY_COLUMNS``
+  columnas por proceso con el estado dominante de cada tramo de
+  ``summary_bucket`` ciclos. Cuando se llenan se fusionan de a pares y el
+  tramo se duplica, así que el resumen ocupa lo mismo sin importar la
+  duración de la corrida.
+
+El búfer de CPU y el resumen son densos solo para los procesos que todavía
+cambian: cada uno ocupa una columna (``slot``) mientras vive. Un proceso
+terminado se retira cuando ya no aporta nada (sus muestras retenidas valen 0
+y los tramos siguientes del resumen serán todos TERMINATED); de su resumen
+se guardan aparte solo las columnas de su vida. Así la memoria depende de
+los procesos vivos y no de todos los que pasaron por la simulación.
+"""
+import numpy as np
+
+from .states import STATE_NAMES, TERMINATED
+
+SEGMENT_DTYPES = {
+    "row": np.int32,
+    "state": np.int8,
+    "start": np.int64,
+    "length": np.int64,   # el fin (start + length) no decrece en el orden de cierre
+}
+
+# Ciclos de segmentos cerrados que se conservan detrás del ciclo actual
+SEGMENT_RETENTION = 4096
+
+# Muestras de CPU que ``push_cpu_span`` genera de una vez
+CPU_SPAN_BLOCK = 1 << 20
+
+# Columnas del resumen de la línea de tiempo (par, para fusionarlas de a dos)
+SUMMARY_COLUMNS = 1024
+
+# Código del resumen para los tramos anteriores a la llegada del proceso
+NO_STATE = 255
+
+# Datos por proceso, con capacidad ampliable
+PROCESS_COLUMNS = ("_first_state", "_first_cycle", "_open_state", "_open_start", "_slot",
+                   "_retired_start", "_retired_offset", "_retired_length")
+
+# Escalares que, con los arreglos de ``checkpoint_state``, definen el historial
+CHECKPOINT_SCALARS = ("retention", "downsample", "segment_retention", "records_summary", "cycle",
+                      "segment_count", "segment_horizon", "_width", "_retired_used", "_slots", "_slots_are_rows",
+                      "_cpu_head", "_cpu_filled", "_cpu_pending", "summary_bucket", "summary_columns")
+
+# Hasta cuántas filas ``transition`` las recorre una a una en lugar de usar
+# arreglos (con tan pocas domina el costo fijo de cada operación NumPy)
+SMALL_TRANSITION = 16
+
+# Resultado de ``transition`` cuando no cambia ninguna fila
+_NO_CHANGES = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64))
+
+
+class HistoryStore:
+    """Historial de estados y CPU de todos los procesos de una simulación"""
+
+    def __init__(self, retention=1024, downsample=1, segment_retention=SEGMENT_RETENTION, summary=False):
+        if retention < 0 or downsample < 1 or segment_retention < 0:
+            raise ValueError("retention y segment_retention no pueden ser negativos y downsample "
+                             "debe ser positivo")
+        self.retention = retention
+        self.downsample = downsample
+        self.segment_retention = segment_retention
+        self.records_summary = summary
+        self.cycle = 0
+
+        # Segmentos cerrados, en columnas ampliables; los que terminan hasta
+        # ``segment_horizon`` pueden haberse descartado
+        self.segment_count = 0
+        self.segment_horizon = 0
+        self._segments = {name: np.zeros(64, dtype=dtype) for name, dtype in SEGMENT_DTYPES.items()}
+
+        # Por proceso: primer estado registrado, segmento abierto y columna
+        # densa (-1 si se retiró); como los procesos pueden llegar de a poco,
+        # la capacidad crece al doble
+        self._width = 0
+        self._first_state = np.zeros(0, dtype=np.int8)
+        self._first_cycle = np.zeros(0, dtype=np.int64)
+        self._open_state = np.zeros(0, dtype=np.int8)
+        self._open_start = np.zeros(0, dtype=np.int64)
+        self._slot = np.zeros(0, dtype=np.int32)
+
+        # Resumen de los procesos retirados: primera columna, posición y
+        # largo de sus columnas en ``_retired_state``/``_retired_share``
+        self._retired_start = np.zeros(0, dtype=np.int32)
+        self._retired_offset = np.zeros(0, dtype=np.int64)
+        self._retired_length = np.zeros(0, dtype=np.int32)
+        self._retired_state = np.zeros(64, dtype=np.uint8)
+        self._retired_share = np.zeros(64, dtype=np.uint8)
+        self._retired_used = 0
+
+        # Columnas densas en uso y proceso de cada una; hasta el primer
+        # retiro la columna de cada proceso es su fila
+        self._slots = 0
+        self._slot_row = np.zeros(0, dtype=np.int64)
+        self._slots_are_rows = True
+
+        # Búfer circular de CPU: una fila por muestra, una columna densa por proceso
+        self._cpu = np.zeros((retention, 0), dtype=np.uint8)
+        self._cpu_cycles = np.zeros(retention, dtype=np.int64)
+        self._cpu_head = 0     # próxima fila a escribir
+        self._cpu_filled = 0
+        self._cpu_sum = np.zeros(0, dtype=np.uint32)
+        self._cpu_pending = 0  # ciclos acumulados en _cpu_sum
+        self._cpu_slot = None  # columna de cada fila en ``_cpu`` si no es su ``slot`` (instantáneas)
+
+        # Resumen: estado dominante de cada tramo completo y su fracción
+        # (0-255); ``_bucket_time`` acumula los segmentos cerrados del tramo
+        # en curso, que empieza en ``summary_end``. Sin resumen no tienen columnas
+        self.summary_bucket = 1
+        self.summary_columns = 0
+        # (las columnas también crecen al doble, hasta ``SUMMARY_COLUMNS``)
+        columns = 16 if summary else 0
+        self._summary_state = np.full((0, columns), NO_STATE, dtype=np.uint8)
+        self._summary_share = np.zeros((0, columns), dtype=np.uint8)
+        self._bucket_time = np.zeros((0, len(STATE_NAMES) if summary else 0), dtype=np.int64)
+
+    @property
+    def width(self):
+        """Número de procesos registrados"""
+        return self._width
+
+    @property
+    def first_state(self):
+        return self._first_state[:self._width]
+
+    @property
+    def first_cycle(self):
+        return self._first_cycle[:self._width]
+
+    @property
+    def records_cpu(self):
+        return self.retention > 0
+
+    @property
+    def summary_end(self):
+        """Primer ciclo que el resumen todavía no cubre"""
+        return self.summary_columns * self.summary_bucket
+
+    def add_processes(self, cycle, states):
+        """Empieza a registrar procesos nuevos; su primer segmento abre en ``cycle``.
+
+        Sus muestras de CPU llegan con el siguiente ``push_cpu``.
+        """
+        count = len(states)
+        start, end = self._width, self._width + count
+        self._reserve(end)
+        self._first_state[start:end] = states
+        self._first_cycle[start:end] = cycle
+        self._open_state[start:end] = states
+        self._open_start[start:end] = cycle
+        self._width = end
+        if self._slots + count > len(self._slot_row):
+            self._make_room(count)
+        slots = np.arange(self._slots, self._slots + count)
+        self._slot[start:end] = slots
+        self._slot_row[slots] = np.arange(start, end)
+        self._slots += count
+
+    def _reserve(self, needed):
+        capacity = len(self._open_state)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, 16)
+        for name in PROCESS_COLUMNS:
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self._width] = old[:self._width]
+            setattr(self, name, grown)
+
+    def _make_room(self, count):
+        """Deja lugar para ``count`` columnas densas más.
+
+        Retira los procesos terminados que ya no aportan nada y copia las
+        columnas que quedan a arreglos nuevos (las instantáneas no cambian)
+        con lugar para el doble.
+        """
+        used = self._slots
+        rows = self._slot_row[:used]
+        # Terminados antes del tramo en curso: el resumen ya no cambia
+        retire = self._open_state[rows] == TERMINATED
+        if self.records_summary:
+            retire &= self._open_start[rows] <= self.summary_end
+        if self.retention:
+            candidates = np.flatnonzero(retire)
+            retire[candidates] = ~self._cpu[:, candidates].any(axis=0) & (self._cpu_sum[candidates] == 0)
+        retired = np.flatnonzero(retire)
+        if retired.size:
+            self._retire(rows[retired], retired)
+            self._slots_are_rows = False
+        keep = np.flatnonzero(~retire)
+        capacity = max(16, len(keep) + count, 2 * len(keep))
+        self._slot_row = np.zeros(capacity, dtype=np.int64)
+        self._slot_row[:len(keep)] = rows[keep]
+        self._slot[rows[keep]] = np.arange(len(keep))
+        self._slots = len(keep)
+        cpu = np.zeros((self.retention, capacity), dtype=np.uint8)
+        cpu[:, :len(keep)] = self._cpu[:, keep]
+        self._cpu = cpu
+        cpu_sum = np.zeros(capacity, dtype=np.uint32)
+        cpu_sum[:len(keep)] = self._cpu_sum[keep]
+        self._cpu_sum = cpu_sum
+        for name, fill in (("_summary_state", NO_STATE), ("_summary_share", 0), ("_bucket_time", 0)):
+            old = getattr(self, name)
+            grown = np.full((capacity, old.shape[1]), fill, dtype=old.dtype)
+            grown[:len(keep)] = old[keep]
+            setattr(self, name, grown)
+
+    def _retire(self, rows, slots):
+        """Pasa el resumen de ``rows`` (en ``slots``) al almacén de retirados.
+
+        Se guardan las columnas desde la llegada hasta la última que no es
+        TERMINATED completa: antes no hay estado y después siempre lo es.
+        """
+        columns = self.summary_columns
+        if not columns:  # sin resumen (o todavía vacío) no hay nada que guardar
+            self._retired_start[rows] = 0
+            self._retired_offset[rows] = self._retired_used
+            self._retired_length[rows] = 0
+            self._slot[rows] = -1
+            return
+        state = self._summary_state[slots, :columns]
+        share = self._summary_share[slots, :columns]
+        present = state != NO_STATE
+        changing = ~((state == TERMINATED) & (share == 255))
+        first = np.where(present.any(axis=1), present.argmax(axis=1), columns)
+        end = np.where(changing.any(axis=1), columns - changing[:, ::-1].argmax(axis=1), 0)
+        lengths = np.maximum(end - first, 0)
+        index = np.arange(columns)
+        stored = (index >= first[:, None]) & (index < (first + lengths)[:, None])
+        total = int(lengths.sum())
+        used = self._retired_used
+        if used + total > len(self._retired_state):
+            capacity = max(used + total, 2 * len(self._retired_state))
+            for name in ("_retired_state", "_retired_share"):
+                grown = np.zeros(capacity, dtype=np.uint8)
+                grown[:used] = getattr(self, name)[:used]
+                setattr(self, name, grown)
+        self._retired_state[used:used + total] = state[stored]
+        self._retired_share[used:used + total] = share[stored]
+        self._retired_start[rows] = first
+        self._retired_offset[rows] = used + np.cumsum(lengths) - lengths
+        self._retired_length[rows] = lengths
+        self._retired_used = used + total
+        self._slot[rows] = -1
+
+    def transition(self, cycle, rows, states):
+        """Registra que ``rows`` están en ``states`` desde ``cycle``.
+
+        Solo cambian las filas cuyo estado es distinto del segmento abierto.
+        Devuelve ``(rows, old_states, lengths)`` de los segmentos cerrados.
+        """
+        self._complete_buckets(cycle)
+        self.cycle = cycle
+        if not len(rows):
+            return _NO_CHANGES
+        rows = np.asarray(rows, dtype=np.int64)
+        states = np.asarray(states, dtype=np.int8)
+        if len(rows) <= SMALL_TRANSITION:
+            return self._transition_small(cycle, rows, states)
+        changed = states != self._open_state[rows]
+        rows = rows[changed]
+        states = states[changed]
+        old_states = self._open_state[rows]
+        lengths = cycle - self._open_start[rows]
+        if rows.size:
+            self._close_segments(cycle, rows, old_states, lengths)
+            if self.records_summary:
+                # Parte de cada segmento cerrado que cae en el tramo en curso
+                inside = cycle - np.maximum(self._open_start[rows], self.summary_end)
+                np.add.at(self._bucket_time, (self._slot[rows], old_states), inside)
+            self._open_state[rows] = states
+            self._open_start[rows] = cycle
+        return rows, old_states, lengths
+
+    def _transition_small(self, cycle, rows, states):
+        """``transition`` recorriendo las filas una a una"""
+        open_state, open_start = self._open_state, self._open_start
+        summary = self.records_summary
+        summary_end = self.summary_end
+        closed = []
+        for row, state in zip(rows.tolist(), states.tolist()):
+            old = int(open_state[row])
+            if old == state:
+                continue
+            start = int(open_start[row])
+            closed.append((row, old, cycle - start))
+            if summary:
+                self._bucket_time[self._slot[row], old] += cycle - max(start, summary_end)
+            open_state[row] = state
+            open_start[row] = cycle
+        if not closed:
+            return _NO_CHANGES
+        rows, old_states, lengths = zip(*closed)
+        rows = np.array(rows, dtype=np.int64)
+        old_states = np.array(old_states, dtype=np.int8)
+        lengths = np.array(lengths, dtype=np.int64)
+        self._close_segments(cycle, rows, old_states, lengths)
+        return rows, old_states, lengths
+
+    def record(self, cycle, states, cpu):
+        """Registra los estados y el uso de CPU de todos los procesos en ``cycle``"""
+        self.transition(cycle, np.arange(self.width), states)
+        self.push_cpu(cycle, cpu)
+
+    def _close_segments(self, cycle, rows, old_states, lengths):
+        if self.segment_count + rows.size > len(self._segments["row"]):
+            self._compact_segments(cycle, rows.size)
+        needed = self.segment_count + rows.size
+        window = slice(self.segment_count, needed)
+        self._segments["row"][window] = rows
+        self._segments["state"][window] = old_states
+        self._segments["start"][window] = cycle - lengths
+        self._segments["length"][window] = lengths
+        self.segment_count = needed
+
+    def _compact_segments(self, cycle, count):
+        """Deja lugar para ``count`` segmentos más, descartando los que ya no se conservan.
+
+        Se descartan los que terminan hasta ``cycle - segment_retention`` y
+        que el resumen, si lo hay, ya cubre. Los que quedan se copian a
+        columnas nuevas (las instantáneas no cambian) con lugar para el doble.
+        """
+        horizon = cycle - self.segment_retention
+        if self.records_summary:
+            horizon = min(horizon, self.summary_end)
+        used = self.segment_count
+        first = 0
+        if horizon > self.segment_horizon:
+            ends = self._segments["start"][:used] + self._segments["length"][:used]
+            first = int(np.searchsorted(ends, horizon, side="right"))
+            self.segment_horizon = horizon
+        kept = used - first
+        capacity = max(64, kept + count, 2 * kept)
+        for name, column in self._segments.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:kept] = column[first:used]
+            self._segments[name] = grown
+        self.segment_count = kept
+
+    def _complete_buckets(self, cycle):
+        """Cierra los tramos del resumen que terminan antes de ``cycle``.
+
+        Los segmentos abiertos siguen sin cambios hasta ``cycle``, así que
+        cubren lo que falta de cada tramo.
+        """
+        while self.records_summary and self.summary_end + self.summary_bucket <= cycle:
+            start, bucket, used = self.summary_end, self.summary_bucket, self._slots
+            rows = slice(0, used) if self._slots_are_rows else self._slot_row[:used]
+            times = self._bucket_time[:used]
+            covered = start + bucket - np.maximum(self._open_start[rows], start)
+            times[np.arange(used), self._open_state[rows]] += np.clip(covered, 0, bucket)
+            dominant = times.argmax(axis=1)
+            share = times[np.arange(used), dominant]
+            column = self.summary_columns
+            if column == self._summary_state.shape[1]:
+                self._grow_summary()
+            self._summary_state[:used, column] = np.where(share > 0, dominant, NO_STATE)
+            self._summary_share[:used, column] = share * 255 // bucket
+            times[:] = 0
+            self.summary_columns += 1
+            if self.summary_columns == SUMMARY_COLUMNS:
+                self._coarsen()
+
+    def _grow_summary(self):
+        """Duplica las columnas del resumen en arreglos nuevos (las instantáneas no cambian)"""
+        columns = min(2 * self._summary_state.shape[1], SUMMARY_COLUMNS)
+        for name, fill in (("_summary_state", NO_STATE), ("_summary_share", 0)):
+            old = getattr(self, name)
+            grown = np.full((old.shape[0], columns), fill, dtype=old.dtype)
+            grown[:, :old.shape[1]] = old
+            setattr(self, name, grown)
+
+    def _coarsen(self):
+        """Fusiona las columnas del resumen de a pares y duplica el tramo.
+
+        De cada par gana el estado con mayor fracción. Se crean arreglos
+        nuevos para no modificar los que comparten las instantáneas.
+        """
+        state, share = self._summary_state, self._summary_share
+        half = SUMMARY_COLUMNS // 2
+        self._summary_state = np.full_like(state, NO_STATE)
+        self._summary_share = np.zeros_like(share)
+        self._summary_state[:, :half], self._summary_share[:, :half] = _merge_pairs(
+            state[:, 0::2], share[:, 0::2], state[:, 1::2], share[:, 1::2])
+        self._coarsen_retired()
+        self.summary_columns = half
+        self.summary_bucket *= 2
+
+    def _coarsen_retired(self):
+        """Fusiona de a pares las columnas guardadas de los procesos retirados"""
+        rows = np.flatnonzero(self._slot[:self._width] < 0)
+        if not rows.size:
+            return
+        start = self._retired_start[rows].astype(np.int64)
+        length = self._retired_length[rows].astype(np.int64)
+        first = start // 2
+        merged = np.where(length > 0, (start + length - 1) // 2 - first + 1, 0)
+        offset = np.cumsum(merged) - merged
+        owner = np.repeat(np.arange(rows.size), merged)
+        left = 2 * (first[owner] + np.arange(len(owner)) - offset[owner]) - start[owner]
+        left_state, left_share = self._retired_columns(left, length[owner], self._retired_offset[rows][owner])
+        right_state, right_share = self._retired_columns(left + 1, length[owner],
+                                                         self._retired_offset[rows][owner])
+        state, share = _merge_pairs(left_state, left_share, right_state, right_share)
+        self._retired_state = np.zeros(max(64, 2 * len(owner)), dtype=np.uint8)
+        self._retired_share = np.zeros_like(self._retired_state)
+        self._retired_state[:len(owner)] = state
+        self._retired_share[:len(owner)] = share
+        self._retired_used = len(owner)
+        self._retired_start[rows] = first
+        self._retired_offset[rows] = offset
+        self._retired_length[rows] = merged
+
+    def _retired_columns(self, relative, length, offset):
+        """Estado y fracción de columnas de procesos retirados, relativas a su primera guardada"""
+        inside = (relative >= 0) & (relative < length)
+        state = np.where(relative < 0, NO_STATE, TERMINATED).astype(np.uint8)
+        share = np.where(relative < 0, 0, 255).astype(np.uint8)
+        index = (offset + relative)[inside]
+        state[inside] = self._retired_state[index]
+        share[inside] = self._retired_share[index]
+        return state, share
+
+    def push_cpu(self, cycle, values, columns=None):
+        """Añade la muestra de CPU de ``cycle``.
+
+        ``columns`` limita la escritura a esas filas (p. ej. los procesos
+        vivos); el resto cuenta como 0 % en esa muestra.
+        """
+        self.cycle = cycle
+        if not self.retention:
+            return
+        if columns is None:
+            slots = self._slot[:self._width]
+            live = slots >= 0  # los retirados ya no suman
+            self._cpu_sum[slots[live]] += np.asarray(values, dtype=np.uint32)[live]
+        elif len(columns):
+            slots = columns if self._slots_are_rows else self._slot[columns]
+            self._cpu_sum[slots] += np.asarray(values, dtype=np.uint32)
+        self._cpu_pending += 1
+        if self._cpu_pending < self.downsample:
+            return
+        used = self._slots
+        np.floor_divide(self._cpu_sum[:used], self._cpu_pending, out=self._cpu[self._cpu_head, :used],
+                        casting="unsafe")
+        self._cpu_cycles[self._cpu_head] = cycle
+        self._cpu_head = (self._cpu_head + 1) % self.retention
+        self._cpu_filled = min(self._cpu_filled + 1, self.retention)
+        self._cpu_sum[:used] = 0
+        self._cpu_pending = 0
+
+    def push_cpu_span(self, first_cycle, count, sampler, columns=None):
+        """Añade ``count`` ciclos seguidos desde ``first_cycle`` sin cambios de estado.
+
+        ``sampler(cycles)`` devuelve las muestras (len(cycles), columnas).
+        Solo se calculan los ciclos que seguirán en el búfer al terminar.
+        """
+        if count <= 0:
+            return
+        if not self.retention:
+            self.cycle = first_cycle + count - 1
+            return
+        # Ciclos que quedan: las últimas ``retention`` muestras completas y la parcial
+        final_pending = (self._cpu_pending + count) % self.downsample
+        kept = self.retention * self.downsample + final_pending
+        skipped = count - kept
+        if skipped > 0:
+            # Lo omitido completa muestras que luego se sobrescriben; el
+            # acumulador queda vacío porque ``kept`` cierra muestras enteras
+            completed = (self._cpu_pending + skipped) // self.downsample
+            self._cpu_head = (self._cpu_head + completed) % self.retention
+            self._cpu_filled = min(self._cpu_filled + completed, self.retention)
+            self._cpu_sum[:] = 0
+            self._cpu_pending = 0
+            first_cycle += skipped
+            count = kept
+        # Por bloques, para no materializar (ciclos × procesos) de una vez
+        width = self._width if columns is None else len(columns)
+        block = max(1, CPU_SPAN_BLOCK // max(1, width))
+        for start in range(first_cycle, first_cycle + count, block):
+            cycles = np.arange(start, min(start + block, first_cycle + count), dtype=np.int64)
+            for cycle, values in zip(cycles.tolist(), sampler(cycles)):
+                self.push_cpu(cycle, values, columns)
+
+    def closed_segments(self, start=0):
+        """Segmentos cerrados conservados a partir del índice ``start`` (vistas sin copia, sin ``end``)"""
+        return {name: column[start:self.segment_count] for name, column in self._segments.items()}
+
+    def open_segments(self):
+        """Segmento en curso de cada proceso, con su duración hasta el ciclo actual"""
+        return {
+            "row": np.arange(self.width, dtype=np.int32),
+            "state": self._open_state[:self._width],
+            "start": self._open_start[:self._width],
+            "length": self.cycle + 1 - self._open_start[:self._width],
+            "end": np.full(self._width, self.cycle + 1, dtype=np.int64),
+        }
+
+    def open_segment(self, row):
+        """``(state, start, length)`` del segmento en curso de ``row``"""
+        start = int(self._open_start[row])
+        return int(self._open_state[row]), start, self.cycle + 1 - start
+
+    def segments(self, row=None):
+        """Segmentos (row, state, start, length, end) conservados, incluidos los abiertos.
+
+        Con ``row`` se filtran los de un proceso, ordenados por ciclo.
+        """
+        closed = self.closed_segments()
+        open_segments = self.open_segments()
+        if row is not None:
+            closed = {name: column[closed["row"] == row] for name, column in closed.items()}
+            open_segments = {name: column[row:row + 1] for name, column in open_segments.items()}
+        segments = {name: np.concatenate([closed[name], open_segments[name]]) for name in SEGMENT_DTYPES}
+        return _with_end(segments)
+
+    def segments_between(self, start, stop, rows=None):
+        """Segmentos, incluidos los abiertos, que se solapan con los ciclos [start, stop).
+
+        ``rows`` (un ``range``) limita la consulta a esas filas. Los cerrados
+        se buscan por su ciclo final, que no decrece en el orden de cierre;
+        los que terminan hasta ``segment_horizon`` pueden faltar.
+        """
+        rows = range(self._width) if rows is None else rows
+        closed = _with_end(self.closed_segments())
+        first = int(np.searchsorted(closed["end"], start, side="right"))
+        keep = ((closed["start"][first:] < stop) & (closed["row"][first:] >= rows.start)
+                & (closed["row"][first:] < rows.stop))
+        open_segments = {name: column[rows.start:rows.stop]
+                         for name, column in self.open_segments().items()}
+        open_keep = (open_segments["start"] < stop) & (open_segments["end"] > start)
+        return {name: np.concatenate([closed[name][first:][keep], open_segments[name][open_keep]])
+                for name in closed}
+
+    def summary(self, start, stop, rows=None):
+        """Columnas completas del resumen que se solapan con los ciclos [start, stop).
+
+        Devuelve ``(first_cycle, bucket, states, shares)``: las columnas
+        empiezan en ``first_cycle`` y duran ``bucket`` ciclos; ``states`` y
+        ``shares`` tienen forma (filas, columnas) y ``NO_STATE`` marca los
+        tramos en que el proceso aún no existía.
+        """
+        rows = range(self._width) if rows is None else rows
+        bucket = self.summary_bucket
+        first = max(0, int(start) // bucket)
+        last = max(first, min(self.summary_columns, -(-int(stop) // bucket)))
+        slots = self._slot[rows.start:rows.stop]
+        states = np.empty((len(slots), last - first), dtype=np.uint8)
+        shares = np.empty_like(states)
+        live = slots >= 0
+        states[live] = self._summary_state[slots[live], first:last]
+        shares[live] = self._summary_share[slots[live], first:last]
+        retired = np.flatnonzero(~live) + rows.start
+        if retired.size:
+            relative = np.arange(first, last) - self._retired_start[retired, None].astype(np.int64)
+            states[~live], shares[~live] = self._retired_columns(
+                relative, self._retired_length[retired, None], self._retired_offset[retired, None])
+        return first * bucket, bucket, states, shares
+
+    def state_history(self, row):
+        """Reconstruye el código de estado de ``row`` en cada ciclo de sus segmentos conservados.
+
+        Empieza en el ciclo en que se registró, salvo que sus primeros
+        segmentos terminaran hasta ``segment_horizon`` y se descartaran.
+        """
+        segments = self.segments(row)
+        return np.repeat(segments["state"], segments["length"])
+
+    def _cpu_order(self):
+        """Filas del búfer circular de la muestra más antigua a la más reciente"""
+        if not self.retention:
+            return np.zeros(0, dtype=np.int64)
+        return (np.arange(self._cpu_filled) + self._cpu_head - self._cpu_filled) % self.retention
+
+    def cpu_window(self, rows=None):
+        """Muestras de CPU retenidas de ``rows`` (por defecto, todos), de la más antigua a la más reciente.
+
+        Devuelve ``(cycles, samples)`` con ``samples`` de forma (muestras,
+        procesos); los procesos retirados valen 0 en todas, y en una
+        instantánea también los que no se pidieron en ``cpu_rows``.
+        """
+        rows = np.arange(self._width) if rows is None else np.asarray(rows, dtype=np.int64)
+        order = self._cpu_order()
+        slots = (self._slot if self._cpu_slot is None else self._cpu_slot)[rows]
+        samples = np.zeros((len(order), len(rows)), dtype=np.uint8)
+        live = np.flatnonzero(slots >= 0)
+        samples[:, live] = self._cpu[order[:, None], slots[live]]
+        return self._cpu_cycles[order], samples
+
+    def snapshot(self, cpu_rows=None):
+        """Copia de solo lectura del historial en el ciclo actual.
+
+        Los segmentos cerrados solo se añaden al final (y compactarlos crea
+        arreglos nuevos), así que se comparten sin copiarlos; se copian los
+        datos por proceso. El resumen también se comparte: solo se escriben
+        columnas posteriores a ``summary_columns`` o de columnas densas
+        nuevas, y fusionarlas o retirar procesos crea arreglos nuevos.
+
+        El búfer de CPU se escribe en cada ciclo, así que de él se copia la
+        ventana de ``cpu_rows`` (p. ej. las filas visibles); por defecto, la
+        de todos los procesos.
+        """
+        frozen = HistoryStore.__new__(HistoryStore)
+        frozen.__dict__.update(self.__dict__)
+        frozen._segments = dict(self._segments)
+        frozen._bucket_time = None
+        for name in PROCESS_COLUMNS:
+            setattr(frozen, name, getattr(self, name)[:self._width].copy())
+        order = self._cpu_order()
+        frozen.retention = len(order)
+        frozen._cpu_cycles = self._cpu_cycles[order]
+        if cpu_rows is None:
+            frozen._cpu = self._cpu[order, :self._slots]
+        else:
+            rows = np.asarray(cpu_rows, dtype=np.int64)
+            rows = rows[(rows >= 0) & (rows < self._width)]
+            rows = rows[self._slot[rows] >= 0]
+            frozen._cpu = self._cpu[order[:, None], self._slot[rows]]
+            frozen._cpu_slot = np.full(self._width, -1, dtype=np.int32)
+            frozen._cpu_slot[rows] = np.arange(len(rows))
+        frozen._cpu_head = 0
+        frozen._cpu_filled = len(order)
+        frozen._cpu_sum = None
+        return frozen
+
+    def checkpoint_state(self):
+        """``(scalars, arrays)`` que definen el historial, para un punto de control.
+
+        Los arreglos van sin la capacidad sobrante; de ella solo se anota la
+        de los segmentos y las columnas densas, para que el historial
+        retomado compacte y retire en los mismos ciclos. Como en
+        ``snapshot``, los segmentos cerrados y los resúmenes se comparten sin
+        copiarlos; el resto son copias.
+        """
+        scalars = {name: getattr(self, name) for name in CHECKPOINT_SCALARS}
+        scalars["segment_capacity"] = len(self._segments["row"])
+        scalars["slot_capacity"] = len(self._slot_row)
+        scalars["summary_capacity"] = self._summary_state.shape[1]
+        arrays = {f"segments.{name}": column[:self.segment_count] for name, column in self._segments.items()}
+        arrays.update((name, getattr(self, name)[:self._width].copy()) for name in PROCESS_COLUMNS)
+        for name in ("_slot_row", "_cpu_sum", "_bucket_time"):
+            arrays[name] = getattr(self, name)[:self._slots].copy()
+        arrays["_cpu"] = self._cpu[:, :self._slots].copy()
+        arrays["_cpu_cycles"] = self._cpu_cycles.copy()
+        for name in ("_summary_state", "_summary_share"):
+            arrays[name] = getattr(self, name)[:self._slots, :self.summary_columns]
+        for name in ("_retired_state", "_retired_share"):
+            arrays[name] = getattr(self, name)[:self._retired_used]
+        return scalars, arrays
+
+    @classmethod
+    def from_checkpoint(cls, scalars, arrays):
+        """Historial a partir de ``checkpoint_state`` (los arreglos se copian)"""
+        history = cls(scalars["retention"], scalars["downsample"], scalars["segment_retention"],
+                      scalars["records_summary"])
+        history.__dict__.update((name, scalars[name]) for name in CHECKPOINT_SCALARS)
+        history._segments = {name: _padded(arrays[f"segments.{name}"], scalars["segment_capacity"])
+                             for name in SEGMENT_DTYPES}
+        for name in PROCESS_COLUMNS:
+            setattr(history, name, arrays[name].copy())
+        for name in ("_retired_state", "_retired_share"):
+            setattr(history, name, _padded(arrays[name], max(64, len(arrays[name]))))
+        slots = scalars["slot_capacity"]
+        for name in ("_slot_row", "_cpu_sum", "_bucket_time"):
+            setattr(history, name, _padded(arrays[name], slots))
+        history._cpu = np.zeros((scalars["retention"], slots), dtype=np.uint8)
+        history._cpu[:, :scalars["_slots"]] = arrays["_cpu"]
+        history._cpu_cycles = arrays["_cpu_cycles"].copy()
+        for name, fill in (("_summary_state", NO_STATE), ("_summary_share", 0)):
+            values = arrays[name]
+            grown = np.full((slots, scalars["summary_capacity"]), fill, dtype=values.dtype)
+            grown[:values.shape[0], :values.shape[1]] = values
+            setattr(history, name, grown)
+        return history
+
+    @property
+    def nbytes(self):
+        segments = sum(column.nbytes for column in self._segments.values())
+        rows = sum(getattr(self, name).nbytes for name in (
+            "_first_state", "_first_cycle", "_open_state", "_open_start", "_slot",
+            "_retired_start", "_retired_offset", "_retired_length", "_retired_state", "_retired_share"))
+        return (segments + rows + self._slot_row.nbytes
+                + self._cpu.nbytes + self._cpu_cycles.nbytes + self._cpu_sum.nbytes
+                + self._summary_state.nbytes + self._summary_share.nbytes + self._bucket_time.nbytes)
+
+
+def _padded(values, capacity):
+    """Copia de ``values`` con ``capacity`` filas (las que sobran en cero)"""
+    padded = np.zeros((capacity,) + values.shape[1:], dtype=values.dtype)
+    padded[:len(values)] = values
+    return padded
+
+
+def _with_end(segments):
+    """``segments`` con la columna ``end`` (start + length)"""
+    return {**segments, "end": segments["start"] + segments["length"]}
+
+
+def _merge_pairs(left, left_share, right, right_share):
+    """Fusiona dos tramos del resumen: gana el de mayor fracción"""
+    left_share, right_share = left_share.astype(np.int32), right_share.astype(np.int32)
+    state = np.where(right_share > left_share, right, left)
+    share = np.where(left == right, left_share + right_share, np.maximum(left_share, right_share)) // 2
+    return state, share
@@ -0,0 +1,585 @@
+"""Gestión de memoria física para el modelo planificado.
+
+Un proceso necesita su ``memory_usage`` (MB) para pasar de NEW a READY; si
+no hay memoria queda en WAITING, en orden de llegada, hasta que otro proceso
+termine y la libere. Un proceso que no cabría ni con la memoria vacía se
+rechaza (pasa a TERMINATED sin ejecutarse).
+
+* ``ContiguousMemory``: particiones variables con primer, mejor o peor
+  ajuste. Los huecos libres se indexan por dirección (árbol de máximos) y
+  por tamaño (árbol de sumas y un montículo por tamaño), así que reservar y
+  liberar cuesta O(log n) (amortizado) con miles de procesos vivos.
+* ``BuddyMemory``: sistema de compañeros con bloques potencia de dos y un
+  conjunto de bloques libres por orden: reservar y liberar cuesta O(órdenes).
+* ``PagedMemory``: paginación por demanda. Cada proceso recibe una parte de
+  sus páginas en marcos propios y reemplaza localmente con FIFO, LRU o
+  reloj; un fallo de página lo deja en WAITING ``fault_time`` ciclos.
+
+El motor usa el gestor así:
+
+* ``allocate(row)`` al admitir un proceso (``False`` = esperar) y
+  ``free(row)`` cuando termina; ``fits(row)`` dice si podría caber alguna vez;
+* ``hits_before_fault(row, first, limit)`` al despacharlo: cuántas de sus
+  próximas ``limit`` referencias aciertan antes del primer fallo (``None``
+  si no falla ninguna); ``executed`` registra las referencias ejecutadas y
+  ``fault`` carga la página que falló.
+
+La referencia número ``i`` de un proceso es la página que toca en su ciclo
+de CPU ``i``; depende solo de (``key``, fila, ``i``).
+"""
+import heapq
+from collections import deque
+
+import numpy as np
+
+from .scheduling import ORIGINAL_NAMES
+
+
+class MemoryManager:
+    name = ""
+    fault_time = 0
+
+    def __init__(self, size=4096):
+        if size <= 0:
+            raise ValueError("size debe ser positivo")
+        self.size = size
+        self.table = None
+
+    def attach(self, table, key=0):
+        """Asocia el gestor a la tabla de procesos del motor y libera toda la memoria"""
+        self.table = table
+        self.key = key
+        self.requested = {}  # fila → MB pedidos
+        self._samples = 0
+        self._external_sum = 0.0
+        self._internal_sum = 0.0
+        self.clear()
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _amount(self, row):
+        return max(1, int(self.table.memory_usage[row]))
+
+    def fits(self, row):
+        return self._amount(row) <= self.size
+
+    def allocate(self, row):
+        """Reserva la memoria de ``row``; devuelve ``False`` si ahora no cabe"""
+        raise NotImplementedError
+
+    def free(self, row):
+        raise NotImplementedError
+
+    def hits_before_fault(self, row, first, limit):
+        return None
+
+    def executed(self, row, first, count):
+        pass
+
+    def fault(self, row, index):
+        pass
+
+    def used(self):
+        """MB ocupados"""
+        raise NotImplementedError
+
+    def external_fragmentation(self):
+        """Fracción de la memoria libre que queda fuera del hueco más grande"""
+        return 0.0
+
+    def internal_fragmentation(self):
+        """Fracción de lo reservado que los procesos no pidieron"""
+        return 0.0
+
+    def _sample(self):
+        """Acumula la fragmentación que ve cada pedido de memoria"""
+        self._samples += 1
+        self._external_sum += self.external_fragmentation()
+        self._internal_sum += self.internal_fragmentation()
+
+    def stats(self):
+        """Ocupación y fragmentación actuales y promedio de los pedidos"""
+        used = self.used()
+        samples = max(1, self._samples)
+        return {
+            "memory_used": used,
+            "memory_free": self.size - used,
+            "external_fragmentation": self.external_fragmentation(),
+            "internal_fragmentation": self.internal_fragmentation(),
+            "mean_external_fragmentation": self._external_sum / samples,
+            "mean_internal_fragmentation": self._internal_sum / samples,
+        }
+
+
+class _FreeBlocks:
+    """Huecos libres [start, start + size) que se fusionan con sus vecinos.
+
+    ``tree`` es un árbol de máximos sobre las direcciones: cada hoja guarda
+    el tamaño del hueco que empieza ahí (0 si ninguno), lo que permite
+    encontrar bajando por el árbol el primer hueco suficiente y el más
+    grande. ``sizes`` es un árbol de sumas sobre los tamaños (cuántos huecos
+    hay de cada uno) para encontrar el menor tamaño suficiente, y ``starts``
+    guarda los inicios de cada tamaño en un montículo con borrado diferido.
+    """
+
+    def __init__(self, size):
+        self.leaves = 1 << max(0, (size - 1).bit_length())
+        self.tree = [0] * (2 * self.leaves)
+        self.size_leaves = 1 << size.bit_length()
+        self.sizes = [0] * (2 * self.size_leaves)
+        self.starts = {}    # tamaño → montículo de inicios (puede tener inicios ya ocupados)
+        self.by_start = {}  # inicio → tamaño
+        self.by_end = {}    # fin → inicio
+        self.total = 0
+        self.add(0, size)
+
+    def __len__(self):
+        return len(self.by_start)
+
+    def _set(self, start, size):
+        tree = self.tree
+        node = start + self.leaves
+        tree[node] = size
+        while node > 1:
+            node //= 2
+            largest = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == largest:
+                break  # los ancestros tampoco cambian
+            tree[node] = largest
+
+    def _count(self, size, change):
+        sizes = self.sizes
+        node = size + self.size_leaves
+        count = sizes[node] = sizes[node] + change
+        while node > 1:
+            node //= 2
+            sizes[node] += change
+        return count
+
+    def _insert(self, start, size):
+        self.by_start[start] = size
+        self.by_end[start + size] = start
+        self._set(start, size)
+        self.total += size
+        count = self._count(size, 1)
+        starts = self.starts.setdefault(size, [])
+        heapq.heappush(starts, start)
+        if len(starts) > 2 * count:
+            # Se descartan los inicios que ya no son huecos de este tamaño
+            starts[:] = sorted({start for start in starts if self.by_start.get(start) == size})
+
+    def _remove(self, start):
+        size = self.by_start.pop(start)
+        del self.by_end[start + size]
+        self._set(start, 0)
+        self.total -= size
+        if not self._count(size, -1):
+            del self.starts[size]
+        return size
+
+    def add(self, start, size):
+        """Libera [start, start + size) fusionándolo con los huecos contiguos"""
+        left = self.by_end.get(start)
+        if left is not None:
+            size += self._remove(left)
+            start = left
+        if start + size in self.by_start:
+            size += self._remove(start + size)
+        self._insert(start, size)
+
+    def take(self, start, size):
+        """Ocupa los primeros ``size`` de un hueco existente que empieza en ``start``"""
+        rest = self._remove(start) - size
+        if rest:
+            self._insert(start + size, rest)
+
+    @property
+    def largest(self):
+        return self.tree[1]
+
+    def first_fit(self, size):
+        if self.tree[1] < size:
+            return None
+        node = 1
+        while node < self.leaves:
+            node = 2 * node if self.tree[2 * node] >= size else 2 * node + 1
+        return node - self.leaves
+
+    def best_fit(self, size):
+        # Menor tamaño suficiente: desde su hoja se sube hasta un hermano
+        # derecho con huecos y se baja por su rama más a la izquierda
+        if size >= self.size_leaves:
+            return None
+        node = size + self.size_leaves
+        if not self.sizes[node]:
+            while node > 1 and (node % 2 or not self.sizes[node + 1]):
+                node //= 2
+            if node == 1:
+                return None
+            node += 1
+            while node < self.size_leaves:
+                node = 2 * node if self.sizes[2 * node] else 2 * node + 1
+        size = node - self.size_leaves
+        starts = self.starts[size]
+        while self.by_start.get(starts[0]) != size:
+            heapq.heappop(starts)
+        return starts[0]
+
+    def worst_fit(self, size):
+        if self.tree[1] < size:
+            return None
+        # Entre los huecos más grandes, el de mayor dirección
+        node = 1
+        while node < self.leaves:
+            node = 2 * node + 1 if self.tree[2 * node + 1] == self.tree[node] else 2 * node
+        return node - self.leaves
+
+
+class ContiguousMemory(MemoryManager):
+    """Particiones variables; ``fit`` es ``"first"``, ``"best"`` o ``"worst"``"""
+
+    FITS = ("first", "best", "worst")
+
+    def __init__(self, size=4096, fit="first"):
+        super().__init__(size)
+        if fit not in self.FITS:
+            raise ValueError(f"Ajuste desconocido: {fit}")
+        self.fit = fit
+        self.name = f"{fit.capitalize()} fit"
+
+    def clear(self):
+        self.blocks = _FreeBlocks(self.size)
+        self._find = getattr(self.blocks, f"{self.fit}_fit")
+        self.allocations = {}  # fila → (inicio, tamaño)
+
+    def __getstate__(self):
+        # Sin el método de búsqueda, que se vuelve a tomar de ``blocks`` al cargar
+        state = self.__dict__.copy()
+        state.pop("_find", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "blocks" in state:
+            self._find = getattr(self.blocks, f"{self.fit}_fit")
+
+    def allocate(self, row):
+        self._sample()
+        amount = self._amount(row)
+        start = self._find(amount)
+        if start is None:
+            return False
+        self.blocks.take(start, amount)
+        self.allocations[row] = (start, amount)
+        self.requested[row] = amount
+        return True
+
+    def free(self, row):
+        start, amount = self.allocations.pop(row)
+        del self.requested[row]
+        self.blocks.add(start, amount)
+
+    def used(self):
+        return self.size - self.blocks.total
+
+    def external_fragmentation(self):
+        free = self.blocks.total
+        return 1 - self.blocks.largest / free if free else 0.0
+
+
+class BuddyMemory(MemoryManager):
+    """Sistema de compañeros: bloques de ``min_block << k`` MB que se dividen y fusionan.
+
+    Si ``size`` no es potencia de dos se reparte en bloques potencia de dos
+    que nunca se fusionan entre sí.
+    """
+
+    name = "Buddy"
+
+    def __init__(self, size=4096, min_block=1):
+        super().__init__(size)
+        self.min_block = min_block
+
+    def clear(self):
+        units = self.size // self.min_block
+        self.orders = max(1, units.bit_length())
+        self.free_lists = [set() for _ in range(self.orders)]  # inicios libres, por orden
+        self.allocations = {}  # fila → (inicio, orden)
+        self.allocated = 0
+        self.requested_total = 0
+        start = 0
+        for order in reversed(range(self.orders)):
+            if units & (1 << order):
+                self.free_lists[order].add(start)
+                start += 1 << order
+
+    def _order(self, amount):
+        units = -(-amount // self.min_block)
+        return max(0, (units - 1).bit_length())
+
+    def fits(self, row):
+        order = self._order(self._amount(row))
+        return order < self.orders and (self.size // self.min_block) >> order > 0
+
+    def allocate(self, row):
+        self._sample()
+        amount = self._amount(row)
+        order = self._order(amount)
+        larger = next((k for k in range(order, self.orders) if self.free_lists[k]), None)
+        if larger is None:
+            return False
+        start = self.free_lists[larger].pop()
+        # Se divide hasta el orden pedido; las mitades derechas quedan libres
+        while larger > order:
+            larger -= 1
+            self.free_lists[larger].add(start + (1 << larger))
+        self.allocations[row] = (start, order)
+        self.requested[row] = amount
+        self.allocated += self.min_block << order
+        self.requested_total += amount
+        return True
+
+    def free(self, row):
+        start, order = self.allocations.pop(row)
+        self.allocated -= self.min_block << order
+        self.requested_total -= self.requested.pop(row)
+        while order + 1 < self.orders:
+            buddy = start ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            self.free_lists[order].remove(buddy)
+            start = min(start, buddy)
+            order += 1
+        self.free_lists[order].add(start)
+
+    def used(self):
+        return self.allocated
+
+    def external_fragmentation(self):
+        free = self.size // self.min_block * self.min_block - self.allocated
+        largest = max((self.min_block << order for order, starts in enumerate(self.free_lists) if starts),
+                      default=0)
+        return 1 - largest / free if free else 0.0
+
+    def internal_fragmentation(self):
+        # Lo reservado de más al redondear a potencia de dos
+        return 1 - self.requested_total / self.allocated if self.allocated else 0.0
+
+
+class FIFOPages:
+    """Páginas residentes de un proceso en ``frames`` marcos; reemplaza la más antigua"""
+
+    def __init__(self, pages, frames):
+        self.resident = np.zeros(pages, dtype=bool)
+        self.frames = frames
+        self._order = deque()
+
+    def touch(self, pages, indices):
+        """Registra referencias que acertaron (``indices`` crecientes)"""
+
+    def _victim(self):
+        return self._order.popleft()
+
+    def load(self, page, index):
+        if len(self._order) == self.frames:
+            self.resident[self._victim()] = False
+        self._order.append(page)
+        self.resident[page] = True
+
+
+class LRUPages(FIFOPages):
+    """Reemplaza la página usada hace más tiempo"""
+
+    def __init__(self, pages, frames):
+        super().__init__(pages, frames)
+        self.last_use = np.full(pages, -1, dtype=np.int64)
+
+    def touch(self, pages, indices):
+        np.maximum.at(self.last_use, pages, indices)
+
+    def _victim(self):
+        loaded = np.asarray(self._order)
+        oldest = int(np.argmin(self.last_use[loaded]))
+        victim = int(loaded[oldest])
+        del self._order[oldest]
+        return victim
+
+    def load(self, page, index):
+        super().load(page, index)
+        self.last_use[page] = index
+
+
+class ClockPages(FIFOPages):
+    """Segunda oportunidad: la aguja salta las páginas con el bit de referencia encendido"""
+
+    def __init__(self, pages, frames):
+        super().__init__(pages, frames)
+        self.referenced = np.zeros(pages, dtype=bool)
+        self._ring = []
+        self._hand = 0
+
+    def touch(self, pages, indices):
+        self.referenced[pages] = True
+
+    def load(self, page, index):
+        if len(self._ring) < self.frames:
+            self._ring.append(page)
+        else:
+            while self.referenced[self._ring[self._hand]]:
+                self.referenced[self._ring[self._hand]] = False
+                self._hand = (self._hand + 1) % self.frames
+            self.resident[self._ring[self._hand]] = False
+            self._ring[self._hand] = page
+            self._hand = (self._hand + 1) % self.frames
+        self.resident[page] = True
+        self.referenced[page] = True
+
+
+REPLACEMENTS = {"FIFO": FIFOPages, "LRU": LRUPages, "CLOCK": ClockPages}
+
+
+class PagedMemory(MemoryManager):
+    """Paginación por demanda con reemplazo local.
+
+    La memoria son ``size // page_size`` marcos. Al admitirlo, un proceso
+    de ``p`` páginas recibe ``ceil(p × resident_fraction)`` marcos; sus
+    referencias se mueven dentro de una ventana de ``working_set`` páginas
+    que cambia de lugar cada ``phase_length`` ciclos de CPU.
+    """
+
+    def __init__(self, size=4096, replacement="LRU", page_size=4, resident_fraction=0.25,
+                 fault_time=5, working_set=8, phase_length=256):
+        super().__init__(size)
+        if replacement not in REPLACEMENTS:
+            raise ValueError(f"Reemplazo de páginas desconocido: {replacement}")
+        self.replacement = replacement
+        self.name = f"Paginación {replacement}"
+        self.page_size = page_size
+        self.resident_fraction = resident_fraction
+        self.fault_time = fault_time
+        self.working_set = working_set
+        self.phase_length = phase_length
+        self.frames = size // page_size
+
+    def clear(self):
+        self.free_frames = self.frames
+        self.reserved = 0         # MB de las páginas completas de los procesos admitidos
+        self.requested_total = 0
+        self.resident = {}  # fila → páginas residentes (``REPLACEMENTS``)
+        self.faults = 0
+        self.references = 0
+        self._phases = {}   # fila → (fase, páginas) de la última fase generada
+
+    def _pages(self, row):
+        return -(-self._amount(row) // self.page_size)
+
+    def _frames(self, row):
+        return max(1, int(np.ceil(self._pages(row) * self.resident_fraction)))
+
+    def fits(self, row):
+        return self._frames(row) <= self.frames
+
+    def allocate(self, row):
+        self._sample()
+        frames = self._frames(row)
+        if frames > self.free_frames:
+            return False
+        self.free_frames -= frames
+        self.resident[row] = REPLACEMENTS[self.replacement](self._pages(row), frames)
+        self.requested[row] = self._amount(row)
+        self.reserved += self._pages(row) * self.page_size
+        self.requested_total += self.requested[row]
+        return True
+
+    def free(self, row):
+        self.free_frames += self.resident.pop(row).frames
+        self.reserved -= self._pages(row) * self.page_size
+        self.requested_total -= self.requested.pop(row)
+        self._phases.pop(row, None)
+
+    def _phase(self, row, phase):
+        """Páginas de las referencias de la fase ``phase`` de ``row``"""
+        cached = self._phases.get(row)
+        if cached is None or cached[0] != phase:
+            rng = np.random.default_rng([self.key, row, phase])
+            pages = self._pages(row)
+            base = rng.integers(pages)
+            offsets = rng.integers(min(self.working_set, pages), size=self.phase_length)
+            cached = (phase, (base + offsets) % pages)
+            self._phases[row] = cached
+        return cached[1]
+
+    def _references(self, row, first, count):
+        """``(índice, páginas)`` de las referencias [first, first + count) por tramos de una fase"""
+        index, stop = first, first + count
+        while index < stop:
+            phase, offset = divmod(index, self.phase_length)
+            pages = self._phase(row, phase)[offset:offset + stop - index]
+            yield index, pages
+            index += len(pages)
+
+    def hits_before_fault(self, row, first, limit):
+        resident = self.resident[row].resident
+        for index, pages in self._references(row, first, limit):
+            missing = np.flatnonzero(~resident[pages])
+            if missing.size:
+                return index - first + int(missing[0])
+        return None
+
+    def executed(self, row, first, count):
+        self.references += count
+        pages = self.resident[row]
+        for index, referenced in self._references(row, first, count):
+            pages.touch(referenced, np.arange(index, index + len(referenced)))
+
+    def fault(self, row, index):
+        self.faults += 1
+        page = int(self._phase(row, index // self.phase_length)[index % self.phase_length])
+        self.resident[row].load(page, index)
+
+    def used(self):
+        return (self.frames - self.free_frames) * self.page_size
+
+    def internal_fragmentation(self):
+        # Lo que sobra de la última página de cada proceso
+        return 1 - self.requested_total / self.reserved if self.reserved else 0.0
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "page_faults": self.faults,
+            # Fracción de accesos que fallaron (el acceso que falla se repite luego)
+            "page_fault_rate": self.faults / (self.faults + self.references) if self.faults else 0.0,
+        }
+
+
+MEMORY_MANAGERS = {
+    "FIRST_FIT": lambda **options: ContiguousMemory(fit="first", **options),
+    "BEST_FIT": lambda **options: ContiguousMemory(fit="best", **options),
+    "WORST_FIT": lambda **options: ContiguousMemory(fit="worst", **options),
+    "BUDDY": BuddyMemory,
+    "PAGING_FIFO": lambda **options: PagedMemory(replacement="FIFO", **options),
+    "PAGING_LRU": lambda **options: PagedMemory(replacement="LRU", **options),
+    "PAGING_CLOCK": lambda **options: PagedMemory(replacement="CLOCK", **options),
+}
+
+
+def make_memory(name, **options):
+    """Crea un gestor por nombre (ver ``MEMORY_MANAGERS``); ``None`` es memoria ilimitada"""
+    if name is None:
+        return None
+    try:
+        factory = MEMORY_MANAGERS[name]
+    except KeyError:
+        raise ValueError(f"Gestor de memoria desconocido: {name}") from None
+    return factory(**options)
+
+
+def memory_name(text):
+    """Gestor de memoria leído de la línea de comandos; ``none`` u ``original`` dan ``None``"""
+    if text.lower() in ORIGINAL_NAMES:
+        return None
+    if text not in MEMORY_MANAGERS:
+        raise ValueError(f"Gestor de memoria desconocido: {text}")
+    return text
@@ -0,0 +1,61 @@
+"""Métricas de planificación de una simulación terminada o en curso.
+
+Se calculan sobre un ``SimulationEngine`` o una ``EngineSnapshot``:
+
+* retorno (turnaround): ciclos que un proceso terminado pasó en el sistema,
+  es decir, su tiempo fuera de TERMINATED según ``time_in_states``;
+* espera: ciclos en READY (en la cola de listos);
+* respuesta: ciclos desde la llegada hasta el primer despacho;
+* rendimiento (throughput): procesos terminados por ciclo;
+* uso de CPU: fracción de ciclos ocupados de los hilos de hardware;
+* memoria (con un gestor de ``simulador.memory``): fragmentación, esperas y
+  fallos de página, ver ``SimulationEngine.memory_stats``;
+* E/S (con ``devices``): uso, cola y espera de cada dispositivo, como
+  ``io_<dispositivo>_<métrica>``.
+"""
+import numpy as np
+
+from .states import READY, TERMINATED
+
+
+def _mean(values):
+    return float(values.mean()) if len(values) else float("nan")
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else float("nan")
+
+
+def summarize(engine):
+    """Diccionario con las métricas agregadas de todos los procesos"""
+    table = engine.table
+    times = engine.time_in_states()
+    cycles = max(1, engine.cycle_count)
+    finish = table.column("finish")
+    done = finish >= 0
+
+    turnaround = times[done, :TERMINATED].sum(axis=1)
+    waiting = times[done, READY]
+    first_run = table.column("first_run")
+    started = first_run >= 0
+    response = first_run[started] - table.column("arrival")[started]
+
+    utilization = engine.core_utilization()
+    memory = engine.memory_stats()
+    io = {f"io_{name}_{metric}": value
+          for name, stats in (engine.device_stats() or {}).items() for metric, value in stats.items()}
+
+    return {
+        "cycles": engine.cycle_count,
+        "processes": len(table),
+        "finished": int(done.sum()),
+        "throughput": float(done.sum()) / cycles,
+        "cpu_utilization": float(np.mean(utilization)),
+        "turnaround_mean": _mean(turnaround),
+        "turnaround_p95": _percentile(turnaround, 95),
+        "waiting_mean": _mean(waiting),
+        "waiting_p95": _percentile(waiting, 95),
+        "response_mean": _mean(response),
+        **(memory or {}),
+        **io,
+    }
@@ -0,0 +1,176 @@
+"""Tabla de procesos en formato estructura de arreglos (una columna NumPy por atributo).
+
+Un ciclo de simulación se reduce a unas pocas operaciones sobre columnas, en
+lugar de recorrer objetos ``Process`` uno a uno.
+"""
+import numpy as np
+
+from .states import PRIORITIES, STATE_CODES, STATE_NAMES
+
+# Columnas escalares de la tabla y su tipo
+COLUMNS = {
+    "pid": np.int64,
+    "priority": np.int8,               # índice en PRIORITIES
+    "execution_time": np.int32,        # tiempo de ejecución restante
+    "initial_execution_time": np.int32,
+    "execution_cycle": np.int32,
+    "memory_usage": np.int32,          # MB
+    "core": np.int16,
+    "thread": np.int16,
+    "state": np.int8,                  # código de estado (ver states.py)
+    "burst_left": np.int32,            # ráfaga de CPU pendiente antes de pedir E/S
+    "arrival": np.int64,               # ciclo de llegada
+    "first_run": np.int64,             # primer ciclo en RUNNING (-1 si aún no)
+    "finish": np.int64,                # ciclo en que terminó (-1 si aún no)
+}
+
+
+class ProcessTable:
+    """Procesos almacenados por columnas con capacidad ampliable.
+
+    Las columnas tienen ``capacity`` filas; solo las primeras ``len(table)``
+    son válidas, por eso se accede a ellas con ``table.column(nombre)``.
+    ``row_of(pid)`` encuentra la fila de un proceso en O(1).
+    """
+
+    def __init__(self, capacity=16):
+        self.size = 0
+        self.capacity = 0
+        self._index = {}  # pid → fila
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.time_in_states = np.zeros((0, len(STATE_NAMES)), dtype=np.int64)
+        self._reserve(capacity)
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        # Solo las filas válidas; el índice por pid se reconstruye al cargar
+        state = {name: self.column(name) for name in COLUMNS}
+        state["time_in_states"] = self.time_in_states[:self.size]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.size = self.capacity = len(self.time_in_states)
+        self._index = dict(zip(self.pid.tolist(), range(self.size)))
+
+    def _reserve(self, needed):
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, 2 * self.capacity, 16)
+        for name in COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        times = np.zeros((capacity, len(STATE_NAMES)), dtype=np.int64)
+        times[:self.size] = self.time_in_states[:self.size]
+        self.time_in_states = times
+        self.capacity = capacity
+
+    @property
+    def nbytes(self):
+        """Bytes de todas las columnas, incluida la capacidad sin usar"""
+        return sum(getattr(self, name).nbytes for name in COLUMNS) + self.time_in_states.nbytes
+
+    def column(self, name):
+        """Vista (sin copia) de las filas válidas de una columna"""
+        return getattr(self, name)[:self.size]
+
+    def copy(self):
+        """Copia independiente de las filas válidas"""
+        table = ProcessTable(capacity=self.size)
+        for name in COLUMNS:
+            getattr(table, name)[:self.size] = self.column(name)
+        table.time_in_states[:self.size] = self.time_in_states[:self.size]
+        table.size = self.size
+        # Las filas solo se añaden, así que el índice se comparte: ``row_of``
+        # descarta las filas que la copia no tiene
+        table._index = self._index
+        return table
+
+    def row_of(self, pid):
+        """Fila del proceso ``pid``, o ``None`` si no está en la tabla"""
+        row = self._index.get(pid)
+        return row if row is not None and row < self.size else None
+
+    def append_columns(self, **columns):
+        """Añade filas a partir de arreglos del mismo largo, uno por columna.
+
+        Las columnas omitidas quedan en cero (``state`` 0 equivale a NEW),
+        salvo ``burst_left``, que empieza en ``execution_cycle``, y
+        ``first_run``/``finish``, que empiezan en -1.
+        Devuelve el rango de índices de las filas añadidas.
+        """
+        count = len(next(iter(columns.values())))
+        start = self.size
+        self._reserve(start + count)
+        rows = slice(start, start + count)
+        self.first_run[rows] = -1
+        self.finish[rows] = -1
+        for name, values in columns.items():
+            getattr(self, name)[rows] = values
+        if "burst_left" not in columns:
+            self.burst_left[rows] = self.execution_cycle[rows]
+        # Solo estancias cerradas: la del estado actual la lleva el historial
+        self.time_in_states[start:start + count] = 0
+        self._index.update(zip(self.pid[rows].tolist(), range(start, start + count)))
+        self.size = start + count
+        return range(start, self.size)
+
+    def append(self, process):
+        """Añade un ``Process`` y devuelve su índice en la tabla"""
+        rows = self.extend([process])
+        return rows.start
+
+    def extend(self, processes):
+        processes = list(processes)
+        if not processes:
+            return range(self.size, self.size)
+        return self.append_columns(
+            pid=[p.id for p in processes],
+            priority=[PRIORITIES.index(p.priority) for p in processes],
+            execution_time=[p.execution_time for p in processes],
+            initial_execution_time=[p.initial_execution_time for p in processes],
+            execution_cycle=[p.execution_cycle for p in processes],
+            memory_usage=[p.memory_usage for p in processes],
+            core=[p.core for p in processes],
+            thread=[p.thread for p in processes],
+            state=[STATE_CODES[p.current_state] for p in processes],
+        )
+
+    @classmethod
+    def from_processes(cls, processes):
+        processes = list(processes)
+        table = cls(capacity=len(processes))
+        table.extend(processes)
+        return table
+
+    @classmethod
+    def random(cls, count, rng=None, first_pid=1):
+        """Genera ``count`` procesos sintéticos directamente en columnas.
+
+        Usa los mismos rangos que ``Process`` (memoria 100-600 MB, núcleo
+        0-3, hilo 0-7) y sirve para cargas de cientos de miles de procesos.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        table = cls(capacity=count)
+        table.append_columns(**random_columns(count, rng, first_pid))
+        return table
+
+
+def random_columns(count, rng, first_pid=1):
+    """Columnas de ``count`` procesos sintéticos, listas para ``append_columns``"""
+    execution_time = rng.integers(5, 31, size=count)
+    return {
+        "pid": np.arange(first_pid, first_pid + count),
+        "priority": rng.integers(0, len(PRIORITIES), size=count),
+        "execution_time": execution_time,
+        "initial_execution_time": execution_time,
+        "execution_cycle": rng.integers(3, 11, size=count),
+        "memory_usage": rng.integers(100, 601, size=count),
+        "core": rng.integers(0, 4, size=count),
+        "thread": rng.integers(0, 8, size=count),
+    }
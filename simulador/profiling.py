@@ -0,0 +1,161 @@
+"""Instrumentación liviana del camino crítico.
+
+Un ``Profiler`` mide el tiempo de cada fase con nombre (``timer``), lleva
+contadores (``count``) y tasas de eventos por segundo (``tick``: ciclos
+simulados, cuadros dibujados). Desactivado no mide tiempos ni tasas (los
+contadores siguen contando): ``timer`` devuelve un contexto vacío
+compartido, así que puede quedar puesto en el motor y en la interfaz sin
+costo apreciable::
+
+    profiler = Profiler(enabled=True)
+    engine = SimulationEngine(profiler=profiler)
+    engine.run(1000)
+    profiler.export("tiempos.csv")
+
+De cada fase se guardan el total, el máximo y las últimas ``samples``
+mediciones (instante y duración), que es lo que se exporta para analizar
+fuera de línea.
+"""
+import json
+import time
+from collections import deque
+
+# Nombres de las tasas que usa el motor y la interfaz
+CYCLES = "cycles"
+FRAMES = "frames"
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class _Phase:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, samples):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=samples)  # (inicio, duración) en segundos
+
+
+class Profiler:
+    """Tiempos por fase, contadores y tasas; ``enabled`` se puede cambiar en cualquier momento.
+
+    El motor y la interfaz lo usan desde hilos distintos, cada uno con sus
+    propias fases; las lecturas (``phases``, ``rate``) copian antes de recorrer.
+    """
+
+    def __init__(self, enabled=False, samples=1024, window=1.0):
+        self.enabled = enabled
+        self.samples = samples
+        self.window = window  # segundos que promedia ``rate``
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self._phases = {}
+        self._events = {}
+        self.counters = {}
+
+    def timer(self, name):
+        """Contexto que mide la fase ``name``"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name, seconds, start=None):
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self.samples)
+        phase.count += 1
+        phase.total += seconds
+        if seconds > phase.max:
+            phase.max = seconds
+        phase.samples.append((time.perf_counter() - seconds if start is None else start, seconds))
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def tick(self, name, amount=1):
+        """Registra ``amount`` eventos de la tasa ``name`` (también suma al contador)"""
+        if not self.enabled:
+            return
+        events = self._events.get(name)
+        if events is None:
+            events = self._events[name] = deque(maxlen=self.samples)
+        events.append((time.perf_counter(), amount))
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def rate(self, name):
+        """Eventos por segundo de ``name`` en la última ``window``"""
+        events = list(self._events.get(name, ()))
+        now = time.perf_counter()
+        since = now - self.window
+        recent = [(moment, amount) for moment, amount in events if moment >= since]
+        if not recent:
+            return 0.0
+        span = self.window
+        if len(events) == self.samples and events[0][0] >= since:
+            span = now - events[0][0]  # la cola se llenó antes de cubrir la ventana
+        return sum(amount for _, amount in recent) / max(span, 1e-9)
+
+    def phases(self):
+        """Una fila por fase, de mayor a menor tiempo total (milisegundos)"""
+        rows = []
+        for name, phase in list(self._phases.items()):
+            durations = sorted(seconds for _, seconds in list(phase.samples))
+            p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))] if durations else 0.0
+            rows.append({
+                "phase": name,
+                "count": phase.count,
+                "total_ms": phase.total * 1000,
+                "mean_ms": phase.total * 1000 / phase.count,
+                "p95_ms": p95 * 1000,
+                "max_ms": phase.max * 1000,
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def export(self, path):
+        """Escribe las mediciones en ``path``.
+
+        Con extensión ``.json``: resumen por fase, contadores y muestras. Si
+        no, un CSV con una fila por muestra (fase, inicio en segundos desde
+        ``reset`` y duración en milisegundos).
+        """
+        samples = {name: [(start - self.started, seconds * 1000) for start, seconds in list(phase.samples)]
+                   for name, phase in list(self._phases.items())}
+        with open(path, "w", newline="") as file:
+            if str(path).endswith(".json"):
+                json.dump({"phases": self.phases(), "counters": dict(self.counters),
+                           "samples": samples}, file, indent=2)
+                file.write("\n")
+            else:
+                file.write("phase,start_s,duration_ms\n")
+                rows = sorted((start, name, ms) for name, values in samples.items() for start, ms in values)
+                for start, name, ms in rows:
+                    file.write(f"{name},{start:.6f},{ms:.4f}\n")
@@ -0,0 +1,259 @@
+"""Ejecución continua del motor en un hilo de trabajo.
+
+La interfaz nunca toca el motor mientras corre: envía órdenes (reproducir,
+pausar, avanzar, cambiar la velocidad) y recibe instantáneas
+``EngineSnapshot`` por una cola que consulta con ``after``. Así la ventana
+sigue respondiendo a cualquier velocidad de simulación.
+
+El hilo también guarda puntos de control en memoria (``timeline``) para
+que la interfaz pueda volver a un ciclo anterior con ``seek``, guarda o
+carga puntos de control en archivos y exporta métricas con ``record``.
+
+Si una orden o un avance falla (p. ej. un punto de control o una traza
+inválidos) el hilo sigue vivo: la simulación se pausa y la excepción se
+deja en ``errors`` para que la interfaz la muestre.
+"""
+import queue
+import threading
+import time
+
+from .checkpoint import CheckpointTimeline, load_checkpoint, resumable, save_checkpoint
+from .export import MetricsExporter
+
+
+class SimulationRunner:
+    """Hilo que avanza un ``SimulationEngine`` a una velocidad objetivo.
+
+    ``rate`` son ciclos por segundo; ``None`` significa lo más rápido
+    posible. Como mucho se publica una instantánea cada ``snapshot_interval``
+    segundos y en la cola solo se conserva la más reciente. Las instantáneas
+    llevan el uso de CPU de las filas elegidas con ``watch`` (al principio,
+    de todas).
+    """
+
+    def __init__(self, engine, rate=2.0, snapshot_interval=1 / 30, timeline=None):
+        self.engine = engine
+        self.timeline = timeline if timeline is not None else CheckpointTimeline()
+        self.exporter = None
+        self.rate = rate
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = queue.Queue(maxsize=1)
+        self.errors = queue.Queue()
+        self.playing = False
+        self._commands = queue.Queue()
+        self._cycles_left = None  # ciclos restantes de una reproducción acotada
+        self._cpu_rows = None     # filas con uso de CPU en las instantáneas (``None`` = todas)
+        self._next_cycle = 0.0
+        self._last_publish = 0.0
+        self._thread = threading.Thread(target=self._run, name="simulador", daemon=True)
+
+    def start(self):
+        self._capture(force=True)
+        self._publish()
+        self._thread.start()
+
+    # Órdenes desde la interfaz (se ejecutan en el hilo de trabajo)
+
+    def play(self, cycles=None):
+        """Reproduce indefinidamente o solo ``cycles`` ciclos"""
+        self._commands.put(("play", cycles))
+
+    def pause(self):
+        self._commands.put(("pause", None))
+
+    def step(self, cycles=1):
+        """Avanza ``cycles`` ciclos de inmediato, sin esperar a la velocidad objetivo"""
+        self._commands.put(("step", cycles))
+
+    def set_rate(self, rate):
+        self._commands.put(("rate", rate))
+
+    def reset(self, processes=None):
+        self._commands.put(("reset", processes))
+
+    def configure(self, **options):
+        """Cambia opciones del motor (p. ej. ``scheduler``) y lo reinicia"""
+        self._commands.put(("configure", options))
+
+    def save(self, path):
+        """Guarda un punto de control del estado actual en ``path``"""
+        self._commands.put(("save", path))
+
+    def load(self, path):
+        """Reanuda desde el punto de control de ``path`` (en pausa)"""
+        self._commands.put(("load", path))
+
+    def seek(self, cycle):
+        """Pausa y lleva la simulación a ``cycle`` usando los puntos de control en memoria"""
+        self._commands.put(("seek", cycle))
+
+    def watch(self, rows):
+        """Limita el uso de CPU de las instantáneas a ``rows`` (p. ej. las filas visibles)"""
+        self._commands.put(("watch", rows))
+
+    def record(self, directory):
+        """Exporta las métricas del motor a ``directory``; ``None`` termina la exportación"""
+        self._commands.put(("record", directory))
+
+    def stop(self):
+        self._commands.put(("stop", None))
+        if self._thread.is_alive():
+            self._thread.join(timeout=1)
+
+    def latest_snapshot(self):
+        """Toma la instantánea más reciente, o ``None`` si no hay ninguna nueva"""
+        try:
+            return self.snapshots.get_nowait()
+        except queue.Empty:
+            return None
+
+    def pending_errors(self):
+        """Excepciones de las órdenes o avances que fallaron desde la última consulta"""
+        errors = []
+        while True:
+            try:
+                errors.append(self.errors.get_nowait())
+            except queue.Empty:
+                return errors
+
+    # Hilo de trabajo
+
+    def _publish(self):
+        snapshot = self.engine.snapshot(self._cpu_rows)
+        try:
+            self.snapshots.get_nowait()  # descartar la que la interfaz no llegó a ver
+        except queue.Empty:
+            pass
+        self.snapshots.put(snapshot)
+        self._last_publish = time.perf_counter()
+
+    def _handle(self, command, argument):
+        if command == "play":
+            self.playing = True
+            self._cycles_left = argument
+            self._next_cycle = time.perf_counter()
+        elif command == "pause":
+            self.playing = False
+        elif command == "step":
+            self.engine.run(argument)
+            self._capture()
+            self._publish()
+        elif command == "rate":
+            self.rate = argument
+            self._next_cycle = time.perf_counter()
+        elif command == "reset":
+            self.playing = False
+            self.engine.configure(argument)  # si falla, el motor queda como estaba
+            self._restart_timeline()
+        elif command == "configure":
+            self.playing = False
+            self.engine.configure(**argument)
+            self._restart_timeline()
+        elif command == "save":
+            save_checkpoint(self.engine, argument)
+        elif command == "load":
+            self.playing = False
+            load_checkpoint(argument, self.engine)
+            self._restart_timeline()
+        elif command == "seek":
+            self.playing = False
+            # No se puede volver antes del primer punto de control (p. ej. uno cargado)
+            if self.timeline.cycles:
+                self.timeline.seek(self.engine, max(argument, self.timeline.cycles[0]))
+            self._publish()
+        elif command == "watch":
+            self._cpu_rows = argument
+            self._publish()
+        elif command == "record":
+            if self.exporter is not None:
+                self.exporter.close()
+                self.exporter = None
+            if argument is not None:
+                self.exporter = MetricsExporter(argument)
+                self.exporter.attach(self.engine)
+        elif command == "stop":
+            if self.exporter is not None:
+                self.exporter.close()
+            return False
+        return True
+
+    def _restart_timeline(self):
+        self.timeline.clear()
+        self._capture(force=True)
+        self._publish()
+
+    def _capture(self, force=False):
+        # Con una carga no reproducible no hay puntos de control (ni ``seek``)
+        if resumable(self.engine):
+            self.timeline.capture(self.engine, force)
+
+    def _advance(self):
+        """Ejecuta los ciclos que tocan según la velocidad y publica si corresponde"""
+        now = time.perf_counter()
+        # Se corre en lotes hasta la próxima instantánea; con velocidad
+        # objetivo, además, solo los ciclos que ya tocaban
+        deadline = self._last_publish + self.snapshot_interval
+        if self.rate is None:
+            due = None
+        else:
+            due = int((now - self._next_cycle) * self.rate) + 1 if now >= self._next_cycle else 0
+
+        ran = 0
+        while self.playing:
+            if self._cycles_left is not None and self._cycles_left <= 0:
+                self.playing = False
+                break
+            if self.engine.finished:
+                self.playing = False
+                break
+            if due is not None and ran >= due:
+                break
+            if ran and time.perf_counter() >= deadline:
+                break
+            if due is None and self.engine.event_driven:
+                # Sin velocidad objetivo se salta directo al próximo evento
+                cycles = self.engine.advance(self._cycles_left)
+            else:
+                self.engine.step()
+                cycles = 1
+            ran += cycles
+            if self._cycles_left is not None:
+                self._cycles_left -= cycles
+
+        if due is not None:
+            self._next_cycle += ran / self.rate
+        if ran:
+            self._capture()
+        if ran and (not self.playing or time.perf_counter() - self._last_publish >= self.snapshot_interval):
+            self._publish()
+
+    def _fail(self, error):
+        """Pausa y entrega ``error`` a la interfaz en lugar de terminar el hilo"""
+        self.playing = False
+        self.errors.put(error)
+        self._publish()
+
+    def _run(self):
+        while True:
+            if self.playing:
+                if self.rate is None:
+                    timeout = 0
+                else:
+                    timeout = max(0.0, self._next_cycle - time.perf_counter())
+            else:
+                timeout = None  # en pausa solo se esperan órdenes
+            try:
+                command, argument = self._commands.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                try:
+                    if not self._handle(command, argument):
+                        return
+                except Exception as error:
+                    self._fail(error)
+                continue
+            try:
+                self._advance()
+            except Exception as error:
+                self._fail(error)
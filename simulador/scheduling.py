@@ -0,0 +1,271 @@
+"""Políticas de planificación de CPU con colas de procesos listos.
+
+Cada política mantiene su propia cola (``deque`` para FCFS/Round Robin,
+montículos para SJF/SRTF/prioridad), de modo que encolar y despachar cuestan
+O(1) u O(log n) aunque haya decenas de miles de procesos listos.
+
+El motor usa la política así:
+
+* ``push(row)`` cuando un proceso pasa a READY;
+* ``pop()`` para elegir el siguiente proceso de un núcleo libre;
+* ``quantum(row)`` da la porción de tiempo del despacho (``None`` = sin límite)
+  y ``expired(row)`` avisa que la agotó;
+* ``preempts(row)`` indica si el primero de la cola debe expulsar a ``row``
+  (solo se consulta en políticas expropiativas);
+* ``next_event(cycle)`` anuncia el próximo ciclo en que ``on_cycle`` cambia
+  la cola por su cuenta, para que el motor por eventos no se lo salte.
+
+En el modelo planificado ``execution_cycle`` es la ráfaga de CPU de un
+proceso antes de pedir E/S y ``execution_time`` el total de CPU que necesita.
+"""
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+def derived_quantum(table, percentile=80):
+    """Quantum que cubre el ``percentile`` % de las ráfagas (``execution_cycle``) de la carga"""
+    bursts = table.column("execution_cycle")
+    if not len(bursts):
+        return 1
+    return max(1, int(np.ceil(np.percentile(bursts, percentile))))
+
+
+class SchedulingPolicy:
+    name = ""
+    preemptive = False
+
+    def __init__(self):
+        self.table = None
+
+    def attach(self, table):
+        """Asocia la política a la tabla de procesos del motor y vacía la cola"""
+        self.table = table
+        self.clear()
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def push(self, row):
+        raise NotImplementedError
+
+    def pop(self):
+        """Siguiente proceso a despachar, o ``None`` si la cola está vacía"""
+        raise NotImplementedError
+
+    def quantum(self, row):
+        return None
+
+    def expired(self, row):
+        pass
+
+    def preempts(self, row):
+        return False
+
+    def on_cycle(self, cycle):
+        """Se llama al inicio de cada ciclo planificado"""
+
+    def next_event(self, cycle):
+        """Próximo ciclo posterior a ``cycle`` en que ``on_cycle`` cambia la cola, o ``None``"""
+        return None
+
+
+class FCFS(SchedulingPolicy):
+    """Primero en llegar, primero en ser atendido"""
+
+    name = "FCFS"
+
+    def clear(self):
+        self._queue = deque()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, row):
+        self._queue.append(row)
+
+    def pop(self):
+        return self._queue.popleft() if self._queue else None
+
+
+class RoundRobin(FCFS):
+    """FCFS con porción de tiempo fija; al agotarla el proceso vuelve al final de la cola.
+
+    Sin ``quantum`` explícito se deriva de ``execution_cycle`` con
+    ``derived_quantum`` en el primer despacho (con cargas que llegan con el
+    tiempo, la tabla está vacía al asociar la política).
+    """
+
+    name = "Round Robin"
+
+    def __init__(self, quantum=None):
+        super().__init__()
+        self.fixed_quantum = quantum
+        self._quantum = quantum
+
+    def attach(self, table):
+        super().attach(table)
+        self._quantum = self.fixed_quantum
+
+    def quantum(self, row):
+        if self._quantum is None:
+            self._quantum = derived_quantum(self.table)
+        return self._quantum
+
+
+class _HeapPolicy(SchedulingPolicy):
+    """Cola ordenada por ``key(row)``; los empates se resuelven por orden de llegada"""
+
+    def clear(self):
+        self._heap = []
+        self._order = 0  # orden de llegada del próximo proceso encolado
+
+    def __len__(self):
+        return len(self._heap)
+
+    def key(self, row):
+        raise NotImplementedError
+
+    def push(self, row):
+        heapq.heappush(self._heap, (self.key(row), self._order, row))
+        self._order += 1
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2] if self._heap else None
+
+    def preempts(self, row):
+        return bool(self._heap) and self._heap[0][0] < self.key(row)
+
+
+class SJF(_HeapPolicy):
+    """Ráfaga más corta primero (la ráfaga de CPU pendiente, ``burst_left``)"""
+
+    name = "SJF"
+
+    def key(self, row):
+        return int(self.table.burst_left[row])
+
+
+class SRTF(SJF):
+    """SJF expropiativo: un proceso con ráfaga restante menor expulsa al que corre"""
+
+    name = "SRTF"
+    preemptive = True
+
+
+class PriorityScheduling(_HeapPolicy):
+    """Por prioridad ("Alta" < "Media" < "Baja"), opcionalmente expropiativa"""
+
+    name = "Prioridad"
+
+    def __init__(self, preemptive=False):
+        super().__init__()
+        self.preemptive = preemptive
+
+    def key(self, row):
+        return int(self.table.priority[row])
+
+
+class MultilevelFeedbackQueue(SchedulingPolicy):
+    """Colas multinivel con realimentación.
+
+    Los procesos entran al nivel 0; agotar el quantum los baja un nivel y
+    cada nivel duplica el quantum del anterior. Cada ``boost_interval``
+    ciclos todos vuelven al nivel 0 para evitar la inanición.
+    """
+
+    name = "MLFQ"
+    preemptive = True
+
+    def __init__(self, levels=3, base_quantum=None, boost_interval=100):
+        super().__init__()
+        self.levels = levels
+        self.fixed_quantum = base_quantum
+        self.boost_interval = boost_interval
+        self.base_quantum = base_quantum
+
+    def attach(self, table):
+        super().attach(table)
+        self.base_quantum = self.fixed_quantum
+
+    def clear(self):
+        self._queues = [deque() for _ in range(self.levels)]
+        self._level = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, row):
+        self._queues[self._level.setdefault(row, 0)].append(row)
+        self._count += 1
+
+    def pop(self):
+        for queue in self._queues:
+            if queue:
+                self._count -= 1
+                return queue.popleft()
+        return None
+
+    def quantum(self, row):
+        if self.base_quantum is None:
+            self.base_quantum = max(1, derived_quantum(self.table) // 2)
+        return self.base_quantum << self._level.get(row, 0)
+
+    def expired(self, row):
+        self._level[row] = min(self._level.get(row, 0) + 1, self.levels - 1)
+
+    def preempts(self, row):
+        level = self._level.get(row, 0)
+        return any(self._queues[higher] for higher in range(level))
+
+    def on_cycle(self, cycle):
+        if self.boost_interval and cycle % self.boost_interval == 0:
+            queued = [row for queue in self._queues for row in queue]
+            self.clear()
+            for row in queued:
+                self.push(row)
+
+    def next_event(self, cycle):
+        if not self.boost_interval:
+            return None
+        return (cycle // self.boost_interval + 1) * self.boost_interval
+
+
+SCHEDULERS = {
+    "FCFS": FCFS,
+    "SJF": SJF,
+    "SRTF": SRTF,
+    "PRIORITY": PriorityScheduling,
+    "PRIORITY_PREEMPTIVE": lambda **options: PriorityScheduling(preemptive=True, **options),
+    "RR": RoundRobin,
+    "MLFQ": MultilevelFeedbackQueue,
+}
+
+
+def make_scheduler(name, **options):
+    """Crea una política por nombre (ver ``SCHEDULERS``); ``None`` es el modelo original"""
+    if name is None:
+        return None
+    try:
+        factory = SCHEDULERS[name]
+    except KeyError:
+        raise ValueError(f"Política de planificación desconocida: {name}") from None
+    return factory(**options)
+
+
+# Nombres que eligen el modelo original desde la línea de comandos
+ORIGINAL_NAMES = ("none", "original")
+
+
+def scheduler_name(text):
+    """Nombre de política leído de la línea de comandos; ``none`` u ``original`` dan ``None``"""
+    if text.lower() in ORIGINAL_NAMES:
+        return None
+    if text not in SCHEDULERS:
+        raise ValueError(f"Política de planificación desconocida: {text}")
+    return text
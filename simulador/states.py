@@ -0,0 +1,43 @@
+"""Estados de los procesos y sus códigos numéricos."""
+import numpy as np
+
+PROCESS_STATES = {
+    "NEW": "Nuevo",
+    "READY": "Listo",
+    "RUNNING": "Ejecutando",
+    "WAITING": "Esperando",
+    "TERMINATED": "Terminado"
+}
+
+STATE_NAMES = list(PROCESS_STATES.values())
+
+# Códigos int8 usados en la tabla de procesos (índices de STATE_NAMES)
+NEW, READY, RUNNING, WAITING, TERMINATED = range(len(STATE_NAMES))
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+STATE_COLORS = {
+    "Nuevo": "#BBDEFB",  # Azul claro
+    "Listo": "#C8E6C9",  # Verde claro
+    "Ejecutando": "#4CAF50",  # Verde
+    "Esperando": "#FFECB3",  # Amarillo claro
+    "Terminado": "#FFCDD2"   # Rojo claro
+}
+
+PRIORITIES = ("Alta", "Media", "Baja")
+
+# Rango (mínimo, máximo) de uso de CPU generado según el estado del proceso
+CPU_USAGE_RANGES = {
+    PROCESS_STATES["NEW"]: (1, 10),
+    PROCESS_STATES["READY"]: (5, 15),
+    PROCESS_STATES["RUNNING"]: (70, 100),
+    PROCESS_STATES["WAITING"]: (20, 40),
+    PROCESS_STATES["TERMINATED"]: (0, 0)
+}
+
+# Los mismos rangos indexados por código, para muestrear con NumPy
+CPU_LOW = np.array([CPU_USAGE_RANGES[name][0] for name in STATE_NAMES], dtype=np.int16)
+CPU_HIGH = np.array([CPU_USAGE_RANGES[name][1] for name in STATE_NAMES], dtype=np.int16)
+
+# Transición base de cada estado en un ciclo; RUNNING pasa a TERMINATED
+# en lugar de WAITING cuando ya no queda tiempo de ejecución
+NEXT_STATE = np.array([READY, RUNNING, WAITING, READY, TERMINATED], dtype=np.int8)
@@ -0,0 +1,166 @@
+"""Barridos de parámetros en paralelo, sin interfaz gráfica.
+
+Cada configuración es un diccionario con las claves de ``DEFAULT_CONFIG``;
+``expand_grid`` genera todas las combinaciones de una rejilla y
+``run_sweep`` las simula en un ``ProcessPoolExecutor`` (un proceso por
+núcleo) y devuelve una fila de métricas por configuración.
+
+La carga y las muestras de CPU de cada corrida dependen solo de su ``seed``:
+dos configuraciones con la misma semilla simulan los mismos procesos, y el
+resultado no depende del orden en que el pool ejecute las corridas.
+
+Uso desde la línea de comandos::
+
+    python -m simulador.sweep --scheduler none FCFS RR SRTF --quantum 2 4 8 --cores 1 2 4 --seed 0 1 2
+
+``none`` (u ``original``) es el modelo original sin política (en ``--memory``,
+memoria ilimitada; en ``--devices``, la E/S fija), y ``--quantum`` solo se
+combina con RR y MLFQ, las políticas que lo usan.
+"""
+import argparse
+import csv
+import itertools
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .devices import devices_name, make_devices
+from .engine import SimulationEngine
+from .memory import make_memory, memory_name
+from .metrics import summarize
+from .process_table import ProcessTable
+from .scheduling import make_scheduler, scheduler_name
+from .workload import PoissonWorkload
+
+DEFAULT_CONFIG = {
+    "processes": 1000,     # procesos sintéticos (``ProcessTable.random``)
+    "arrival_rate": None,  # llegadas de Poisson por ciclo; ``None`` = todos en el ciclo 0
+    "scheduler": "FCFS",   # nombre en ``SCHEDULERS``; ``None`` es el modelo original
+    "quantum": None,       # Round Robin y MLFQ (quantum base); ``None`` lo deriva
+    "cores": 1,
+    "threads_per_core": 1,
+    "io_time": 1,
+    "memory": None,        # nombre en ``MEMORY_MANAGERS``; ``None`` = memoria ilimitada
+    "memory_size": 4096,   # MB
+    "devices": None,       # nombres en ``DEVICE_PRESETS`` separados por comas; ``None`` = ``io_time``
+    "seed": 0,
+    "max_cycles": 1_000_000,
+}
+
+# Opción de cada política que recibe ``quantum``
+QUANTUM_OPTIONS = {"RR": "quantum", "MLFQ": "base_quantum"}
+
+
+def expand_grid(**axes):
+    """Todas las combinaciones de los valores de cada eje (un escalar es un eje de un valor)"""
+    names = list(axes)
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in axes.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def drop_unused_quantum(configs):
+    """Anula ``quantum`` en las políticas que no lo usan y quita las corridas que quedan repetidas"""
+    unique = {}
+    for config in configs:
+        if "quantum" in config and config.get("scheduler") not in QUANTUM_OPTIONS:
+            config = {**config, "quantum": None}
+        unique.setdefault(tuple(config.items()), config)
+    return list(unique.values())
+
+
+def make_engine(config):
+    """Motor sin historial de CPU listo para simular ``config``"""
+    config = {**DEFAULT_CONFIG, **config}
+    seed = config["seed"]
+    if config["arrival_rate"] is None:
+        workload = ProcessTable.random(config["processes"], rng=np.random.default_rng([seed, 0]))
+    else:
+        workload = PoissonWorkload(config["arrival_rate"], count=config["processes"], seed=[seed, 0])
+
+    name = config["scheduler"]
+    options = {}
+    if config["quantum"] is not None and name in QUANTUM_OPTIONS:
+        options[QUANTUM_OPTIONS[name]] = config["quantum"]
+    return SimulationEngine(
+        workload,
+        seed=[seed, 1],
+        history_retention=0,
+        scheduler=make_scheduler(name, **options),
+        cores=config["cores"],
+        threads_per_core=config["threads_per_core"],
+        io_time=config["io_time"],
+        memory=make_memory(config["memory"], size=config["memory_size"]),
+        devices=make_devices(config["devices"]),
+    )
+
+
+def run_config(config):
+    """Simula ``config`` hasta que todos terminan (o ``max_cycles``) y devuelve sus métricas"""
+    max_cycles = {**DEFAULT_CONFIG, **config}["max_cycles"]
+    engine = make_engine(config)
+    while not engine.finished and engine.cycle_count < max_cycles:
+        engine.advance(max_cycles - engine.cycle_count)
+    return {**config, **summarize(engine)}
+
+
+def run_sweep(configs, max_workers=None):
+    """Ejecuta todas las configuraciones en paralelo; las filas salen en el orden de ``configs``.
+
+    Con ``max_workers=1`` se ejecutan en este mismo proceso.
+    """
+    configs = list(configs)
+    if max_workers == 1:
+        return [run_config(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_config, configs))
+
+
+def write_csv(rows, file):
+    """Escribe la tabla de resultados como CSV en ``file`` (un archivo abierto)"""
+    columns = list(dict.fromkeys(name for row in rows for name in row))
+    writer = csv.DictWriter(file, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros del simulador")
+    parser.add_argument("--processes", type=int, nargs="+", default=[DEFAULT_CONFIG["processes"]])
+    parser.add_argument("--arrival-rate", type=float, nargs="+", default=[None])
+    parser.add_argument("--scheduler", type=scheduler_name, nargs="+", default=[DEFAULT_CONFIG["scheduler"]],
+                        help="políticas; none u original es el modelo original")
+    parser.add_argument("--quantum", type=int, nargs="+", default=[None], help="solo para RR y MLFQ")
+    parser.add_argument("--cores", type=int, nargs="+", default=[DEFAULT_CONFIG["cores"]])
+    parser.add_argument("--threads-per-core", type=int, nargs="+", default=[DEFAULT_CONFIG["threads_per_core"]])
+    parser.add_argument("--io-time", type=int, nargs="+", default=[DEFAULT_CONFIG["io_time"]])
+    parser.add_argument("--memory", type=memory_name, nargs="+", default=[DEFAULT_CONFIG["memory"]],
+                        help="gestores de memoria; none u original es memoria ilimitada")
+    parser.add_argument("--memory-size", type=int, nargs="+", default=[DEFAULT_CONFIG["memory_size"]])
+    parser.add_argument("--devices", type=devices_name, nargs="+", default=[DEFAULT_CONFIG["devices"]],
+                        help="dispositivos de E/S separados por comas, p. ej. DISK_SCAN,NETWORK; "
+                             "none u original es la E/S fija")
+    parser.add_argument("--seed", type=int, nargs="+", default=[DEFAULT_CONFIG["seed"]])
+    parser.add_argument("--max-cycles", type=int, default=DEFAULT_CONFIG["max_cycles"])
+    parser.add_argument("--workers", type=int, default=None, help="procesos del pool (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+
+    configs = drop_unused_quantum(expand_grid(
+        processes=args.processes,
+        arrival_rate=args.arrival_rate,
+        scheduler=args.scheduler,
+        quantum=args.quantum,
+        cores=args.cores,
+        threads_per_core=args.threads_per_core,
+        io_time=args.io_time,
+        memory=args.memory,
+        memory_size=args.memory_size,
+        devices=args.devices,
+        seed=args.seed,
+        max_cycles=args.max_cycles,
+    ))
+    write_csv(run_sweep(configs, args.workers), sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Cargas de trabajo que llegan con el tiempo.
+
+Una ``Workload`` es una fuente reiniciable de procesos: cada vez que se
+itera produce, de forma perezosa, bloques de columnas (diccionarios listos
+para ``ProcessTable.append_columns``) ordenados por ``arrival``. El motor
+solo consume el bloque siguiente cuando llega su primer proceso, así que una
+carga puede ser infinita o venir de una traza de varios GB.
+
+* ``SyntheticWorkload``: ``count`` procesos sintéticos que llegan juntos.
+* ``PoissonWorkload``: llegadas de Poisson con tasa fija.
+* ``BurstyWorkload``: alterna periodos de ráfaga y de calma (Poisson modulado).
+* ``TraceWorkload``: reproduce una traza CSV o JSONL leída con ``mmap``.
+
+Las cargas sintéticas sin ``seed`` sortean una semilla al construirse, así
+que también se repiten igual en cada iteración.
+"""
+import csv
+import io
+import itertools
+import json
+import mmap
+import os
+
+import numpy as np
+
+from .process_table import random_columns
+from .states import PRIORITIES
+
+
+class Workload:
+    """Fuente de procesos; cada iteración empieza desde el principio.
+
+    ``reproducible`` indica que cada iteración produce exactamente los
+    mismos bloques, que es lo que necesitan los puntos de control para
+    retomar la carga; las subclases que no lo garantizan lo dejan en False.
+    """
+
+    reproducible = False
+
+    def __iter__(self):
+        raise NotImplementedError
+
+
+def _fixed_seed(seed):
+    """``seed``, o una semilla concreta nueva si es ``None`` (así la carga es reproducible)"""
+    return np.random.SeedSequence().entropy if seed is None else seed
+
+
+class SyntheticWorkload(Workload):
+    """``count`` procesos como los de ``ProcessTable.random``, todos en el ciclo ``start``"""
+
+    reproducible = True
+
+    def __init__(self, count, seed=None, start=0, chunk_size=4096):
+        self.count = count
+        self.seed = _fixed_seed(seed)
+        self.start = start
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        rng = np.random.default_rng(self.seed)
+        for first in range(0, self.count, self.chunk_size):
+            size = min(self.chunk_size, self.count - first)
+            columns = random_columns(size, rng, first_pid=first + 1)
+            columns["arrival"] = np.full(size, self.start, dtype=np.int64)
+            yield columns
+
+
+class PoissonWorkload(Workload):
+    """``rate`` llegadas por ciclo en promedio (tiempos entre llegadas exponenciales).
+
+    Con ``count=None`` la carga no termina nunca. Los demás atributos se
+    sortean como en ``ProcessTable.random``; con la misma ``seed`` cada
+    iteración produce exactamente los mismos procesos.
+    """
+
+    reproducible = True
+
+    def __init__(self, rate, count=None, seed=None, start=0, chunk_size=4096):
+        if rate <= 0:
+            raise ValueError("rate debe ser positiva")
+        self.rate = rate
+        self.count = count
+        self.seed = _fixed_seed(seed)
+        self.start = start
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        rng = np.random.default_rng(self.seed)
+        clock = float(self.start)
+        produced = 0
+        while self.count is None or produced < self.count:
+            size = self.chunk_size if self.count is None else min(self.chunk_size, self.count - produced)
+            times = clock + np.cumsum(rng.exponential(1 / self.rate, size=size))
+            clock = float(times[-1])
+            columns = random_columns(size, rng, first_pid=produced + 1)
+            columns["arrival"] = np.floor(times).astype(np.int64)
+            produced += size
+            yield columns
+
+
+class BurstyWorkload(Workload):
+    """Llegadas que alternan ráfagas (``burst_rate``) y calma (``rate``).
+
+    La duración de cada periodo es exponencial con media ``burst_length``
+    o ``gap_length`` ciclos.
+    """
+
+    reproducible = True
+
+    def __init__(self, rate, burst_rate, burst_length=20, gap_length=100, count=None, seed=None,
+                 start=0, chunk_size=4096):
+        self.rate = rate
+        self.burst_rate = burst_rate
+        self.burst_length = burst_length
+        self.gap_length = gap_length
+        self.count = count
+        self.seed = _fixed_seed(seed)
+        self.start = start
+        self.chunk_size = chunk_size
+
+    def _periods(self, rng):
+        """Llegadas de cada periodo, alternando calma y ráfaga"""
+        clock = float(self.start)
+        for bursting in itertools.cycle((False, True)):
+            length = rng.exponential(self.burst_length if bursting else self.gap_length)
+            rate = self.burst_rate if bursting else self.rate
+            arrivals = np.sort(clock + rng.random(rng.poisson(rate * length)) * length)
+            clock += length
+            yield arrivals
+
+    def __iter__(self):
+        rng = np.random.default_rng(self.seed)
+        produced = 0
+        pending = []
+        buffered = 0
+        for arrivals in self._periods(rng):
+            if self.count is not None:
+                arrivals = arrivals[:self.count - produced - buffered]
+            pending.append(arrivals)
+            buffered += len(arrivals)
+            finished = self.count is not None and produced + buffered >= self.count
+            if buffered < self.chunk_size and not finished:
+                continue
+            times = np.concatenate(pending)
+            pending, buffered = [], 0
+            if len(times):
+                columns = random_columns(len(times), rng, first_pid=produced + 1)
+                columns["arrival"] = np.floor(times).astype(np.int64)
+                produced += len(times)
+                yield columns
+            if finished:
+                return
+
+
+# Campos de una traza: obligatorios ``arrival`` y ``burst`` (CPU total);
+# ``priority`` (nombre o índice), ``memory`` (MB), ``io_interval`` (ciclos de
+# CPU entre pedidos de E/S; 0 o ausente = sin E/S), ``pid``, ``core`` y ``thread``
+TRACE_DEFAULTS = {"priority": 1, "memory": 100, "io_interval": 0, "core": 0, "thread": 0}
+
+
+def _priority_code(value):
+    if isinstance(value, str) and not value.strip().lstrip("-").isdigit():
+        return PRIORITIES.index(value.strip())
+    return int(value)
+
+
+class TraceWorkload(Workload):
+    """Reproduce una traza CSV (con encabezado) o JSONL, ordenada por ``arrival``.
+
+    El archivo se recorre con ``mmap`` de a ``chunk_size`` líneas: solo el
+    bloque en curso ocupa memoria, sin importar el tamaño de la traza.
+    ``format`` es ``"csv"`` o ``"jsonl"``; por defecto se deduce de la extensión.
+    """
+
+    reproducible = True
+
+    def __init__(self, path, format=None, chunk_size=65536):
+        self.path = os.fspath(path)
+        if format is None:
+            format = "jsonl" if self.path.endswith((".jsonl", ".json")) else "csv"
+        if format not in ("csv", "jsonl"):
+            raise ValueError(f"Formato de traza desconocido: {format}")
+        self.format = format
+        self.chunk_size = chunk_size
+
+    def _records(self, lines):
+        """Pares ``(número de línea, campo → texto/valor)``, uno por línea no vacía"""
+        lines = ((number, line.decode("utf-8")) for number, line in enumerate(lines, 1) if line.strip())
+        if self.format == "jsonl":
+            return ((number, json.loads(line)) for number, line in lines)
+        header = next(lines, None)
+        if header is None:
+            return iter(())
+        fields = next(csv.reader(io.StringIO(header[1])))
+        # Un solo lector para todo el archivo; ``current`` guarda la línea que acaba de leer
+        current = [0]
+
+        def texts():
+            for number, line in lines:
+                current[0] = number
+                yield line
+
+        return ((current[0], dict(zip(fields, row))) for row in csv.reader(texts()))
+
+    def _columns(self, records, first_pid):
+        count = len(records)
+
+        def values(name, convert=int):
+            default = TRACE_DEFAULTS.get(name)
+            column = []
+            for number, record in records:
+                value = record.get(name)
+                if value in (None, ""):
+                    if default is None:
+                        raise ValueError(f"Falta el campo {name} en la línea {number} de la traza {self.path}")
+                    value = default
+                try:
+                    column.append(convert(value))
+                except ValueError:
+                    raise ValueError(f"Valor inválido de {name} en la línea {number} de la traza "
+                                     f"{self.path}: {value!r}") from None
+            return column
+
+        burst = np.asarray(values("burst"), dtype=np.int64)
+        io_interval = np.asarray(values("io_interval"), dtype=np.int64)
+        if all(record.get("pid") not in (None, "") for _, record in records):
+            pids = values("pid")
+        else:
+            pids = np.arange(first_pid, first_pid + count)
+        columns = {
+            "pid": np.asarray(pids, dtype=np.int64),
+            "arrival": np.asarray(values("arrival"), dtype=np.int64),
+            "priority": np.asarray(values("priority", _priority_code), dtype=np.int8),
+            "execution_time": burst,
+            "initial_execution_time": burst,
+            "execution_cycle": np.where(io_interval > 0, io_interval, burst),
+            "memory_usage": np.asarray(values("memory"), dtype=np.int64),
+            "core": np.asarray(values("core"), dtype=np.int64),
+            "thread": np.asarray(values("thread"), dtype=np.int64),
+        }
+        if np.any(np.diff(columns["arrival"]) < 0):
+            raise ValueError(f"La traza {self.path} no está ordenada por arrival")
+        return columns
+
+    def __iter__(self):
+        if os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            records = self._records(iter(data.readline, b""))
+            produced = 0
+            last_arrival = None
+            while True:
+                batch = list(itertools.islice(records, self.chunk_size))
+                if not batch:
+                    return
+                columns = self._columns(batch, produced + 1)
+                if last_arrival is not None and columns["arrival"][0] < last_arrival:
+                    raise ValueError(f"La traza {self.path} no está ordenada por arrival")
+                last_arrival = columns["arrival"][-1]
+                produced += len(batch)
+                yield columns
@@ -0,0 +1,142 @@
+"""Puntos de control: reanudar da la misma corrida y ``seek`` vuelve a cualquier ciclo."""
+import os
+import pickle
+import struct
+
+import numpy as np
+import pytest
+
+from simulador.checkpoint import (
+    MAGIC,
+    CheckpointTimeline,
+    capture,
+    dumps,
+    load_checkpoint,
+    loads,
+    save_checkpoint,
+)
+from simulador.cores import PerCoreDispatcher
+from simulador.devices import make_devices
+from simulador.engine import SimulationEngine
+from simulador.memory import make_memory
+from simulador.process_table import COLUMNS
+from simulador.scheduling import make_scheduler
+from simulador.workload import PoissonWorkload
+
+CONFIGS = {
+    "original": dict(),
+    "srtf-paging-disk": dict(scheduler=make_scheduler, policy="SRTF", memory="PAGING_LRU",
+                             devices="DISK_SCAN,NETWORK"),
+    "per-core-buddy": dict(scheduler=lambda name: PerCoreDispatcher(name), policy="MLFQ", memory="BUDDY",
+                           devices="DISK"),
+    "rr-best-fit": dict(scheduler=make_scheduler, policy="RR", memory="BEST_FIT"),
+}
+
+
+def make_engine(scheduler=None, policy=None, memory=None, devices=None):
+    return SimulationEngine(PoissonWorkload(0.3, count=300, seed=1), seed=2, history_retention=256,
+                            history_segments=200, history_summary=True, cores=2,
+                            scheduler=scheduler(policy) if scheduler else None,
+                            memory=make_memory(memory, size=2048), devices=make_devices(devices))
+
+
+def assert_same_state(engine, reference):
+    assert engine.cycle_count == reference.cycle_count
+    for name in COLUMNS:
+        assert np.array_equal(engine.table.column(name), reference.table.column(name)), name
+    assert np.array_equal(engine.time_in_states(), reference.time_in_states())
+    assert engine.memory_stats() == reference.memory_stats()
+    assert engine.device_stats() == reference.device_stats()
+    history, expected = engine.history, reference.history
+    assert history.segment_horizon == expected.segment_horizon
+    for name, column in expected.segments().items():
+        assert np.array_equal(history.segments()[name], column), name
+    for samples, reference_samples in zip(history.cpu_window(), expected.cpu_window()):
+        assert np.array_equal(samples, reference_samples)
+    cycles = engine.cycle_count
+    for values, reference_values in zip(history.summary(0, cycles), expected.summary(0, cycles)):
+        assert np.array_equal(values, reference_values)
+
+
+@pytest.mark.parametrize("config", list(CONFIGS))
+def test_resumed_run_matches_uninterrupted_run(config, tmp_path):
+    engine = make_engine(**CONFIGS[config])
+    engine.run(700)
+    save_checkpoint(engine, tmp_path / "run.ckpt")
+    resumed = load_checkpoint(tmp_path / "run.ckpt")
+    assert vars(resumed).keys() == vars(engine).keys()
+    assert_same_state(resumed, engine)
+    engine.run(1500)
+    resumed.run(1500)
+    assert_same_state(resumed, engine)
+
+
+def test_load_into_engine_keeps_subscribers_and_profiler():
+    source = make_engine(**CONFIGS["srtf-paging-disk"])
+    source.run(300)
+    engine = SimulationEngine(seed=5)
+    seen = []
+    engine.subscribe(seen.append)
+    profiler, reset_count = engine.profiler, engine.reset_count
+    assert loads(dumps(source), engine) is engine
+    assert seen == [engine] and engine.profiler is profiler and engine.reset_count == reset_count + 1
+    assert_same_state(engine, source)
+
+
+def test_capture_shares_closed_segments():
+    engine = make_engine(**CONFIGS["srtf-paging-disk"])
+    engine.run(400)
+    checkpoint = capture(engine)
+    assert checkpoint.arrays["history.segments.row"].base is engine.history._segments["row"]
+    assert checkpoint.arrays["table.state"].base is None  # la tabla cambia en cada ciclo: se copia
+
+
+def test_seek_returns_to_any_cycle():
+    engine = make_engine(**CONFIGS["per-core-buddy"])
+    timeline = CheckpointTimeline(interval=100)
+    timeline.capture(engine, force=True)
+    for _ in range(12):
+        engine.run(50)
+        timeline.capture(engine)
+    assert timeline.cycles == list(range(0, 601, 100))
+    for cycle in (450, 120, 0, 600, 599):
+        timeline.seek(engine, cycle)
+        reference = make_engine(**CONFIGS["per-core-buddy"])
+        reference.run(cycle)
+        assert_same_state(engine, reference)
+
+
+def test_timeline_memory_is_bounded():
+    engine = make_engine(**CONFIGS["rr-best-fit"])
+    timeline = CheckpointTimeline(interval=10, max_bytes=2 * 2 ** 20)
+    for _ in range(100):
+        engine.run(10)
+        timeline.capture(engine)
+    assert timeline.nbytes <= 2 * 2 ** 20
+    assert timeline.interval > 10 and timeline.cycles[0] == 10
+
+
+def test_rejects_other_versions_and_unsafe_objects(tmp_path):
+    engine = make_engine(**CONFIGS["original"])
+    engine.run(50)
+    data = dumps(engine)
+    with pytest.raises(ValueError, match="Versión"):
+        loads(MAGIC + b"\x01" + data[len(MAGIC) + 1:])
+    with pytest.raises(ValueError, match="no es un punto de control"):
+        loads(b"PK\x03\x04" + data)
+
+    # Un pickle de objetos que llama a ``os.system`` no se ejecuta
+    length, = struct.unpack("<I", data[len(MAGIC) + 1:len(MAGIC) + 5])
+    start = len(MAGIC) + 5 + length
+    size, = struct.unpack("<Q", data[start:start + 8])
+
+    class Exploit:
+        def __reduce__(self):
+            return os.system, ("touch " + str(tmp_path / "pwned"),)
+
+    evil = pickle.dumps(Exploit(), protocol=5)
+    forged = data[:start] + struct.pack("<Q", len(evil)) + evil + data[start + 8 + size:]
+    with pytest.raises(pickle.UnpicklingError):
+        loads(forged)
+    assert not (tmp_path / "pwned").exists()
+    assert loads(data).cycle_count == 50
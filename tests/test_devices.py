@@ -0,0 +1,37 @@
+"""Dispositivos de E/S: orden de servicio de las colas."""
+import numpy as np
+
+from simulador.devices import Device
+
+
+def test_scan_sweeps_up_then_down():
+    device = Device("disk", service_time=1, distribution="constant", scheduling="SCAN", tracks=200, seek_time=0)
+    device.attach(np.random.default_rng(0))
+    device.current, device.head = 0, 50
+    for row, track in enumerate([95, 20, 60, 10, 150, 55, 40, 95], start=1):
+        device.queue.push((row, 0, track))
+
+    served = []
+
+    def serve(count):
+        for _ in range(count):
+            row, _ = device.finish(len(served))
+            served.append((row, device.head))
+
+    serve(2)
+    # Un pedido delante del cabezal entra en este barrido; uno detrás, en el de vuelta
+    device.queue.push((9, 2, 70))
+    device.queue.push((10, 2, 58))
+    serve(8)
+    assert served == [(6, 55), (3, 60), (9, 70), (1, 95), (8, 95), (5, 150), (10, 58), (7, 40), (2, 20), (4, 10)]
+    assert device.direction == -1 and not len(device.queue)
+    assert device.finish(len(served)) is None
+
+
+def test_fifo_serves_in_arrival_order():
+    device = Device("disk", service_time=1, distribution="constant", tracks=200, seek_time=0)
+    device.attach(np.random.default_rng(0))
+    device.current = 0
+    for row, track in enumerate([95, 20, 60], start=1):
+        device.queue.push((row, 0, track))
+    assert [device.finish(cycle)[0] for cycle in range(3)] == [1, 2, 3]
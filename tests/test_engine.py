@@ -0,0 +1,73 @@
+"""Comportamiento general de ``SimulationEngine``."""
+import numpy as np
+import pytest
+
+from simulador.devices import make_devices
+from simulador.engine import SimulationEngine
+from simulador.memory import make_memory
+from simulador.metrics import summarize
+from simulador.scheduling import make_scheduler
+from simulador.workload import PoissonWorkload, TraceWorkload
+
+
+@pytest.mark.parametrize("name", ["step", "table", "history", "_live", "cycle_count"])
+def test_configure_rejects_non_options(name):
+    engine = SimulationEngine(seed=1)
+    engine.run(5)
+    with pytest.raises(TypeError):
+        engine.configure(**{name: None})
+    assert engine.cycle_count == 5
+    assert callable(engine.step)
+
+
+def test_configure_changes_options_and_resets():
+    engine = SimulationEngine(seed=1)
+    engine.run(5)
+    engine.configure(scheduler=make_scheduler("RR"), cores=2)
+    assert engine.cycle_count == 0
+    assert engine.cores == 2
+    assert len(engine.slot_busy) == 2
+
+
+def test_failed_configure_keeps_engine(tmp_path):
+    trace = tmp_path / "trace.csv"
+    trace.write_text("arrival,burst,priority\n0,5,Urgente\n")
+    engine = SimulationEngine(seed=1, scheduler=make_scheduler("RR"))
+    engine.run(10)
+    scheduler, table, reset_count = engine.scheduler, engine.table, engine.reset_count
+    with pytest.raises(ValueError):
+        engine.configure(workload=TraceWorkload(trace))
+    assert engine.cycle_count == 10
+    assert engine.scheduler is scheduler and engine.table is table
+    assert engine.reset_count == reset_count
+    engine.run(5)
+    assert engine.cycle_count == 15
+
+
+def test_reset_repeats_the_run():
+    def make():
+        return SimulationEngine(workload=PoissonWorkload(0.3, count=50, seed=2), seed=4,
+                                scheduler=make_scheduler("MLFQ"), cores=2,
+                                memory=make_memory("BUDDY", size=1024), devices=make_devices("DISK_SCAN"))
+
+    engine = make()
+    engine.run(300)
+    engine.configure()
+    engine.run(500)
+    fresh = make()
+    fresh.run(500)
+    assert np.array_equal(engine.time_in_states(), fresh.time_in_states())
+    assert engine.memory_stats() == fresh.memory_stats()
+    assert engine.device_stats() == fresh.device_stats()
+
+
+def test_snapshot_has_the_engine_stats_methods():
+    engine = SimulationEngine(workload=PoissonWorkload(0.3, count=50, seed=2), seed=4,
+                              scheduler=make_scheduler("SRTF"), cores=2,
+                              memory=make_memory("PAGING_CLOCK", size=1024), devices=make_devices("DISK,NETWORK"))
+    engine.run(400)
+    snapshot = engine.snapshot()
+    assert np.array_equal(snapshot.core_utilization(), engine.core_utilization())
+    assert snapshot.memory_stats() == engine.memory_stats()
+    assert snapshot.device_stats() == engine.device_stats()
+    assert summarize(snapshot) == summarize(engine)
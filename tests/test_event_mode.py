@@ -0,0 +1,66 @@
+"""El modo por eventos debe dar exactamente los mismos resultados que avanzar ciclo a ciclo."""
+import numpy as np
+import pytest
+
+from simulador.devices import make_devices
+from simulador.engine import SimulationEngine
+from simulador.memory import MEMORY_MANAGERS, make_memory
+from simulador.process_table import COLUMNS, ProcessTable
+from simulador.scheduling import SCHEDULERS, make_scheduler
+from simulador.workload import PoissonWorkload
+
+CYCLES = 600
+
+
+def make_engine(event_driven, scheduler, memory=None, devices=None, arrivals=False, cores=1,
+                threads_per_core=1, io_time=2):
+    if arrivals:
+        processes = PoissonWorkload(0.2, count=60, seed=3)
+    else:
+        processes = ProcessTable.random(40, rng=np.random.default_rng(3))
+    return SimulationEngine(
+        processes,
+        seed=7,
+        history_retention=CYCLES,  # toda la corrida
+        scheduler=make_scheduler(scheduler),
+        cores=cores,
+        threads_per_core=threads_per_core,
+        io_time=io_time,
+        event_driven=event_driven,
+        memory=make_memory(memory, size=2048),
+        devices=make_devices(devices),
+    )
+
+
+def assert_same_run(**config):
+    step = make_engine(False, **config)
+    event = make_engine(True, **config)
+    step.run(CYCLES)
+    event.run(CYCLES)
+
+    assert event.cycle_count == step.cycle_count
+    for name in COLUMNS:
+        assert np.array_equal(event.table.column(name), step.table.column(name)), name
+    assert np.array_equal(event.time_in_states(), step.time_in_states())
+    event_cycles, event_samples = event.history.cpu_window()
+    step_cycles, step_samples = step.history.cpu_window()
+    assert np.array_equal(event_cycles, step_cycles)
+    assert np.array_equal(event_samples, step_samples)
+
+
+@pytest.mark.parametrize("scheduler", [None, *SCHEDULERS])
+@pytest.mark.parametrize("arrivals", [False, True])
+def test_schedulers(scheduler, arrivals):
+    assert_same_run(scheduler=scheduler, arrivals=arrivals, cores=2, threads_per_core=2)
+
+
+@pytest.mark.parametrize("memory", list(MEMORY_MANAGERS))
+@pytest.mark.parametrize("scheduler", ["FCFS", "RR"])
+def test_memory_managers(memory, scheduler):
+    assert_same_run(scheduler=scheduler, memory=memory, arrivals=True)
+
+
+@pytest.mark.parametrize("devices", ["DISK", "DISK_SCAN,NETWORK"])
+@pytest.mark.parametrize("scheduler", ["SRTF", "MLFQ"])
+def test_devices(devices, scheduler):
+    assert_same_run(scheduler=scheduler, devices=devices, memory="PAGING_LRU", cores=2)
@@ -0,0 +1,28 @@
+"""Exportación por bloques y su análisis fuera de línea."""
+import pytest
+
+from simulador.analysis import analyze
+from simulador.engine import SimulationEngine
+from simulador.export import STATE_KEYS, MetricsExporter
+from simulador.metrics import summarize
+from simulador.scheduling import make_scheduler
+from simulador.workload import PoissonWorkload
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+def test_analysis_of_export_matches_summarize(tmp_path, event_driven):
+    engine = SimulationEngine(PoissonWorkload(0.2, count=400, seed=1), seed=2, history_retention=0,
+                              scheduler=make_scheduler("RR"), cores=2, event_driven=event_driven)
+    exporter = MetricsExporter(tmp_path, chunk_rows=100)  # muchos bloques
+    exporter.attach(engine)
+    engine.run(3000)
+    exporter.close()
+
+    result = analyze(tmp_path)
+    expected = summarize(engine)
+    assert 0 < expected["finished"] < expected["processes"]  # hay procesos vivos al cerrar
+    for name, value in expected.items():
+        assert result[name] == pytest.approx(value), name
+    mean_counts = engine.time_in_states().sum(axis=0) / engine.cycle_count
+    for key, value in zip(STATE_KEYS, mean_counts):
+        assert result[f"mean_{key}"] == pytest.approx(value), key
@@ -0,0 +1,132 @@
+"""``HistoryStore``: segmentos, resumen y búfer de CPU."""
+import numpy as np
+
+from simulador.engine import SimulationEngine
+from simulador.history import NO_STATE, SUMMARY_COLUMNS, HistoryStore
+from simulador.states import TERMINATED
+from simulador.workload import PoissonWorkload
+
+
+def lockstep_engine(cycles, **options):
+    engine = SimulationEngine(PoissonWorkload(0.5, seed=1), seed=2, history_summary=True, **options)
+    engine.run(cycles)
+    return engine
+
+
+def segment_keys(segments):
+    return sorted(zip(*(segments[name].tolist() for name in ("row", "state", "start", "length", "end"))))
+
+
+def test_closed_segments_are_bounded_by_retention():
+    short = lockstep_engine(8_000, history_segments=500)
+    full = lockstep_engine(8_000, history_segments=10 ** 9)
+    history = short.history
+    assert history.segment_horizon > 6_000
+    assert history.segment_count < full.history.segment_count // 4
+    ends = history.closed_segments()["start"] + history.closed_segments()["length"]
+    assert ends.min() > history.segment_horizon
+
+    # Después del horizonte no falta nada
+    start = history.segment_horizon
+    for rows in (None, range(0, 50)):
+        assert (segment_keys(history.segments_between(start, 8_001, rows))
+                == segment_keys(full.history.segments_between(start, 8_001, rows)))
+    for row in (0, len(short.table) // 2, len(short.table) - 1):
+        whole = full.history.state_history(row)
+        tail = history.state_history(row)
+        assert np.array_equal(whole[len(whole) - len(tail):], tail)
+    # Los tiempos y el resumen no dependen de los segmentos conservados
+    assert np.array_equal(short.time_in_states(), full.time_in_states())
+    for kept, reference in zip(history.summary(0, 8_001), full.history.summary(0, 8_001)):
+        assert np.array_equal(kept, reference)
+
+
+def test_summary_is_opt_in():
+    def run(**options):
+        engine = SimulationEngine(PoissonWorkload(0.3, count=2000, seed=1), seed=2, history_retention=64,
+                                  **options)
+        engine.run(9000)
+        return engine
+
+    plain = run()
+    timeline = run(history_summary=True)
+    assert plain.history.summary(0, 9000)[2].size == 0
+    assert timeline.history.summary(0, 9000)[2].size > 0
+    assert plain.history.nbytes < timeline.history.nbytes
+    assert np.array_equal(plain.time_in_states(), timeline.time_in_states())
+    for samples, reference in zip(plain.history.cpu_window(), timeline.history.cpu_window()):
+        assert np.array_equal(samples, reference)
+
+
+def test_snapshot_copies_only_the_requested_cpu_rows():
+    engine = lockstep_engine(3_000, history_retention=256)
+    full = engine.snapshot().history
+    first = np.flatnonzero(full.cpu_window()[1].any(axis=0))[0]  # un proceso que usó la CPU
+    last = first + 8
+    window = engine.snapshot(range(first, last)).history
+    assert window._cpu.shape[1] == np.count_nonzero(engine.history._slot[first:last] >= 0) < full._cpu.shape[1]
+    cycles, samples = window.cpu_window(range(len(engine.table)))
+    reference_cycles, reference = full.cpu_window(range(len(engine.table)))
+    assert np.array_equal(cycles, reference_cycles)
+    assert reference[:, first].any()
+    assert np.array_equal(samples[:, first:last], reference[:, first:last])
+    assert not samples[:, :first].any() and not samples[:, last:].any()
+    # El resto del historial no cambia
+    assert segment_keys(window.segments()) == segment_keys(full.segments())
+    assert np.array_equal(window.state_history(first), full.state_history(first))
+
+
+def test_state_history_rebuilds_every_cycle_from_segments():
+    # 40 procesos que llegan de a poco y cambian de estado al azar (sin terminar)
+    rng = np.random.default_rng(5)
+    cycles, count = 600, 40
+    arrivals = np.sort(rng.integers(0, 200, size=count))
+    changes = rng.random((cycles, count)) < 0.2
+    states = np.where(changes, rng.integers(0, TERMINATED, size=(cycles, count)), -1)
+    states[arrivals, np.arange(count)] = rng.integers(0, TERMINATED, size=count)
+    for cycle in range(1, cycles):
+        keep = states[cycle] < 0
+        states[cycle, keep] = states[cycle - 1, keep]
+
+    store = HistoryStore(retention=0, segment_retention=10 ** 9, summary=True)
+    for cycle in range(cycles):
+        arrived = np.flatnonzero(arrivals == cycle)
+        if arrived.size:
+            store.add_processes(cycle, states[cycle, arrived])
+        store.record(cycle, states[cycle, :store.width], np.zeros(store.width, dtype=np.uint8))
+
+    assert store.segment_count < changes.sum()
+    for row in range(count):
+        assert np.array_equal(store.state_history(row), states[arrivals[row]:, row])
+    # Con tramos de un ciclo el resumen es el estado de cada ciclo
+    first_cycle, bucket, summary, shares = store.summary(0, cycles)
+    assert (first_cycle, bucket) == (0, 1)
+    expected = np.where(np.arange(cycles - 1)[:, None] >= arrivals, states[:-1], NO_STATE).T
+    assert np.array_equal(summary, expected)
+    assert np.array_equal(shares, np.where(expected == NO_STATE, 0, 255))
+
+
+def test_summary_coarsening_merges_column_pairs():
+    engine = SimulationEngine(PoissonWorkload(0.5, count=300, seed=3), seed=4, history_retention=0,
+                              history_summary=True)
+    while engine.history.summary_columns < SUMMARY_COLUMNS - 2:
+        engine.run(1)
+    before = engine.snapshot().history
+    engine.run(8)
+    history = engine.history
+    assert history.summary_bucket == 2 and history.summary_columns < SUMMARY_COLUMNS // 2 + 4
+    assert np.any(history._slot[:history.width] < 0)  # hay procesos retirados
+
+    _, _, left, left_share = before.summary(0, SUMMARY_COLUMNS - 2)
+    _, _, merged, merged_share = history.summary(0, SUMMARY_COLUMNS - 2)
+    left, right = left[:, 0::2], left[:, 1::2]
+    left_share, right_share = left_share[:, 0::2].astype(int), left_share[:, 1::2].astype(int)
+    # Gana la mitad con mayor fracción (la primera si empatan); si coinciden se promedian
+    assert np.array_equal(merged, np.where(right_share > left_share, right, left))
+    assert np.array_equal(merged_share, np.where(left == right, left_share + right_share,
+                                                 np.maximum(left_share, right_share)) // 2)
+
+    # El resumen ocupa lo mismo por larga que sea la corrida
+    engine.run(20_000)
+    assert history.summary_bucket == 32
+    assert history._summary_state.shape[1] == SUMMARY_COLUMNS
@@ -0,0 +1,130 @@
+"""Gestores de memoria: ajustes, compañeros y reemplazo de páginas."""
+import numpy as np
+import pytest
+
+from simulador.memory import REPLACEMENTS, BuddyMemory, ContiguousMemory, PagedMemory
+from simulador.process_table import ProcessTable
+
+
+def attached(memory, sizes):
+    """``memory`` asociado a una tabla con un proceso por tamaño de ``sizes`` (fila = posición)"""
+    table = ProcessTable()
+    table.append_columns(pid=np.arange(1, len(sizes) + 1), memory_usage=np.array(sizes))
+    memory.attach(table)
+    return memory
+
+
+def count_faults(replacement, references, frames):
+    pages = REPLACEMENTS[replacement](max(references) + 1, frames)
+    faults = 0
+    for index, page in enumerate(references):
+        if pages.resident[page]:
+            pages.touch(np.array([page]), np.array([index]))
+        else:
+            faults += 1
+            pages.load(page, index)
+    return faults
+
+
+def with_holes(fit):
+    """Memoria de 100 MB con huecos de 30 MB en 10, 20 MB en 50 y 20 MB en 80"""
+    memory = attached(ContiguousMemory(100, fit), [10, 30, 10, 20, 10, 15, 20])
+    for row in range(5):
+        assert memory.allocate(row)
+    memory.free(1)
+    memory.free(3)
+    return memory
+
+
+@pytest.mark.parametrize("fit, start", [("first", 10), ("best", 50), ("worst", 10)])
+def test_fit_chooses_hole(fit, start):
+    memory = with_holes(fit)
+    assert memory.allocate(5)
+    assert memory.allocations[5] == (start, 15)
+    assert memory.used() == 45
+
+
+def test_best_fit_prefers_lowest_address_among_equal_holes():
+    memory = with_holes("best")
+    assert memory.allocate(6)
+    assert memory.allocations[6] == (50, 20)
+
+
+def test_worst_fit_waits_when_no_hole_is_large_enough():
+    memory = attached(ContiguousMemory(100, "worst"), [40, 40, 30])
+    assert memory.allocate(0) and memory.allocate(1)
+    assert not memory.allocate(2)
+    memory.free(0)
+    assert memory.allocate(2)
+    assert memory.allocations[2] == (0, 30)
+
+
+def test_freed_holes_coalesce():
+    memory = with_holes("first")
+    assert memory.external_fragmentation() == pytest.approx(1 - 30 / 70)
+    memory.free(0)
+    memory.free(2)
+    assert memory.blocks.by_start == {0: 70, 80: 20}
+    assert memory.external_fragmentation() == pytest.approx(1 - 70 / 90)
+    memory.free(4)
+    assert memory.blocks.by_start == {0: 100}
+    assert memory.used() == 0 and memory.external_fragmentation() == 0.0
+
+
+def test_fit_search_survives_many_allocations():
+    rng = np.random.default_rng(3)
+    sizes = rng.integers(1, 40, size=2000)
+    for fit in ContiguousMemory.FITS:
+        memory = attached(ContiguousMemory(1024, fit), sizes)
+        live = []
+        for row in range(len(sizes)):
+            if live and rng.random() < 0.5:
+                memory.free(live.pop(int(rng.integers(len(live)))))
+            if memory.allocate(row):
+                live.append(row)
+        # Los huecos no se solapan con lo reservado y suman lo libre
+        spans = sorted(list(memory.allocations.values()) + list(memory.blocks.by_start.items()))
+        assert all(start + size == following for (start, size), (following, _) in zip(spans, spans[1:]))
+        assert sum(memory.blocks.by_start.values()) == memory.size - memory.used()
+
+
+def test_buddy_splits_and_merges_on_non_power_of_two_size():
+    memory = attached(BuddyMemory(12), [3, 2, 1, 9, 8])
+    assert [memory.free_lists[order] for order in range(4)] == [set(), set(), {8}, {0}]
+    for row in range(3):
+        assert memory.allocate(row)
+    assert [memory.allocations[row] for row in range(3)] == [(8, 2), (0, 1), (2, 0)]
+    assert [memory.free_lists[order] for order in range(4)] == [{3}, set(), {4}, set()]
+    assert memory.internal_fragmentation() == pytest.approx(1 - 6 / 7)
+    for row in (1, 2, 0):
+        memory.free(row)
+    # Los bloques de 8 y 4 MB nunca se fusionan entre sí
+    assert [memory.free_lists[order] for order in range(4)] == [set(), set(), {8}, {0}]
+    assert memory.used() == 0
+
+
+def test_fits_rejects_processes_larger_than_memory():
+    sizes = [9, 8, 13, 12]
+    assert [attached(BuddyMemory(12), sizes).fits(row) for row in range(4)] == [False, True, False, False]
+    assert [attached(ContiguousMemory(12), sizes).fits(row) for row in range(4)] == [True, True, False, True]
+    # Con paginación basta con que quepan los marcos residentes
+    paged = attached(PagedMemory(16, page_size=4, resident_fraction=0.25), [64, 80])
+    assert [paged.fits(row) for row in range(2)] == [True, False]
+
+
+BELADY = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+CLASSIC = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+
+@pytest.mark.parametrize("replacement, references, frames, faults", [
+    ("FIFO", BELADY, 3, 9),
+    ("FIFO", BELADY, 4, 10),
+    ("FIFO", CLASSIC, 3, 15),
+    ("LRU", BELADY, 3, 10),
+    ("LRU", BELADY, 4, 8),
+    ("LRU", CLASSIC, 3, 12),
+    ("CLOCK", BELADY, 3, 9),
+    ("CLOCK", CLASSIC, 3, 14),
+])
+def test_page_faults(replacement, references, frames, faults):
+    assert count_faults(replacement, references, frames) == faults
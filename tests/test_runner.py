@@ -0,0 +1,45 @@
+"""``SimulationRunner``: órdenes en el hilo de trabajo."""
+import time
+
+from simulador.engine import SimulationEngine
+from simulador.runner import SimulationRunner
+from simulador.workload import PoissonWorkload, TraceWorkload, Workload
+
+
+class UnseededWorkload(Workload):
+    """Carga que no garantiza repetirse (no se puede guardar)"""
+
+    def __iter__(self):
+        yield from PoissonWorkload(0.2, count=20, seed=1)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+
+
+def test_failed_commands_keep_the_thread_alive(tmp_path):
+    garbage = tmp_path / "garbage.ckpt"
+    garbage.write_bytes(b"no es un punto de control")
+    trace = tmp_path / "trace.csv"
+    trace.write_text("arrival,burst,priority\n0,5,Urgente\n")
+    runner = SimulationRunner(SimulationEngine(seed=1), rate=None)
+    runner.start()
+    try:
+        runner.step(10)
+        runner.load(garbage)
+        runner.configure(workload=TraceWorkload(trace))
+        runner.configure(workload=UnseededWorkload())
+        runner.save(tmp_path / "unseeded.ckpt")
+        errors = []
+        wait_for(lambda: errors.extend(runner.pending_errors()) or len(errors) == 3)
+        assert all(isinstance(error, ValueError) for error in errors)
+        assert runner._thread.is_alive()
+
+        runner.step(5)
+        wait_for(lambda: runner.engine.cycle_count == 5)
+        assert not (tmp_path / "unseeded.ckpt").exists()
+    finally:
+        runner.stop()
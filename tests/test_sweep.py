@@ -0,0 +1,14 @@
+"""Barridos desde la línea de comandos."""
+import csv
+import io
+
+from simulador.sweep import main
+
+
+def test_none_and_original_mean_the_original_model(capsys):
+    main(["--processes", "20", "--memory", "none", "FIRST_FIT", "--devices", "original", "DISK_SCAN,NETWORK",
+          "--workers", "1"])
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [(row["memory"], row["devices"]) for row in rows] == [
+        ("", ""), ("", "DISK_SCAN,NETWORK"), ("FIRST_FIT", ""), ("FIRST_FIT", "DISK_SCAN,NETWORK")]
+    assert all(row["finished"] == "20" for row in rows)
@@ -0,0 +1,85 @@
+"""Cargas de trabajo: lectura de trazas."""
+import numpy as np
+import pytest
+
+from simulador.workload import TraceWorkload
+
+
+@pytest.mark.parametrize("name, text, line", [
+    ("trace.csv", "arrival,burst,priority\n0,5,Alta\n\n3,4,Urgente\n", 4),
+    ("trace.jsonl", '{"arrival": 0, "burst": 5}\n\n{"arrival": 3, "burst": 4, "priority": "Urgente"}\n', 3),
+])
+def test_unknown_priority_names_trace_line_and_value(tmp_path, name, text, line):
+    trace = tmp_path / name
+    trace.write_text(text)
+    with pytest.raises(ValueError, match=rf"priority en la línea {line} de la traza .*trace.*: 'Urgente'"):
+        list(TraceWorkload(trace))
+
+
+CSV_TRACE = """arrival,burst,priority,memory,io_interval
+0,5,Alta,,
+0,7,2,64,3
+
+4,2,Media,32,0
+9,6,,,2
+"""
+
+JSONL_TRACE = """{"arrival": 0, "burst": 5, "priority": "Alta"}
+{"arrival": 0, "burst": 7, "priority": 2, "memory": 64, "io_interval": 3}
+
+{"arrival": 4, "burst": 2, "priority": "Media", "memory": 32, "io_interval": 0}
+{"arrival": 9, "burst": 6, "io_interval": 2}
+"""
+
+
+@pytest.mark.parametrize("name, text", [("trace.csv", CSV_TRACE), ("trace.jsonl", JSONL_TRACE)])
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_trace_columns(tmp_path, name, text, chunk_size):
+    trace = tmp_path / name
+    trace.write_text(text)
+    chunks = list(TraceWorkload(trace, chunk_size=chunk_size))
+    assert [len(chunk["pid"]) for chunk in chunks] == [min(chunk_size, 4 - start) for start in range(0, 4, chunk_size)]
+    columns = {name: np.concatenate([chunk[name] for chunk in chunks]).tolist() for name in chunks[0]}
+    assert columns == {
+        "pid": [1, 2, 3, 4],
+        "arrival": [0, 0, 4, 9],
+        "priority": [0, 2, 1, 1],
+        "execution_time": [5, 7, 2, 6],
+        "initial_execution_time": [5, 7, 2, 6],
+        "execution_cycle": [5, 3, 2, 2],
+        "memory_usage": [100, 64, 32, 100],
+        "core": [0, 0, 0, 0],
+        "thread": [0, 0, 0, 0],
+    }
+
+
+def test_trace_pids_are_kept_when_given(tmp_path):
+    trace = tmp_path / "trace.csv"
+    trace.write_text("pid,arrival,burst\n10,0,1\n20,1,1\n")
+    assert next(iter(TraceWorkload(trace)))["pid"].tolist() == [10, 20]
+
+
+@pytest.mark.parametrize("text", ["", "arrival,burst\n"])
+def test_empty_trace_has_no_processes(tmp_path, text):
+    trace = tmp_path / "trace.csv"
+    trace.write_text(text)
+    assert list(TraceWorkload(trace)) == []
+
+
+@pytest.mark.parametrize("chunk_size", [2, 100])
+def test_out_of_order_trace_is_rejected(tmp_path, chunk_size):
+    # Con bloques de 2 el desorden cae entre dos bloques
+    trace = tmp_path / "trace.csv"
+    trace.write_text("arrival,burst\n0,1\n5,1\n3,1\n7,1\n")
+    workload = iter(TraceWorkload(trace, chunk_size=chunk_size))
+    if chunk_size == 2:
+        assert next(workload)["arrival"].tolist() == [0, 5]
+    with pytest.raises(ValueError, match="no está ordenada por arrival"):
+        next(workload)
+
+
+def test_missing_required_field_names_trace_and_line(tmp_path):
+    trace = tmp_path / "trace.csv"
+    trace.write_text("arrival,burst\n0,1\n2,\n")
+    with pytest.raises(ValueError, match="Falta el campo burst en la línea 3"):
+        list(TraceWorkload(trace))
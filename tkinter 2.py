@@ -1,43 +1,284 @@
-import tkinter as tk
-from tkinter import ttk
-import random
+import os
 import time
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from collections import defaultdict
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+# Antes de importar NumPy y el simulador, que es lo pesado del arranque:
+# ``ui.imports`` mide esos imports y ``ui.startup`` todo hasta la ventana lista
+STARTED = time.perf_counter()
+
+# matplotlib (y ``simulador.charts``) se importa recién al crear el primer
+# gráfico, cuando se muestra su pestaña: la ventana aparece sin esperarlo
+from simulador import (PRIORITIES, PROCESS_STATES, STATE_COLORS, STATE_NAMES, BurstyWorkload,  # noqa: E402
+                       PoissonWorkload, ProcessView, SimulationEngine, SimulationRunner,
+                       SyntheticWorkload, TraceWorkload)
+from simulador.devices import make_devices  # noqa: E402
+from simulador.memory import make_memory  # noqa: E402
+from simulador.profiling import CYCLES, FRAMES, Profiler  # noqa: E402
+from simulador.scheduling import make_scheduler  # noqa: E402
+
+IMPORTED = time.perf_counter()
+
+# Velocidades de reproducción (ciclos por segundo); None es lo más rápido posible
+SIMULATION_RATES = {
+    "1 ciclo/s": 1,
+    "2 ciclos/s": 2,
+    "10 ciclos/s": 10,
+    "100 ciclos/s": 100,
+    "1000 ciclos/s": 1000,
+    "Máxima": None
+}
+
+# Políticas de planificación disponibles (None es el modelo original en paralelo)
+SCHEDULER_OPTIONS = {
+    "Original": None,
+    "FCFS": "FCFS",
+    "SJF": "SJF",
+    "SRTF": "SRTF",
+    "Prioridad": "PRIORITY",
+    "Prioridad expropiativa": "PRIORITY_PREEMPTIVE",
+    "Round Robin": "RR",
+    "MLFQ": "MLFQ"
+}
+
+# Cargas de trabajo disponibles (None son los tres procesos iniciales)
+WORKLOAD_OPTIONS = {
+    "Tres procesos": None,
+    "10 000 procesos": lambda: SyntheticWorkload(10_000),
+    "Llegadas Poisson": lambda: PoissonWorkload(0.5),
+    "Llegadas en ráfagas": lambda: BurstyWorkload(0.05, 3.0)
+}
 
-PROCESS_STATES = {
-    "NEW": "Nuevo",
-    "READY": "Listo",
-    "RUNNING": "Ejecutando",
-    "WAITING": "Esperando",
-    "TERMINATED": "Terminado"
+# Gestores de memoria (None es memoria ilimitada; solo se usan con un planificador)
+MEMORY_OPTIONS = {
+    "Ilimitada": None,
+    "Primer ajuste": "FIRST_FIT",
+    "Mejor ajuste": "BEST_FIT",
+    "Peor ajuste": "WORST_FIT",
+    "Buddy": "BUDDY",
+    "Paginación FIFO": "PAGING_FIFO",
+    "Paginación LRU": "PAGING_LRU",
+    "Paginación reloj": "PAGING_CLOCK"
 }
 
-STATE_COLORS = {
-    "Nuevo": "#BBDEFB",  # Azul claro
-    "Listo": "#C8E6C9",  # Verde claro
-    "Ejecutando": "#4CAF50",  # Verde
-    "Esperando": "#FFECB3",  # Amarillo claro
-    "Terminado": "#FFCDD2"   # Rojo claro
+# Dispositivos de E/S (None es la espera fija de un ciclo; solo con un planificador)
+DEVICE_OPTIONS = {
+    "Fija (1 ciclo)": None,
+    "Disco FIFO": "DISK",
+    "Disco SCAN": "DISK_SCAN",
+    "Disco SCAN + red": "DISK_SCAN,NETWORK"
 }
 
-class Process:
-    def __init__(self, id, priority, execution_time, execution_cycle):
-        self.id = id
-        self.priority = priority
-        self.execution_time = execution_time
-        self.execution_cycle = execution_cycle
-        self.initial_execution_time = execution_time  # Para seguimiento del progreso
-        self.current_state = PROCESS_STATES["NEW"]
-        self.memory_usage = random.randint(100, 600)  # 100-600 MB
-        self.core = random.randint(0, 3)  # 0-3 núcleos
-        self.thread = random.randint(0, 7)  # 0-7 hilos
-        self.state_history = [PROCESS_STATES["NEW"]]  # Historial de estados
-        self.time_in_states = {state: 0 for state in PROCESS_STATES.values()}
-        self.time_in_states[PROCESS_STATES["NEW"]] = 1
-        self.cpu_usage_history = [random.randint(10, 30)]  # Historial de uso de CPU
+# Cada cuánto se consulta la cola de instantáneas del simulador (ms)
+SNAPSHOT_POLL_MS = 15
+
+# Refresco del panel de rendimiento (se activa con F12)
+OVERLAY_REFRESH_MS = 500
+OVERLAY_PHASES = 8
+
+class RenderScheduler:
+    """Agrupa los repintados de la interfaz.
+    
+    Las vistas se marcan como pendientes y se repintan juntas en el siguiente
+    cuadro (como máximo ``fps`` por segundo), así varios ciclos de simulación
+    seguidos producen un solo repintado. Una vista que no está visible sigue
+    pendiente hasta que se muestre. Con ``profiler`` se mide cada vista
+    (``render.<nombre>``) y se cuentan los cuadros dibujados.
+    """
+    
+    def __init__(self, widget, fps=30, profiler=None):
+        self.widget = widget
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.interval = max(1, int(1000 / fps))
+        self._views = {}
+        self._dirty = set()
+        self._pending = None
+        self._last_flush = 0.0
+    
+    def register(self, name, callback, visible=None):
+        """Registra una vista; ``visible()`` indica si vale la pena repintarla ahora"""
+        self._views[name] = (callback, visible)
+    
+    def mark_dirty(self, *names):
+        self._dirty.update(names or self._views)
+        self.schedule()
+    
+    def schedule(self):
+        if self._pending is not None or not self._dirty:
+            return
+        elapsed = (time.perf_counter() - self._last_flush) * 1000
+        delay = max(0, int(self.interval - elapsed))
+        self._pending = self.widget.after(delay, self.flush)
+    
+    def flush(self):
+        """Repinta ya las vistas pendientes que estén visibles"""
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+        self._last_flush = time.perf_counter()
+        drawn = False
+        for name in list(self._dirty):
+            callback, visible = self._views[name]
+            if visible is None or visible():
+                self._dirty.discard(name)
+                with self.profiler.timer(f"render.{name}"):
+                    callback()
+                drawn = True
+        if drawn:
+            self.profiler.tick(FRAMES)
+
+class ProcessListView:
+    """Lista virtual de procesos.
+    
+    El ``Treeview`` tiene solo las filas que caben en pantalla; al desplazarse
+    se vuelven a llenar con los procesos visibles de la instantánea, así que
+    el número de widgets y el costo de actualizar la lista no dependen de
+    cuántos procesos haya.
+    """
+    
+    COLUMNS = (
+        ("id", "Proceso", 70),
+        ("priority", "Prioridad", 70),
+        ("core", "Núcleo", 60),
+        ("memory", "Memoria", 80),
+        ("progress", "Progreso", 150),
+        ("state", "Estado", 90)
+    )
+    
+    def __init__(self, parent, on_select, on_scroll=None, rows=8):
+        self.on_select = on_select
+        self.on_scroll = on_scroll
+        self.view = None
+        self.offset = 0
+        self.selected_pid = None
+        
+        self.frame = tk.Frame(parent, bg="#f0f0f0")
+        self.tree = ttk.Treeview(self.frame, columns=[name for name, _, _ in self.COLUMNS], 
+                                 show="headings", height=rows, selectmode="browse")
+        for name, title, width in self.COLUMNS:
+            self.tree.heading(name, text=title)
+            self.tree.column(name, width=width, anchor="center")
+        for state, color in STATE_COLORS.items():
+            self.tree.tag_configure(state, background=color)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        
+        # Filas fijas del Treeview; las que sobran se desenganchan
+        self.items = [self.tree.insert("", "end") for _ in range(rows)]
+        self.detached = set()
+        
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+        self.tree.bind("<Up>", lambda e: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-len(self.items)))
+        self.tree.bind("<Next>", lambda e: self.scroll(len(self.items)))
+    
+    @property
+    def total(self):
+        return len(self.view.table) if self.view is not None else 0
+    
+    def update(self, view):
+        self.view = view
+        self.set_offset(self.offset)
+    
+    def scroll(self, rows):
+        self.set_offset(self.offset + rows)
+        return "break"
+    
+    @property
+    def visible_rows(self):
+        """Rango de filas de la tabla que se ven en la lista"""
+        return range(self.offset, min(self.offset + len(self.items), self.total))
+    
+    def set_offset(self, offset):
+        offset = max(0, min(offset, self.total - len(self.items)))
+        moved = offset != self.offset
+        self.offset = offset
+        self.refresh()
+        if moved and self.on_scroll is not None:
+            self.on_scroll()
+    
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.set_offset(int(float(amount) * self.total))
+        elif unit == "pages":
+            self.scroll(int(amount) * len(self.items))
+        else:
+            self.scroll(int(amount))
+    
+    def select(self, pid):
+        """Marca ``pid`` como seleccionado (``None`` para ninguno)"""
+        self.selected_pid = pid
+        self.refresh()
+    
+    def move_selection(self, delta):
+        """Mueve la selección con el teclado, desplazando la lista si hace falta"""
+        if not self.total:
+            return "break"
+        table = self.view.table
+        row = table.row_of(self.selected_pid) if self.selected_pid is not None else None
+        row = 0 if row is None else max(0, min(row + delta, self.total - 1))
+        if row < self.offset:
+            self.set_offset(row)
+        elif row >= self.offset + len(self.items):
+            self.set_offset(row - len(self.items) + 1)
+        self.on_select(int(table.pid[row]))
+        return "break"
+    
+    def on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        pid = int(self.tree.set(selection[0], "id"))
+        if pid != self.selected_pid:
+            self.on_select(pid)
+    
+    def refresh(self):
+        """Vuelve a llenar las filas visibles (O(filas visibles))"""
+        if self.view is None:
+            return
+        table = self.view.table
+        window = slice(self.offset, min(self.offset + len(self.items), len(table)))
+        rows = zip(table.pid[window].tolist(), table.priority[window].tolist(), 
+                   table.core[window].tolist(), table.memory_usage[window].tolist(), 
+                   table.execution_time[window].tolist(), table.initial_execution_time[window].tolist(), 
+                   table.state[window].tolist())
+        selected_item = None
+        for index, item in enumerate(self.items):
+            values = next(rows, None)
+            if values is None:
+                if item not in self.detached:
+                    self.tree.detach(item)
+                    self.detached.add(item)
+                continue
+            if item in self.detached:
+                self.tree.reattach(item, "", index)
+                self.detached.discard(item)
+            pid, priority, core, memory, remaining, initial, state = values
+            done = initial - remaining
+            filled = round(10 * done / initial) if initial else 10
+            state = STATE_NAMES[state]
+            self.tree.item(item, tags=(state,), values=(
+                pid, PRIORITIES[priority], core, f"{memory} MB", 
+                f"{'█' * filled}{'░' * (10 - filled)} {done}/{initial}", state))
+            if pid == self.selected_pid:
+                selected_item = item
+        
+        if selected_item is not None:
+            if self.tree.selection() != (selected_item,):
+                self.tree.selection_set(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+        
+        total = self.total
+        if total:
+            self.scrollbar.set(self.offset / total, window.stop / total)
+        else:
+            self.scrollbar.set(0, 1)
 
 class ProcessSimulator(tk.Tk):
     def __init__(self):
@@ -46,21 +287,70 @@ class ProcessSimulator(tk.Tk):
         self.geometry("1200x750")
         self.configure(bg="#f0f0f0")
         
-        self.cycle_count = 0
-        self.state_counts = {state: 0 for state in PROCESS_STATES.values()}
-        self.state_counts[PROCESS_STATES["NEW"]] = 3  # Inicialmente 3 procesos nuevos
-        
-        self.processes = [
-            Process(1, "Alta", 10, 5),
-            Process(2, "Media", 15, 7),
-            Process(3, "Baja", 20, 10)
-        ]
+        # Mide las fases del motor y de la interfaz solo con el panel de rendimiento abierto
+        self.profiler = Profiler()
+        self.engine = SimulationEngine(profiler=self.profiler, history_summary=True)
+        # El motor corre en un hilo de trabajo; la ventana solo muestra las
+        # instantáneas que este publica
+        self.runner = SimulationRunner(self.engine, rate=SIMULATION_RATES["2 ciclos/s"])
+        self.view = self.engine.snapshot()
         
-        self.selected_process = None
-        self.history_data = []
+        self.selected_pid = None
+        self.exporting = False  # el hilo del simulador exporta métricas a un directorio
         
+        self.render_scheduler = RenderScheduler(self, profiler=self.profiler)
         self.create_widgets()
         
+        # Solo se repinta lo visible: la pestaña activa y el panel de detalles abierto
+        self.render_scheduler.register("processes", self.update_process_list)
+        self.render_scheduler.register("details", self.update_details_frame, 
+                                       lambda: self.selected_process is not None)
+        self.render_scheduler.register("states", self.update_state_distribution_chart, 
+                                       lambda: self.is_tab_visible(self.states_tab))
+        self.render_scheduler.register("timeline", self.update_timeline_chart, 
+                                       lambda: self.is_tab_visible(self.timeline_tab))
+        self.render_scheduler.register("resources", self.update_resource_usage_chart, 
+                                       lambda: self.is_tab_visible(self.resources_tab))
+        self.tab_control.bind("<<NotebookTabChanged>>", lambda e: self.render_scheduler.schedule())
+        
+        self.bind("<F12>", lambda e: self.toggle_overlay())
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.watch_visible_rows()
+        self.runner.start()
+        self.poll_snapshots()
+        # Arranque: desde antes de importar el simulador hasta la ventana lista
+        self.profiler.record("ui.imports", IMPORTED - STARTED, start=STARTED)
+        self.after_idle(lambda: self.profiler.record("ui.startup", time.perf_counter() - STARTED, start=STARTED))
+        
+    @property
+    def processes(self):
+        return self.view.processes
+    
+    def watch_visible_rows(self):
+        """Las instantáneas solo copian el uso de CPU de las filas de la lista"""
+        offset = self.process_list.offset
+        self.runner.watch(range(offset, offset + len(self.process_list.items)))
+        
+    def on_process_scroll(self):
+        self.watch_visible_rows()
+        self.render_scheduler.mark_dirty("resources")
+        
+    @property
+    def selected_process(self):
+        """Vista del proceso seleccionado en la instantánea actual (búsqueda O(1) por id)"""
+        if self.selected_pid is None:
+            return None
+        row = self.view.table.row_of(self.selected_pid)
+        return ProcessView(self.view, row) if row is not None else None
+    
+    @property
+    def state_counts(self):
+        return self.view.state_counts
+    
+    @property
+    def cycle_count(self):
+        return self.view.cycle_count
+    
     def create_widgets(self):
         main_frame = tk.Frame(self, bg="#f0f0f0")
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -79,51 +369,54 @@ class ProcessSimulator(tk.Tk):
         processes_frame = tk.Frame(top_panel, bg="#f0f0f0")
         processes_frame.pack(side=tk.LEFT, fill=tk.Y)
         
-        self.process_frames = []
-        for i, process in enumerate(self.processes):
-            process_frame = tk.Frame(processes_frame, bg="white", relief=tk.RAISED, bd=1)
-            process_frame.grid(row=0, column=i, padx=10)
-            
-            process_frame.bind("<Button-1>", lambda e, p=process: self.select_process(p))
-            
-            process_title = tk.Label(process_frame, text=f"Proceso {process.id}", font=("Arial", 12, "bold"), bg="white")
-            process_title.pack(fill=tk.X, pady=5, padx=10)
-            
-            separator = ttk.Separator(process_frame, orient="horizontal")
-            separator.pack(fill=tk.X, padx=5)
-            
-            content_frame = tk.Frame(process_frame, bg="white")
-            content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-            tk.Label(content_frame, text=f" Prioridad: {process.priority}", bg="white", anchor="w").pack(fill=tk.X, pady=2)
-            tk.Label(content_frame, text=f" Núcleo: {process.core}", bg="white", anchor="w").pack(fill=tk.X, pady=2)
-            tk.Label(content_frame, text=f" Memoria: {process.memory_usage} MB", bg="white", anchor="w").pack(fill=tk.X, pady=2)
-            
-            # Barra de progreso para tiempo de ejecución restante
-            progress_frame = tk.Frame(content_frame, bg="white")
-            progress_frame.pack(fill=tk.X, pady=5)
-            
-            tk.Label(progress_frame, text="Progreso:", bg="white").pack(anchor="w")
-            
-            progress_var = tk.DoubleVar()
-            progress_var.set(0)
-            progress_bar = ttk.Progressbar(progress_frame, variable=progress_var, maximum=process.initial_execution_time)
-            progress_bar.pack(fill=tk.X, pady=2)
-            
-            state_var = tk.StringVar()
-            state_var.set(f"Estado: {process.current_state}")
-            state_label = tk.Label(content_frame, textvariable=state_var, bg="white", anchor="w")
-            state_label.pack(fill=tk.X, pady=2)
-            
-            process_frame.process = process
-            process_frame.state_var = state_var
-            process_frame.progress_var = progress_var
-            self.process_frames.append(process_frame)
+        # Lista virtual: solo se crean las filas visibles
+        self.process_list = ProcessListView(
+            processes_frame, self.select_process, 
+            on_scroll=self.on_process_scroll)
+        self.process_list.frame.pack(fill=tk.BOTH, expand=True)
+        self.process_list.update(self.view)
+        
+        # Carga de trabajo (cambiarla reinicia la simulación)
+        workload_frame = tk.Frame(top_panel, bg="#f0f0f0")
+        workload_frame.pack(side=tk.LEFT, fill=tk.Y, padx=20)
+        
+        tk.Label(workload_frame, text="Carga de trabajo:", bg="#f0f0f0").pack(anchor="w")
+        self.workload_var = tk.StringVar()
+        self.workload_var.set("Tres procesos")
+        workload_combo = ttk.Combobox(workload_frame, textvariable=self.workload_var, 
+                                      values=list(WORKLOAD_OPTIONS), state="readonly", width=20)
+        workload_combo.bind("<<ComboboxSelected>>", lambda e: self.change_workload())
+        workload_combo.pack(anchor="w", pady=5)
+        
+        trace_btn = tk.Button(workload_frame, text="📂 Abrir traza...", command=self.open_trace, 
+                              bg="#607D8B", fg="white", font=("Arial", 10, "bold"), padx=10, pady=5)
+        trace_btn.pack(anchor="w", pady=5)
+        
+        # Gestor de memoria (cambiarlo reinicia la simulación)
+        tk.Label(workload_frame, text="Memoria (4096 MB):", bg="#f0f0f0").pack(anchor="w")
+        self.memory_var = tk.StringVar()
+        self.memory_var.set("Ilimitada")
+        memory_combo = ttk.Combobox(workload_frame, textvariable=self.memory_var, 
+                                    values=list(MEMORY_OPTIONS), state="readonly", width=20)
+        memory_combo.bind("<<ComboboxSelected>>", lambda e: self.change_memory())
+        memory_combo.pack(anchor="w", pady=5)
+        
+        # Dispositivos de E/S (cambiarlos reinicia la simulación)
+        tk.Label(workload_frame, text="E/S:", bg="#f0f0f0").pack(anchor="w")
+        self.devices_var = tk.StringVar()
+        self.devices_var.set("Fija (1 ciclo)")
+        devices_combo = ttk.Combobox(workload_frame, textvariable=self.devices_var, 
+                                     values=list(DEVICE_OPTIONS), state="readonly", width=20)
+        devices_combo.bind("<<ComboboxSelected>>", lambda e: self.change_devices())
+        devices_combo.pack(anchor="w", pady=5)
+        
+        self.resource_stats_var = tk.StringVar()
+        tk.Label(workload_frame, textvariable=self.resource_stats_var, bg="#f0f0f0", 
+                 justify=tk.LEFT).pack(anchor="w")
         
         # Panel de detalles para el proceso seleccionado
         self.details_frame = tk.Frame(main_frame, bg="white", relief=tk.RAISED, bd=1)
-        self.details_frame.pack(fill=tk.X, pady=10)
-        self.details_frame.pack_forget()  
+        self.create_details_widgets()
         
         # Panel inferior con visualizaciones
         viz_panel = tk.Frame(main_frame, bg="#f0f0f0")
@@ -145,10 +438,10 @@ class ProcessSimulator(tk.Tk):
         self.resources_tab = tk.Frame(self.tab_control, bg="white")
         self.tab_control.add(self.resources_tab, text="Uso de Recursos")
         
-        # Inicializar gráficos
-        self.init_state_distribution_chart()
-        self.init_timeline_chart()
-        self.init_resource_usage_chart()
+        # Los gráficos se crean la primera vez que se muestra su pestaña
+        self.states_chart = None
+        self.timeline_chart = None
+        self.resource_chart = None
         
         # Controles de simulación
         buttons_frame = tk.Frame(main_frame, bg="#f0f0f0")
@@ -171,178 +464,96 @@ class ProcessSimulator(tk.Tk):
                                     font=("Arial", 10, "bold"), padx=10, pady=5)
         auto_simulate_btn.pack(side=tk.LEFT, padx=5)
         
+        self.play_var = tk.StringVar()
+        self.play_var.set("⏯️ Reproducir")
+        play_btn = tk.Button(buttons_frame, textvariable=self.play_var, 
+                            command=self.toggle_play, bg="#673AB7", fg="white", 
+                            font=("Arial", 10, "bold"), padx=10, pady=5)
+        play_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Velocidad objetivo de la reproducción continua
+        tk.Label(buttons_frame, text="Velocidad:", bg="#f0f0f0").pack(side=tk.LEFT, padx=(10, 2))
+        self.rate_var = tk.StringVar()
+        self.rate_var.set("2 ciclos/s")
+        rate_combo = ttk.Combobox(buttons_frame, textvariable=self.rate_var, 
+                                  values=list(SIMULATION_RATES), state="readonly", width=14)
+        rate_combo.bind("<<ComboboxSelected>>", 
+                        lambda e: self.runner.set_rate(SIMULATION_RATES[self.rate_var.get()]))
+        rate_combo.pack(side=tk.LEFT, padx=5)
+        
+        # Política de planificación (cambiarla reinicia la simulación)
+        tk.Label(buttons_frame, text="Planificador:", bg="#f0f0f0").pack(side=tk.LEFT, padx=(10, 2))
+        self.scheduler_var = tk.StringVar()
+        self.scheduler_var.set("Original")
+        scheduler_combo = ttk.Combobox(buttons_frame, textvariable=self.scheduler_var, 
+                                       values=list(SCHEDULER_OPTIONS), state="readonly", width=20)
+        scheduler_combo.bind("<<ComboboxSelected>>", lambda e: self.change_scheduler())
+        scheduler_combo.pack(side=tk.LEFT, padx=5)
+        
         reset_btn = tk.Button(buttons_frame, text="🔄 Reiniciar Simulación", 
                              command=self.reset_simulation, bg="#F44336", fg="white", 
                              font=("Arial", 10, "bold"), padx=10, pady=5)
         reset_btn.pack(side=tk.LEFT, padx=5)
-    
-    def init_state_distribution_chart(self):
-        fig, self.states_ax = plt.subplots(figsize=(5, 4))
-        plt.subplots_adjust(left=0.2)
-        
-        self.states_canvas = FigureCanvasTkAgg(fig, self.states_tab)
-        self.states_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        self.update_state_distribution_chart()
-    
-    def update_state_distribution_chart(self):
-        self.states_ax.clear()
-        
-        states = list(PROCESS_STATES.values())
-        values = [self.state_counts[state] for state in states]
-        colors = [STATE_COLORS[state] for state in states]
-        
-        bars = self.states_ax.barh(states, values, color=colors)
-        self.states_ax.set_title('Distribución de Procesos por Estado')
-        self.states_ax.set_xlabel('Número de Procesos')
-        
-        # Añadir valores a las barras
-        for bar in bars:
-            width = bar.get_width()
-            if width > 0:
-                self.states_ax.text(width + 0.1, 
-                                   bar.get_y() + bar.get_height()/2, 
-                                   f'{int(width)}', 
-                                   ha='left', va='center')
-        
-        self.states_canvas.draw()
-    
-    def init_timeline_chart(self):
-        fig, self.timeline_ax = plt.subplots(figsize=(5, 4))
-        
-        self.timeline_canvas = FigureCanvasTkAgg(fig, self.timeline_tab)
-        self.timeline_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        self.timeline_ax.set_title('Línea de Tiempo de Procesos')
-        self.timeline_ax.set_xlabel('Ciclo')
-        self.timeline_ax.set_ylabel('Proceso')
-        
-        self.update_timeline_chart()
-    
-    def update_timeline_chart(self):
-        self.timeline_ax.clear()
-        
-        # Colores para cada estado
-        cmap = {'Nuevo': '#BBDEFB', 'Listo': '#C8E6C9', 
-                'Ejecutando': '#4CAF50', 'Esperando': '#FFECB3', 
-                'Terminado': '#FFCDD2'}
-        
-        y_ticks = []
-        y_labels = []
-        
-        for i, process in enumerate(self.processes):
-            y_pos = i
-            y_ticks.append(y_pos)
-            y_labels.append(f"P{process.id}")
-            
-            for t, state in enumerate(process.state_history):
-                self.timeline_ax.add_patch(plt.Rectangle((t, y_pos - 0.4), 1, 0.8, 
-                                                      color=cmap[state]))
-                
-                # Añadir etiqueta de estado (solo para el primer y último estado)
-                if t == 0 or t == len(process.state_history) - 1:
-                    first_char = state[0]
-                    self.timeline_ax.text(t + 0.5, y_pos, first_char, 
-                                       ha='center', va='center', fontsize=8)
-        
-        # Configurar ejes
-        self.timeline_ax.set_yticks(y_ticks)
-        self.timeline_ax.set_yticklabels(y_labels)
-        self.timeline_ax.set_xlim(0, max(1, self.cycle_count))
-        self.timeline_ax.set_ylim(-0.5, len(self.processes) - 0.5)
-        self.timeline_ax.grid(axis='x', linestyle='--', alpha=0.7)
-        
-        # Leyenda
-        legend_elements = [plt.Rectangle((0, 0), 1, 1, color=color, label=state)
-                          for state, color in cmap.items()]
-        self.timeline_ax.legend(handles=legend_elements, loc='upper center', 
-                              bbox_to_anchor=(0.5, -0.15), ncol=3)
-        
-        self.timeline_ax.set_title('Línea de Tiempo de Procesos')
-        self.timeline_ax.set_xlabel('Ciclo')
-        
-        plt.tight_layout()
-        self.timeline_canvas.draw()
-    
-    def init_resource_usage_chart(self):
-        fig = plt.figure(figsize=(5, 4))
-        
-        # Gráfico de memoria
-        self.memory_ax = plt.subplot(211)
-        self.memory_ax.set_title('Uso de Memoria por Proceso')
-        self.memory_ax.set_ylabel('MB')
-        
-        # Gráfico de CPU
-        self.cpu_ax = plt.subplot(212)
-        self.cpu_ax.set_title('Uso de CPU a lo largo del tiempo')
-        self.cpu_ax.set_xlabel('Ciclo')
-        self.cpu_ax.set_ylabel('% CPU')
-        
-        self.resource_canvas = FigureCanvasTkAgg(fig, self.resources_tab)
-        self.resource_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        plt.tight_layout()
-        self.update_resource_usage_chart()
-    
-    def update_resource_usage_chart(self):
-        # Actualizar gráfico de memoria
-        self.memory_ax.clear()
-        
-        process_ids = [f"P{p.id}" for p in self.processes]
-        memory_usage = [p.memory_usage for p in self.processes]
-        colors = [STATE_COLORS[p.current_state] for p in self.processes]
-        
-        bars = self.memory_ax.bar(process_ids, memory_usage, color=colors)
-        
-        for bar in bars:
-            height = bar.get_height()
-            self.memory_ax.text(bar.get_x() + bar.get_width()/2., height + 5,
-                             f'{int(height)}MB', ha='center', va='bottom')
-        
-        self.memory_ax.set_title('Uso de Memoria por Proceso')
-        self.memory_ax.set_ylabel('MB')
         
-        # Actualizar gráfico de CPU
-        self.cpu_ax.clear()
-        
-        cycles = list(range(self.cycle_count + 1))
-        
-        for process in self.processes:
-            cpu_data = process.cpu_usage_history
-            # Asegurar que hay datos para todos los ciclos
-            while len(cpu_data) < len(cycles):
-                cpu_data.append(cpu_data[-1] if cpu_data else 0)
-            
-            self.cpu_ax.plot(cycles[:len(cpu_data)], cpu_data, 
-                           marker='o', label=f"P{process.id}")
-        
-        self.cpu_ax.set_title('Uso de CPU a lo largo del tiempo')
-        self.cpu_ax.set_xlabel('Ciclo')
-        self.cpu_ax.set_ylabel('% CPU')
-        self.cpu_ax.legend()
-        self.cpu_ax.grid(True, linestyle='--', alpha=0.7)
-        
-        # Establecer límites del eje y
-        self.cpu_ax.set_ylim(0, 100)
-        
-        plt.tight_layout()
-        self.resource_canvas.draw()
+        # Puntos de control: recorrer la simulación hacia atrás y guardar o retomar una corrida
+        checkpoint_frame = tk.Frame(main_frame, bg="#f0f0f0")
+        checkpoint_frame.pack(fill=tk.X)
+        
+        tk.Label(checkpoint_frame, text="Recorrer:", bg="#f0f0f0").pack(side=tk.LEFT, padx=(5, 2))
+        self.scrub_scale = tk.Scale(checkpoint_frame, from_=0, to=0, orient=tk.HORIZONTAL, length=400, 
+                                    bg="#f0f0f0", highlightthickness=0)
+        self.scrub_scale.bind("<ButtonPress-1>", lambda e: setattr(self, "_scrubbing", True))
+        self.scrub_scale.bind("<ButtonRelease-1>", lambda e: self.seek_to(self.scrub_scale.get()))
+        self.scrub_scale.pack(side=tk.LEFT, padx=5)
+        self._scrubbing = False
+        
+        save_btn = tk.Button(checkpoint_frame, text="💾 Guardar estado", command=self.save_checkpoint, 
+                             bg="#009688", fg="white", font=("Arial", 10, "bold"), padx=10, pady=5)
+        save_btn.pack(side=tk.LEFT, padx=5)
+        load_btn = tk.Button(checkpoint_frame, text="📂 Cargar estado", command=self.load_checkpoint, 
+                             bg="#009688", fg="white", font=("Arial", 10, "bold"), padx=10, pady=5)
+        load_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Exportación de métricas por bloques para analizarlas con ``simulador.analysis``
+        self.export_var = tk.StringVar()
+        self.export_var.set("📊 Exportar métricas...")
+        export_metrics_btn = tk.Button(checkpoint_frame, textvariable=self.export_var, 
+                                       command=self.toggle_export, bg="#3F51B5", fg="white", 
+                                       font=("Arial", 10, "bold"), padx=10, pady=5)
+        export_metrics_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Panel de rendimiento superpuesto y exportación de los tiempos medidos
+        self.overlay_visible = tk.BooleanVar(value=False)
+        tk.Checkbutton(buttons_frame, text="Rendimiento (F12)", variable=self.overlay_visible, 
+                       command=self.show_overlay, bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
+        export_btn = tk.Button(buttons_frame, text="💾 Exportar tiempos", command=self.export_timings, 
+                               bg="#795548", fg="white", font=("Arial", 10, "bold"), padx=10, pady=5)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.overlay_var = tk.StringVar()
+        self.overlay = tk.Label(self, textvariable=self.overlay_var, font=("Courier", 9), 
+                                bg="#263238", fg="#ECEFF1", justify=tk.LEFT, padx=8, pady=6)
+        self._overlay_pending = None
     
-    def select_process(self, process):
-        self.selected_process = process
-        self.update_details_frame()
+    def create_canvas(self, master, figsize):
+        """Figura con su lienzo Tk dentro de ``master`` (se cuentan para detectar fugas).
+        
+        Se usa la API de ``Figure`` y no pyplot, así que ninguna figura queda
+        registrada en un estado global.
+        """
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
+        self.profiler.count("figures_created")
+        figure = Figure(figsize=figsize)
+        canvas = FigureCanvasTkAgg(figure, master)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return figure, canvas
     
-    def update_details_frame(self):
-        for widget in self.details_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.selected_process:
-            self.details_frame.pack_forget()
-            return
-        
-        self.details_frame.pack(fill=tk.X, pady=10)
-        
-        title_label = tk.Label(self.details_frame, text=f"Detalles del Proceso {self.selected_process.id}", 
+    def create_details_widgets(self):
+        """Crea una sola vez el panel de detalles; ``update_details_frame`` solo cambia sus valores"""
+        self.details_title_var = tk.StringVar()
+        title_label = tk.Label(self.details_frame, textvariable=self.details_title_var, 
                               font=("Arial", 12, "bold"), bg="white")
         title_label.pack(fill=tk.X, padx=10, pady=5)
         
@@ -357,9 +568,11 @@ class ProcessSimulator(tk.Tk):
         left_frame.grid(row=0, column=0, sticky="nw", padx=10)
         
         tk.Label(left_frame, text="Información Detallada:", font=("Arial", 10, "bold"), bg="white").pack(anchor="w", pady=2)
-        tk.Label(left_frame, text=f"Tiempo de Ejecución: {self.selected_process.execution_time}/{self.selected_process.initial_execution_time}", bg="white").pack(anchor="w", pady=2)
-        tk.Label(left_frame, text=f"Ciclo de Ejecución: {self.selected_process.execution_cycle}", bg="white").pack(anchor="w", pady=2)
-        tk.Label(left_frame, text=f"Hilo: {self.selected_process.thread}", bg="white").pack(anchor="w", pady=2)
+        self.details_info_vars = []
+        for _ in range(3):
+            var = tk.StringVar()
+            tk.Label(left_frame, textvariable=var, bg="white").pack(anchor="w", pady=2)
+            self.details_info_vars.append(var)
         
         # Panel central con estados del proceso
         center_frame = tk.Frame(content_frame, bg="white")
@@ -370,13 +583,13 @@ class ProcessSimulator(tk.Tk):
         states_frame = tk.Frame(center_frame, bg="white")
         states_frame.pack(fill=tk.X, pady=5)
         
+        self.details_states = {}
         for state in PROCESS_STATES.values():
-            state_frame = tk.Frame(states_frame, bg=STATE_COLORS[state] if state == self.selected_process.current_state else "#e0e0e0",
-                                 padx=5, pady=5, bd=1, relief=tk.RAISED)
+            state_frame = tk.Frame(states_frame, bg="#e0e0e0", padx=5, pady=5, bd=1, relief=tk.RAISED)
             state_frame.pack(fill=tk.X, pady=2)
-            
-            tk.Label(state_frame, text=f"{state} ({self.selected_process.time_in_states[state]} ciclos)", 
-                    bg=STATE_COLORS[state] if state == self.selected_process.current_state else "#e0e0e0").pack()
+            state_label = tk.Label(state_frame, bg="#e0e0e0")
+            state_label.pack()
+            self.details_states[state] = (state_frame, state_label)
         
         # Panel derecho con gráfico de tiempo en estados
         right_frame = tk.Frame(content_frame, bg="white")
@@ -384,127 +597,278 @@ class ProcessSimulator(tk.Tk):
         
         tk.Label(right_frame, text="Tiempo en Estados:", font=("Arial", 10, "bold"), bg="white").pack(anchor="w", pady=2)
         
-        fig, ax = plt.subplots(figsize=(3, 2))
+        # La figura se crea al seleccionar el primer proceso
+        self.details_chart_frame = right_frame
+        self.details_ax = None
+        self.details_canvas = None
+        self._details_pie = None  # (id, tiempos) del gráfico dibujado
+    
+    def is_tab_visible(self, tab):
+        return self.tab_control.select() == str(tab)
+    
+    def init_state_distribution_chart(self):
+        from simulador.charts import StateDistributionChart
         
+        fig, self.states_canvas = self.create_canvas(self.states_tab, (5, 4))
+        self.states_chart = StateDistributionChart(fig)
+    
+    def update_state_distribution_chart(self):
+        if self.states_chart is None:
+            self.init_state_distribution_chart()
+        self.states_chart.update(self.view)
+    
+    def init_timeline_chart(self):
+        from simulador.charts import TimelineChart
+        
+        fig, self.timeline_canvas = self.create_canvas(self.timeline_tab, (5, 4))
+        self.timeline_chart = TimelineChart(fig)
+    
+    def update_timeline_chart(self):
+        if self.timeline_chart is None:
+            self.init_timeline_chart()
+        self.timeline_chart.update(self.view)
+    
+    def init_resource_usage_chart(self):
+        from simulador.charts import ResourceUsageChart
+        
+        fig, self.resource_canvas = self.create_canvas(self.resources_tab, (5, 4))
+        self.resource_chart = ResourceUsageChart(fig)
+    
+    def update_resource_usage_chart(self):
+        if self.resource_chart is None:
+            self.init_resource_usage_chart()
+        # Solo los procesos visibles en la lista
+        self.resource_chart.update(self.view, self.process_list.visible_rows)
+    
+    def select_process(self, pid):
+        self.selected_pid = pid
+        self.process_list.select(pid)
+        self.update_details_frame()
+    
+    def update_details_frame(self):
+        process = self.selected_process
+        if not process:
+            self.details_frame.pack_forget()
+            return
+        
+        self.details_frame.pack(fill=tk.X, pady=10)
+        
+        self.details_title_var.set(f"Detalles del Proceso {process.id}")
+        info = (f"Tiempo de Ejecución: {process.execution_time}/{process.initial_execution_time}", 
+                f"Ciclo de Ejecución: {process.execution_cycle}", 
+                f"Hilo: {process.thread}")
+        for var, text in zip(self.details_info_vars, info):
+            var.set(text)
+        
+        time_in_states = process.time_in_states
+        current_state = process.current_state
+        for state, (state_frame, state_label) in self.details_states.items():
+            color = STATE_COLORS[state] if state == current_state else "#e0e0e0"
+            state_frame.configure(bg=color)
+            state_label.configure(bg=color, text=f"{state} ({time_in_states[state]} ciclos)")
+        
+        # El gráfico se rehace en la misma figura y solo si cambiaron los tiempos
         states = list(PROCESS_STATES.values())
-        times = [self.selected_process.time_in_states[state] for state in states]
+        times = [time_in_states[state] for state in states]
+        if (process.id, times) == self._details_pie or not sum(times):
+            return
+        self._details_pie = (process.id, times)
+        if self.details_ax is None:
+            fig, self.details_canvas = self.create_canvas(self.details_chart_frame, (3, 2))
+            self.details_ax = fig.add_subplot(111)
+        ax = self.details_ax
+        ax.clear()
         colors = [STATE_COLORS[state] for state in states]
-        
         wedges, texts, autotexts = ax.pie(times, labels=None, autopct='%1.1f%%', 
                                         startangle=90, colors=colors)
         
         # Leyenda
         ax.legend(wedges, states, loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-        
-        canvas = FigureCanvasTkAgg(fig, right_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        canvas.draw()
+        self.details_canvas.draw_idle()
     
     def simulate_process_cycle(self):
-        self.cycle_count += 1
-        self.cycle_counter_var.set(f"Ciclo: {self.cycle_count}")
-        
-        # Actualizar conteo de estados
-        self.state_counts = {state: 0 for state in PROCESS_STATES.values()}
-        
-        for process in self.processes:
-            old_state = process.current_state
-            
-            # Lógica de transición de estados
-            if process.current_state == PROCESS_STATES["NEW"]:
-                process.current_state = PROCESS_STATES["READY"]
-            elif process.current_state == PROCESS_STATES["READY"]:
-                process.current_state = PROCESS_STATES["RUNNING"]
-            elif process.current_state == PROCESS_STATES["RUNNING"]:
-                if process.execution_time > 0:
-                    process.current_state = PROCESS_STATES["WAITING"]
-                else:
-                    process.current_state = PROCESS_STATES["TERMINATED"]
-            elif process.current_state == PROCESS_STATES["WAITING"]:
-                process.current_state = PROCESS_STATES["READY"]
-                process.execution_time -= 1
-            
-            # No cambiar estado si ya está terminado
-            if old_state == PROCESS_STATES["TERMINATED"]:
-                process.current_state = PROCESS_STATES["TERMINATED"]
-            
-            # Actualizar conteo de estados
-            self.state_counts[process.current_state] += 1
-            
-            # Actualizar historial de estados
-            process.state_history.append(process.current_state)
-            
-            # Incrementar tiempo en el estado actual
-            process.time_in_states[process.current_state] += 1
-            
-            # Generar datos de uso de CPU
-            if process.current_state == PROCESS_STATES["RUNNING"]:
-                cpu = random.randint(70, 100)
-            elif process.current_state == PROCESS_STATES["WAITING"]:
-                cpu = random.randint(20, 40)
-            elif process.current_state == PROCESS_STATES["READY"]:
-                cpu = random.randint(5, 15)
-            elif process.current_state == PROCESS_STATES["TERMINATED"]:
-                cpu = 0
-            else:
-                cpu = random.randint(1, 10)
-            
-            process.cpu_usage_history.append(cpu)
-        
-        # Actualizar interfaz de usuario
-        self.update_process_frames()
-        if self.selected_process:
-            self.update_details_frame()
-        
-        # Actualizar visualizaciones
-        self.update_state_distribution_chart()
-        self.update_timeline_chart()
-        self.update_resource_usage_chart()
+        self.runner.step()
     
     def auto_simulate(self, cycles):
-        """Ejecuta varios ciclos de simulación automáticamente"""
-        for _ in range(cycles):
-            self.simulate_process_cycle()
-            self.update()  # Actualizar interfaz
-            time.sleep(0.5)  # Pequeña pausa entre ciclos
+        """Ejecuta varios ciclos a la velocidad elegida sin bloquear la ventana"""
+        self.runner.play(cycles)
     
-    def reset_simulation(self):
-        self.cycle_count = 0
-        self.cycle_counter_var.set("Ciclo: 0")
-        
-        self.processes = [
-            Process(1, "Alta", 10, 5),
-            Process(2, "Media", 15, 7),
-            Process(3, "Baja", 20, 10)
-        ]
+    def toggle_play(self):
+        if self.runner.playing:
+            self.runner.pause()
+        else:
+            self.runner.play()
+    
+    def poll_snapshots(self):
+        """Recoge la última instantánea del simulador y marca la interfaz como pendiente"""
+        snapshot = self.runner.latest_snapshot()
+        if snapshot is not None:
+            self.apply_snapshot(snapshot)
+        self.play_var.set("⏸️ Pausar" if self.runner.playing else "⏯️ Reproducir")
+        # Una orden que falló en el hilo del simulador (p. ej. un archivo inválido)
+        for error in self.runner.pending_errors():
+            messagebox.showerror("Error en la simulación", str(error), parent=self)
+        self.after(SNAPSHOT_POLL_MS, self.poll_snapshots)
+    
+    def apply_snapshot(self, snapshot):
+        self.view = snapshot
         
-        # Restablecer conteo de estados
-        self.state_counts = {state: 0 for state in PROCESS_STATES.values()}
-        self.state_counts[PROCESS_STATES["NEW"]] = 3  # Inicialmente 3 procesos nuevos
+        # El proceso seleccionado se busca por id en la nueva instantánea
+        if self.selected_pid is not None and self.selected_process is None:
+            self.clear_selection()
         
-        self.selected_process = None
+        # Se repinta en el siguiente cuadro
+        self.render_scheduler.mark_dirty()
+    
+    def clear_selection(self):
+        self.selected_pid = None
+        self.process_list.select(None)
         self.details_frame.pack_forget()
-        
-        # Actualizar interfaz y visualizaciones
-        self.update_process_frames()
-        self.update_state_distribution_chart()
-        self.update_timeline_chart()
-        self.update_resource_usage_chart()
-    
-    def update_process_frames(self):
-        for frame in self.process_frames:
-            process = frame.process
-            frame.state_var.set(f"Estado: {process.current_state}")
-            
-            # Actualizar barra de progreso
-            progress = (process.initial_execution_time - process.execution_time) / process.initial_execution_time
-            frame.progress_var.set(process.initial_execution_time - process.execution_time)
-            
-            # Actualizar referencia del proceso
-            for p in self.processes:
-                if p.id == process.id:
-                    frame.process = p
-                    break
+    
+    def reset_simulation(self):
+        self.runner.reset()
+        self.cycle_counter_var.set("Ciclo: 0")
+        self.clear_selection()
+    
+    def change_scheduler(self):
+        scheduler = make_scheduler(SCHEDULER_OPTIONS[self.scheduler_var.get()])
+        self.runner.configure(scheduler=scheduler)
+        self.clear_selection()
+    
+    def change_workload(self):
+        factory = WORKLOAD_OPTIONS[self.workload_var.get()]
+        self.runner.configure(workload=factory() if factory else None)
+        self.clear_selection()
+    
+    def change_memory(self):
+        self.runner.configure(memory=make_memory(MEMORY_OPTIONS[self.memory_var.get()]))
+        self.clear_selection()
+    
+    def change_devices(self):
+        self.runner.configure(devices=make_devices(DEVICE_OPTIONS[self.devices_var.get()]))
+        self.clear_selection()
+    
+    def open_trace(self):
+        path = filedialog.askopenfilename(
+            title="Abrir traza", 
+            filetypes=[("Trazas", "*.csv *.jsonl"), ("Todos los archivos", "*.*")])
+        if not path:
+            return
+        self.runner.configure(workload=TraceWorkload(path))
+        self.workload_var.set(os.path.basename(path))
+        self.clear_selection()
+    
+    def seek_to(self, cycle):
+        self._scrubbing = False
+        self.runner.seek(int(cycle))
+    
+    def save_checkpoint(self):
+        path = filedialog.asksaveasfilename(
+            title="Guardar estado", defaultextension=".ckpt", 
+            filetypes=[("Puntos de control", "*.ckpt"), ("Todos los archivos", "*.*")])
+        if path:
+            self.runner.save(path)
+    
+    def load_checkpoint(self):
+        path = filedialog.askopenfilename(
+            title="Cargar estado", 
+            filetypes=[("Puntos de control", "*.ckpt"), ("Todos los archivos", "*.*")])
+        if not path:
+            return
+        self.runner.load(path)
+        self.clear_selection()
+    
+    def toggle_export(self):
+        if self.exporting:
+            self.runner.record(None)
+            self.exporting = False
+            self.export_var.set("📊 Exportar métricas...")
+            return
+        directory = filedialog.askdirectory(title="Exportar métricas a")
+        if not directory:
+            return
+        self.runner.record(directory)
+        self.exporting = True
+        self.export_var.set("⏹️ Terminar exportación")
+    
+    def update_scrub(self):
+        """Ajusta el recorrido: del primer punto de control al ciclo más lejano alcanzado"""
+        if self._scrubbing:
+            return
+        timeline = self.runner.timeline
+        cycles = timeline.cycles
+        self.scrub_scale.configure(from_=cycles[0] if cycles else 0, 
+                                   to=max(timeline.furthest, self.cycle_count))
+        self.scrub_scale.set(self.cycle_count)
+    
+    def toggle_overlay(self):
+        self.overlay_visible.set(not self.overlay_visible.get())
+        self.show_overlay()
+    
+    def show_overlay(self):
+        """Muestra u oculta el panel de rendimiento; el perfilado solo corre mientras se ve"""
+        visible = self.overlay_visible.get()
+        self.profiler.enabled = visible
+        if visible:
+            self.overlay.place(relx=1.0, x=-10, y=10, anchor="ne")
+            self.overlay.lift()
+            self.refresh_overlay()
+        else:
+            self.overlay.place_forget()
+            if self._overlay_pending is not None:
+                self.after_cancel(self._overlay_pending)
+                self._overlay_pending = None
+    
+    def count_widgets(self):
+        count, pending = 0, [self]
+        while pending:
+            children = pending.pop().winfo_children()
+            count += len(children)
+            pending.extend(children)
+        return count
+    
+    def refresh_overlay(self):
+        profiler = self.profiler
+        lines = [f"Simulación: {profiler.rate(CYCLES):,.0f} ciclos/s · Render: {profiler.rate(FRAMES):.1f} fps", 
+                 f"{'fase':<22}{'n':>7}{'media':>9}{'p95':>9}{'máx':>9} ms"]
+        for row in profiler.phases()[:OVERLAY_PHASES]:
+            lines.append(f"{row['phase']:<22}{row['count']:>7}{row['mean_ms']:>9.2f}"
+                         f"{row['p95_ms']:>9.2f}{row['max_ms']:>9.2f}")
+        lines.append(f"Figuras creadas: {profiler.counters.get('figures_created', 0)} · "
+                     f"Widgets: {self.count_widgets()}")
+        self.overlay_var.set("\n".join(lines))
+        self._overlay_pending = self.after(OVERLAY_REFRESH_MS, self.refresh_overlay)
+    
+    def export_timings(self):
+        path = filedialog.asksaveasfilename(
+            title="Exportar tiempos", defaultextension=".csv", 
+            filetypes=[("CSV (una fila por medición)", "*.csv"), ("JSON (resumen y mediciones)", "*.json")])
+        if path:
+            self.profiler.export(path)
+    
+    def on_close(self):
+        self.runner.stop()
+        self.destroy()
+    
+    def update_process_list(self):
+        self.cycle_counter_var.set(f"Ciclo: {self.cycle_count}")
+        self.process_list.update(self.view)
+        self.update_resource_stats()
+        self.update_scrub()
+    
+    def update_resource_stats(self):
+        lines = []
+        stats = self.view.memory_stats()
+        if stats is not None:
+            lines.append(f"En uso: {stats['memory_used']} MB · esperando: {stats['memory_waiting']}")
+            lines.append(f"Fragmentación ext./int.: {stats['external_fragmentation']:.0%} / "
+                         f"{stats['internal_fragmentation']:.0%}")
+            if "page_fault_rate" in stats:
+                lines.append(f"Fallos de página: {stats['page_faults']} ({stats['page_fault_rate']:.1%})")
+        for name, device in (self.view.device_stats() or {}).items():
+            lines.append(f"{name}: cola {device['queue']} · uso {device['utilization']:.0%} · "
+                         f"espera media {device['mean_wait']:.1f}")
+        self.resource_stats_var.set("\n".join(lines))
 
 if __name__ == "__main__":
     app = ProcessSimulator()